@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 from app.core.config import get_settings
 from app.db.base import Base
+from app.db.partitions import PARENT_TABLE
 
 # モデルを追加したらここでインポート
 from app.models import account, account_password, account_oauth, account_passkey, refresh_token  # noqa: F401
@@ -23,12 +24,24 @@ settings = get_settings()
 config.set_main_option("sqlalchemy.url", settings.database_url)
 
 
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # refresh_tokens の子パーティションは定期タスクで作成・削除するため比較対象外にする
+    if not reflected:
+        return True
+    if type_ == "table":
+        return not name.startswith(f"{PARENT_TABLE}_")
+    if type_ == "index":
+        return not object.table.name.startswith(f"{PARENT_TABLE}_")
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -38,7 +51,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
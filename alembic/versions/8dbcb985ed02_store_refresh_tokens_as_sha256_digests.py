@@ -0,0 +1,60 @@
+"""Store refresh tokens as sha256 digests
+
+Revision ID: 8dbcb985ed02
+Revises: e261c1159a05
+Create Date: 2026-10-18 14:05:47.614462
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8dbcb985ed02'
+down_revision: Union[str, None] = 'e261c1159a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'refresh_tokens',
+        sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True),
+    )
+    # 既存トークンは平文から SHA-256 ダイジェストを計算して移行する
+    op.execute(
+        "UPDATE refresh_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))"
+    )
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.drop_index(op.f('ix_refresh_tokens_token'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token')
+    op.create_index(
+        'ix_refresh_tokens_token_hash_live',
+        'refresh_tokens',
+        ['token_hash'],
+        unique=True,
+        postgresql_where=sa.text('NOT revoked'),
+    )
+
+
+def downgrade() -> None:
+    # ダイジェストから平文は復元できないため、既存トークンはすべて無効化する
+    op.drop_index(
+        'ix_refresh_tokens_token_hash_live',
+        table_name='refresh_tokens',
+        postgresql_where=sa.text('NOT revoked'),
+    )
+    op.add_column(
+        'refresh_tokens',
+        sa.Column('token', sa.String(length=512), nullable=True),
+    )
+    op.execute(
+        "UPDATE refresh_tokens SET token = encode(token_hash, 'hex'), revoked = true"
+    )
+    op.alter_column('refresh_tokens', 'token', nullable=False)
+    op.drop_column('refresh_tokens', 'token_hash')
+    op.create_index(
+        op.f('ix_refresh_tokens_token'), 'refresh_tokens', ['token'], unique=True
+    )
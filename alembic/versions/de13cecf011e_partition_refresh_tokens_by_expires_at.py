@@ -0,0 +1,125 @@
+"""Partition refresh tokens by expires_at
+
+Revision ID: de13cecf011e
+Revises: 8dbcb985ed02
+Create Date: 2026-10-18 14:09:11.017574
+
+"""
+from datetime import UTC, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'de13cecf011e'
+down_revision: Union[str, None] = '8dbcb985ed02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 作成時点で当月から何ヶ月先までパーティションを用意するか
+MONTHS_AHEAD = 3
+
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    index = value.year * 12 + value.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+def upgrade() -> None:
+    # 既存テーブルを退避し、同名の親テーブルをパーティションテーブルとして作り直す
+    # （インデックス名はスキーマ内で一意なので退避側をリネームする。
+    # 外部キー名はテーブル単位なので同名のまま作成できる）
+    op.rename_table('refresh_tokens', 'refresh_tokens_old')
+    op.execute('ALTER INDEX refresh_tokens_pkey RENAME TO refresh_tokens_old_pkey')
+    op.execute(
+        'ALTER INDEX ix_refresh_tokens_token_hash_live '
+        'RENAME TO ix_refresh_tokens_old_token_hash_live'
+    )
+
+    op.create_table('refresh_tokens',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('refresh_tokens_id_seq')"), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('token_hash', sa.LargeBinary(length=32), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('revoked', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], name='refresh_tokens_account_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'expires_at'),
+    postgresql_partition_by='RANGE (expires_at)',
+    )
+    op.create_index(
+        'ix_refresh_tokens_token_hash_live',
+        'refresh_tokens',
+        ['token_hash', 'expires_at'],
+        unique=True,
+        postgresql_where=sa.text('NOT revoked'),
+    )
+    op.execute('CREATE TABLE refresh_tokens_default PARTITION OF refresh_tokens DEFAULT')
+
+    # 期限切れの行は移行せず、有効期限内の行が属する月と今後数ヶ月分を作成する
+    now = datetime.now(UTC)
+    max_expires_at = op.get_bind().execute(
+        sa.text('SELECT max(expires_at) FROM refresh_tokens_old')
+    ).scalar()
+    last = _month_start(now, MONTHS_AHEAD)
+    if max_expires_at is not None:
+        last = max(last, _month_start(max_expires_at))
+    month = _month_start(now)
+    while month <= last:
+        end = _month_start(month, 1)
+        op.execute(
+            f"CREATE TABLE refresh_tokens_p{month:%Y%m} PARTITION OF refresh_tokens "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+
+    op.execute(
+        'INSERT INTO refresh_tokens '
+        '(id, account_id, token_hash, expires_at, revoked, created_at) '
+        'SELECT id, account_id, token_hash, expires_at, revoked, created_at '
+        'FROM refresh_tokens_old WHERE expires_at > now()'
+    )
+    op.execute('ALTER SEQUENCE refresh_tokens_id_seq OWNED BY refresh_tokens.id')
+    op.drop_table('refresh_tokens_old')
+
+
+def downgrade() -> None:
+    op.rename_table('refresh_tokens', 'refresh_tokens_partitioned')
+    op.execute(
+        'ALTER INDEX ix_refresh_tokens_token_hash_live '
+        'RENAME TO ix_refresh_tokens_partitioned_token_hash_live'
+    )
+    op.execute(
+        'ALTER TABLE refresh_tokens_partitioned '
+        'RENAME CONSTRAINT refresh_tokens_pkey TO refresh_tokens_partitioned_pkey'
+    )
+
+    op.create_table('refresh_tokens',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('refresh_tokens_id_seq')"), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('revoked', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('token_hash', sa.LargeBinary(length=32), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], name='refresh_tokens_account_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_refresh_tokens_token_hash_live',
+        'refresh_tokens',
+        ['token_hash'],
+        unique=True,
+        postgresql_where=sa.text('NOT revoked'),
+    )
+    op.execute(
+        'INSERT INTO refresh_tokens '
+        '(id, account_id, token_hash, expires_at, revoked, created_at) '
+        'SELECT id, account_id, token_hash, expires_at, revoked, created_at '
+        'FROM refresh_tokens_partitioned'
+    )
+    op.execute('ALTER SEQUENCE refresh_tokens_id_seq OWNED BY refresh_tokens.id')
+    # 親テーブルを削除すると全パーティションも削除される
+    op.drop_table('refresh_tokens_partitioned')
@@ -1,35 +1,67 @@
-from fastapi import Depends, HTTPException, status
+import math
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.core.security import decode_access_token
 from app.db.session import get_db
 from app.models.account import Account
 from app.query.account_query import AccountQuery
+from app.schemas.auth import LoginRequest
+from app.services.admission import OverloadedError, get_password_admission
+from app.services.rate_limit import get_login_rate_limiter, login_limits
+from app.services.revocation import get_account_revocations, get_token_revocations
 
 bearer_scheme = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),  # noqa: B008
-    session: AsyncSession = Depends(get_db),  # noqa: B008
-) -> Account:
-    payload = decode_access_token(credentials.credentials)
-    if payload is None:
+@dataclass(frozen=True)
+class Principal:
+    """認証済みのアカウント（ORM エンティティを伴わない軽量な表現）"""
+
+    account_id: int
+    # ログアウト時にアクセストークンを失効させるための jti と iat
+    token_id: str | None = None
+    issued_at: float | None = None
+
+    @classmethod
+    def from_payload(cls, account_id: int, payload: dict) -> "Principal":
+        return cls(
+            account_id=account_id,
+            token_id=payload.get("jti"),
+            issued_at=payload.get("iat"),
+        )
+
+
+async def _decode_token(token: str) -> dict:
+    """
+    アクセストークンを検証してクレームを返す。
+
+    ログアウト済みのトークンは jti の失効セット（プロセス内のミラー）で弾く。
+    jti の無い古いトークンは exp まで有効なまま扱う。
+    """
+    payload = decode_access_token(token)
+    if payload is None or payload.get("sub") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="無効なトークンです",
         )
-
-    sub = payload.get("sub")
-    if sub is None:
+    jti = payload.get("jti")
+    if jti is not None and await get_token_revocations().revoked_at(jti) is not None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="無効なトークンです",
+            detail="トークンは失効しています",
         )
+    return payload
+
 
+async def _get_active_account(session: AsyncSession, account_id: int) -> Account:
     query = AccountQuery(session)
-    account = await query.get_by_id(int(sub))
+    account = await query.get_by_id(account_id)
     if account is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,3 +75,89 @@ async def get_current_user(
         )
 
     return account
+
+
+async def _check_not_revoked(payload: dict) -> None:
+    revoked_at = await get_account_revocations().revoked_at(payload["sub"])
+    # 失効以前に発行されたトークンを拒否する（iat の無い古いトークンも拒否）
+    if revoked_at is not None and payload.get("iat", 0) <= revoked_at:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="アカウントが無効です",
+        )
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),  # noqa: B008
+    session: AsyncSession = Depends(get_db),  # noqa: B008
+) -> Principal:
+    """
+    認証済みアカウントを Principal として返す。
+
+    auth_stateless が有効な場合は DB を引かず、トークンのクレームと
+    失効セットだけで検証する（セッションは接続を取得しないまま破棄される）。
+    """
+    payload = await _decode_token(credentials.credentials)
+    if get_settings().auth_stateless:
+        await _check_not_revoked(payload)
+        return Principal.from_payload(int(payload["sub"]), payload)
+
+    account = await _get_active_account(session, int(payload["sub"]))
+    return Principal.from_payload(account.id, payload)
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),  # noqa: B008
+    session: AsyncSession = Depends(get_db),  # noqa: B008
+) -> Account:
+    """認証済みアカウントを ORM エンティティとして返す（常に DB を引く）"""
+    payload = await _decode_token(credentials.credentials)
+    return await _get_active_account(session, int(payload["sub"]))
+
+
+def password_hashing_unavailable() -> HTTPException:
+    """
+    パスワードハッシュの処理が混み合っている場合の 503 を返す。
+
+    admit_password_hashing での拒否と、ワーカープールの待ち行列が溢れた場合
+    （HashPoolFullError）の両方で使う。
+    """
+    retry_after = get_settings().password_admission_retry_after_seconds
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="混み合っています。しばらくしてから再度お試しください",
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+async def admit_password_hashing() -> AsyncIterator[None]:
+    """
+    パスワードハッシュを伴うエンドポイントの同時実行数を制限する。
+
+    DB セッションより先に解決されるよう、ルートの dependencies に指定する。
+    """
+    try:
+        async with get_password_admission().admit():
+            yield
+    except OverloadedError:
+        raise password_hashing_unavailable() from None
+
+
+async def limit_login_attempts(http_request: Request, request: LoginRequest) -> None:
+    """
+    クライアント IP とメールアドレスごとのログイン試行回数を制限する。
+
+    アカウントの検索とパスワードの検証より前に判定するため、ルートの
+    dependencies に流量制限より先に指定する（request はエンドポイントの
+    ボディと同じ名前にして共有する）。
+    """
+    client_ip = http_request.client.host if http_request.client else None
+    retry_after = await get_login_rate_limiter().hit(
+        login_limits(client_ip, request.email)
+    )
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="試行回数が多すぎます。しばらくしてから再度お試しください",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
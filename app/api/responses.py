@@ -0,0 +1,30 @@
+from typing import TypeVar
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.core.config import get_settings
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class ModelResponse(Response):
+    """
+    pydantic モデルを、そのクラスのコンパイル済みシリアライザで直接 JSON にする。
+
+    Response を返すと FastAPI は response_model による再検証とシリアライズを
+    行わないため、content は response_model と同じクラスのインスタンスにすること
+    （サブクラスを渡すと、response_model にないフィールドも出力される）。
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
+
+
+def model_response(model: ModelT, status_code: int = 200) -> ModelT | Response:
+    """fast_response_serialization が有効なら ModelResponse で返す"""
+    if get_settings().fast_response_serialization:
+        return ModelResponse(model, status_code=status_code)
+    return model
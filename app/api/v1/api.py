@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 
 from app.api.v1.endpoints import auth
-from app.api.v1.internal import health
+from app.api.v1.internal import health, metrics, stats
 
 api_router = APIRouter()
 
@@ -10,3 +10,5 @@ api_router.include_router(auth.router)
 
 # Internal endpoints
 api_router.include_router(health.router)
+api_router.include_router(stats.router)
+api_router.include_router(metrics.router)
@@ -1,9 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import (
+    Principal,
+    admit_password_hashing,
+    get_current_principal,
+    limit_login_attempts,
+    password_hashing_unavailable,
+)
+from app.api.responses import model_response
+from app.core.security import HashPoolFullError
 from app.db.session import get_db
-from app.models.account import Account
 from app.schemas.account import AccountCreateRequest, AccountResponse
 from app.schemas.auth import (
     LoginRequest,
@@ -20,18 +27,25 @@ from app.usecase.signup_usecase import SignupUseCase
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/signup/password", response_model=SignupResponse, status_code=201)
+@router.post(
+    "/signup/password",
+    response_model=SignupResponse,
+    status_code=201,
+    dependencies=[Depends(admit_password_hashing)],
+)
 async def signup_with_password(
     request: AccountCreateRequest,
     session: AsyncSession = Depends(get_db),  # noqa: B008
-) -> SignupResponse:
+) -> SignupResponse | Response:
     usecase = SignupUseCase(session)
     try:
         result = await usecase.execute(email=request.email, password=request.password)
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e)) from None
+    except HashPoolFullError:
+        raise password_hashing_unavailable() from None
 
-    return SignupResponse(
+    response = SignupResponse(
         account=AccountResponse(
             id=result.account_id,
             email=result.email,
@@ -46,20 +60,27 @@ async def signup_with_password(
             refresh_token=result.refresh_token,
         ),
     )
+    return model_response(response, status_code=201)
 
 
-@router.post("/login/password", response_model=LoginResponse)
+@router.post(
+    "/login/password",
+    response_model=LoginResponse,
+    dependencies=[Depends(limit_login_attempts), Depends(admit_password_hashing)],
+)
 async def login_with_password(
     request: LoginRequest,
     session: AsyncSession = Depends(get_db),  # noqa: B008
-) -> LoginResponse:
+) -> LoginResponse | Response:
     usecase = LoginUseCase(session)
     try:
         result = await usecase.execute(email=request.email, password=request.password)
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e)) from None
+    except HashPoolFullError:
+        raise password_hashing_unavailable() from None
 
-    return LoginResponse(
+    response = LoginResponse(
         account=AccountResponse(
             id=result.account_id,
             email=result.email,
@@ -74,31 +95,37 @@ async def login_with_password(
             refresh_token=result.refresh_token,
         ),
     )
+    return model_response(response)
 
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
     request: RefreshRequest,
     session: AsyncSession = Depends(get_db),  # noqa: B008
-) -> TokenResponse:
+) -> TokenResponse | Response:
     usecase = RefreshUseCase(session)
     try:
         result = await usecase.execute(refresh_token=request.refresh_token)
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e)) from None
 
-    return TokenResponse(
+    response = TokenResponse(
         access_token=result.access_token,
         refresh_token=result.refresh_token,
     )
+    return model_response(response)
 
 
 @router.post("/logout", status_code=204)
 async def logout(
     request: RefreshRequest,
-    _current_user: Account = Depends(get_current_user),  # noqa: B008
+    principal: Principal = Depends(get_current_principal),  # noqa: B008
     session: AsyncSession = Depends(get_db),  # noqa: B008
 ) -> Response:
     usecase = LogoutUseCase(session)
-    await usecase.execute(refresh_token=request.refresh_token)
+    await usecase.execute(
+        refresh_token=request.refresh_token,
+        access_token_id=principal.token_id,
+        access_token_issued_at=principal.issued_at,
+    )
     return Response(status_code=204)
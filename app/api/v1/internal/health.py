@@ -1,34 +1,187 @@
-from collections.abc import Callable
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from functools import lru_cache
 
 from fastapi import APIRouter, status
 from fastapi.responses import JSONResponse
+from redis.asyncio import Redis
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import AsyncSessionLocal
-from app.schemas.health import DatabaseHealth, HealthResponse
+from app.core.config import get_settings
+from app.core.lifecycle import lifecycle
+from app.core.redis import get_redis
+from app.db.session import get_session_factory, pool_stats
+from app.schemas.health import (
+    DatabaseHealth,
+    DependencyHealth,
+    HealthResponse,
+    LivenessResponse,
+)
+from app.schemas.stats import PoolStats
 
 router = APIRouter(tags=["internal"])
 
+
 # セッションファクトリの型
 SessionFactory = Callable[[], AsyncSession]
 
 
+def _timeout_message(timeout: float) -> str:
+    return f"{timeout}秒以内に応答がありませんでした"
+
+
 async def check_database(
     session_factory: SessionFactory | None = None,
+    timeout: float | None = None,
 ) -> DatabaseHealth:
-    """データベース接続を確認する"""
+    """データベース接続を確認する（プールの空き待ちも含めて timeout で打ち切る）"""
     if session_factory is None:
-        session_factory = AsyncSessionLocal
+        session_factory = get_session_factory()
 
     try:
-        async with session_factory() as session:
-            await session.execute(text("SELECT 1"))
+        async with asyncio.timeout(timeout):
+            async with session_factory() as session:
+                await session.execute(text("SELECT 1"))
         return DatabaseHealth(status="connected")
+    except TimeoutError:
+        return DatabaseHealth(status="disconnected", error=_timeout_message(timeout))
     except Exception as e:
         return DatabaseHealth(status="disconnected", error=str(e))
 
 
+async def check_redis(
+    client: Redis,
+    timeout: float | None = None,
+    required: bool = True,
+) -> DependencyHealth:
+    """Redis に PING を送って接続を確認する"""
+    try:
+        async with asyncio.timeout(timeout):
+            await client.ping()
+        return DependencyHealth(status="connected", required=required)
+    except TimeoutError:
+        return DependencyHealth(
+            status="disconnected", error=_timeout_message(timeout), required=required
+        )
+    except Exception as e:
+        return DependencyHealth(status="disconnected", error=str(e), required=required)
+
+
+async def check_broker(timeout: float | None = None) -> DependencyHealth:
+    """
+    Celery ブローカーへの接続を確認する。
+
+    API プロセスはタスクを投入しないため、切断されていても readiness は落とさない。
+    """
+    client = Redis.from_url(get_settings().celery_broker_url)
+    try:
+        return await check_redis(client, timeout, required=False)
+    finally:
+        await client.aclose()
+
+
+def _redis_required() -> bool:
+    settings = get_settings()
+    return "redis" in (
+        settings.revocation_backend,
+        settings.account_cache_invalidation,
+        settings.rate_limit_backend,
+        settings.refresh_token_backend,
+    )
+
+
+async def check_readiness() -> HealthResponse:
+    """DB・Redis・ブローカーを並行に確認する"""
+    timeout = get_settings().health_check_timeout_seconds
+    database, redis, broker = await asyncio.gather(
+        check_database(timeout=timeout),
+        check_redis(get_redis(), timeout, required=_redis_required()),
+        check_broker(timeout),
+    )
+
+    is_healthy = all(
+        dependency.status == "connected"
+        for dependency in (database, redis, broker)
+        if dependency.required
+    )
+
+    return HealthResponse(
+        status="healthy" if is_healthy else "unhealthy",
+        database=database,
+        redis=redis,
+        broker=broker,
+        db_pool={name: PoolStats(**stats) for name, stats in pool_stats().items()},
+        checked_at=datetime.now(UTC),
+    )
+
+
+class CachedCheck:
+    """
+    チェック結果を ttl_seconds だけ使い回す。
+
+    実行中に来た呼び出しは同じ実行の結果を待つため、プローブが集中しても
+    実際のチェックは1回にまとまる。
+    """
+
+    def __init__(
+        self,
+        check: Callable[[], Awaitable[HealthResponse]],
+        ttl_seconds: float,
+    ):
+        self._check = check
+        self._ttl_seconds = ttl_seconds
+        self._result: HealthResponse | None = None
+        self._expires_at = 0.0
+        self._running: asyncio.Task[HealthResponse] | None = None
+
+    async def _run(self) -> HealthResponse:
+        result = await self._check()
+        self._result = result
+        self._expires_at = time.monotonic() + self._ttl_seconds
+        return result
+
+    async def get(self) -> HealthResponse:
+        if self._result is not None and time.monotonic() < self._expires_at:
+            return self._result
+
+        loop = asyncio.get_running_loop()
+        if (
+            self._running is None
+            or self._running.done()
+            or (self._running.get_loop() is not loop)
+        ):
+            self._running = loop.create_task(self._run())
+        # 待っている側がキャンセルされても、他の呼び出しが待つチェックは止めない
+        return await asyncio.shield(self._running)
+
+
+@lru_cache
+def get_readiness() -> CachedCheck:
+    return CachedCheck(check_readiness, get_settings().health_check_cache_ttl_seconds)
+
+
+@router.get("/health/live", response_model=LivenessResponse)
+async def liveness() -> LivenessResponse:
+    """
+    プロセスが応答できるかだけを返す（依存サービスは確認しない）。
+
+    依存サービスの障害でコンテナが再起動され続けないよう、liveness では
+    I/O を行わない。
+    """
+    return LivenessResponse(status="alive")
+
+
+@router.get(
+    "/health/ready",
+    response_model=HealthResponse,
+    responses={
+        200: {"description": "アプリケーションは正常"},
+        503: {"description": "アプリケーションは異常"},
+    },
+)
 @router.get(
     "/health",
     response_model=HealthResponse,
@@ -39,22 +192,22 @@ async def check_database(
 )
 async def health_check() -> JSONResponse:
     """
-    アプリケーションのヘルスチェックを実行する。
+    アプリケーションのヘルスチェック（readiness）を実行する。
 
-    データベース接続を確認し、結果を返す。
+    DB・Redis・ブローカーへの接続を並行に確認し、プール統計とあわせて返す。
+    結果は health_check_cache_ttl_seconds の間使い回す。
+    SIGTERM を受けた後（draining）は、依存サービスの状態によらず unhealthy。
+    /health は既存のプローブ設定向けに残している。
     """
-    database = await check_database()
-
-    is_healthy = database.status == "connected"
-
-    response = HealthResponse(
-        status="healthy" if is_healthy else "unhealthy",
-        database=database,
-    )
+    response = await get_readiness().get()
+    if not lifecycle.serving:
+        response = response.model_copy(
+            update={"status": "unhealthy", "lifecycle": lifecycle.phase}
+        )
 
     return JSONResponse(
         status_code=status.HTTP_200_OK
-        if is_healthy
+        if response.status == "healthy"
         else status.HTTP_503_SERVICE_UNAVAILABLE,
-        content=response.model_dump(),
+        content=response.model_dump(mode="json"),
     )
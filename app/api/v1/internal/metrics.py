@@ -0,0 +1,77 @@
+from collections.abc import Iterator
+
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+from app.core.metrics import render_metrics
+from app.db.session import pool_stats
+from app.services.account_cache import get_account_cache
+
+router = APIRouter(tags=["internal"])
+
+# (キー, メトリクス名, 説明, 種別)
+POOL_METRICS = (
+    ("size", "db_pool_size", "プールサイズ", GaugeMetricFamily),
+    ("checked_out", "db_pool_checked_out", "貸し出し中の接続数", GaugeMetricFamily),
+    (
+        "overflow",
+        "db_pool_overflow",
+        "プールサイズを超えて開いている接続数",
+        GaugeMetricFamily,
+    ),
+    ("checkouts", "db_pool_checkouts", "接続の貸し出し回数", CounterMetricFamily),
+    ("waits", "db_pool_waits", "空き接続を待った回数", CounterMetricFamily),
+    (
+        "wait_seconds",
+        "db_pool_wait_seconds",
+        "空き接続を待った合計時間",
+        CounterMetricFamily,
+    ),
+    (
+        "timeouts",
+        "db_pool_timeouts",
+        "接続の取得がタイムアウトした回数",
+        CounterMetricFamily,
+    ),
+)
+
+
+class RuntimeStatsCollector(Collector):
+    """アカウントキャッシュと DB プールの統計（/stats と同じ値）をスクレイプ時に読む"""
+
+    def collect(self) -> Iterator[Metric]:
+        cache = get_account_cache().stats()
+        hits = CounterMetricFamily(
+            "account_cache_hits", "アカウントキャッシュのヒット数"
+        )
+        hits.add_metric([], cache["hits"])
+        misses = CounterMetricFamily(
+            "account_cache_misses", "アカウントキャッシュのミス数"
+        )
+        misses.add_metric([], cache["misses"])
+        size = GaugeMetricFamily("account_cache_size", "アカウントキャッシュの件数")
+        size.add_metric([], cache["size"])
+        yield from (hits, misses, size)
+
+        pools = pool_stats()
+        for key, name, documentation, family in POOL_METRICS:
+            metric = family(name, documentation, labels=["engine"])
+            for engine, stats in pools.items():
+                metric.add_metric([engine], stats[key])
+            yield metric
+
+
+runtime_stats = RuntimeStatsCollector()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """
+    Prometheus のテキスト形式でメトリクスを返す。
+
+    HTTP のメトリクスは PROMETHEUS_MULTIPROC_DIR が設定されていれば全ワーカーの
+    合算になる。キャッシュ・プールの統計はリクエストを受けたプロセスの値になる。
+    """
+    return Response(render_metrics(runtime_stats), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+
+from app.db.session import pool_stats
+from app.schemas.stats import CacheStats, PoolStats, StatsResponse
+from app.services.account_cache import get_account_cache
+
+router = APIRouter(tags=["internal"])
+
+
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats() -> StatsResponse:
+    """
+    このプロセスの統計を返す。
+
+    値はワーカープロセスごとに独立しているため、複数ワーカー構成では
+    リクエストを受けたプロセスの値になる。
+    """
+    return StatsResponse(
+        account_cache=CacheStats(**get_account_cache().stats()),
+        db_pool={name: PoolStats(**stats) for name, stats in pool_stats().items()},
+    )
@@ -1,32 +1,124 @@
+from dataclasses import dataclass
 from datetime import datetime
 
+from sqlalchemy import (
+    DateTime,
+    LargeBinary,
+    delete,
+    func,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.security import hash_refresh_token
 from app.models.account import Account
 from app.models.account_oauth import AccountOauth
 from app.models.account_passkey import AccountPasskey
 from app.models.account_password import AccountPassword
 from app.models.refresh_token import RefreshToken
+from app.services.account_cache import invalidate_on_commit
+
+
+@dataclass
+class CreatedAccount:
+    account_id: int
+    email: str
+    is_active: bool
+    created_at: datetime
 
 
 class AccountCommand:
     def __init__(self, session: AsyncSession):
         self._session = session
 
+    def _invalidate_cache(self, account_id: int) -> None:
+        # アカウントに紐づく書き込みは、コミット後に全プロセスのキャッシュから外す
+        # （リフレッシュトークンはキャッシュ対象外のため呼ばない）
+        invalidate_on_commit(self._session.sync_session, account_id)
+
     async def create_account(self, email: str) -> Account:
         account = Account(email=email)
         self._session.add(account)
         await self._session.flush()
         return account
 
+    async def create_account_with_password(
+        self,
+        email: str,
+        hashed_password: str,
+        refresh_token: str | None = None,
+        refresh_token_expires_at: datetime | None = None,
+    ) -> CreatedAccount | None:
+        """
+        アカウント・パスワード・リフレッシュトークンを1文（CTE）で作成する。
+
+        refresh_token を省略した場合はトークンを作成しない（DB 以外のストアで
+        発行する場合）。メールアドレスが登録済みの場合は ON CONFLICT DO NOTHING
+        により何も作成せず None を返す。
+        CTE 内の INSERT にはモデルの Python 側 default が適用されないため、
+        default を持つ列も値を明示する。
+        """
+        new_account = (
+            insert(Account)
+            .values(email=email, is_active=True)
+            .on_conflict_do_nothing(index_elements=[Account.email])
+            .returning(Account.id, Account.email, Account.is_active, Account.created_at)
+            .cte("new_account")
+        )
+        new_password = (
+            insert(AccountPassword)
+            .from_select(
+                ["account_id", "hashed_password"],
+                select(new_account.c.id, literal(hashed_password)),
+            )
+            .cte("new_password")
+        )
+        ctes = [new_password]
+        if refresh_token is not None:
+            ctes.append(
+                insert(RefreshToken)
+                .from_select(
+                    ["account_id", "token_hash", "expires_at", "revoked"],
+                    select(
+                        new_account.c.id,
+                        literal(hash_refresh_token(refresh_token), LargeBinary),
+                        literal(refresh_token_expires_at, DateTime(timezone=True)),
+                        literal(False),
+                    ),
+                )
+                .cte("new_refresh_token")
+            )
+        result = await self._session.execute(select(new_account).add_cte(*ctes))
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return CreatedAccount(
+            account_id=row.id,
+            email=row.email,
+            is_active=row.is_active,
+            created_at=row.created_at,
+        )
+
     async def create_password(
         self, account_id: int, hashed_password: str
     ) -> AccountPassword:
         pw = AccountPassword(account_id=account_id, hashed_password=hashed_password)
         self._session.add(pw)
         await self._session.flush()
+        self._invalidate_cache(account_id)
         return pw
 
+    async def update_password_hash(self, account_id: int, hashed_password: str) -> None:
+        await self._session.execute(
+            update(AccountPassword)
+            .where(AccountPassword.account_id == account_id)
+            .values(hashed_password=hashed_password)
+        )
+        self._invalidate_cache(account_id)
+
     async def create_oauth(
         self, account_id: int, provider: str, provider_id: str
     ) -> AccountOauth:
@@ -35,6 +127,7 @@ class AccountCommand:
         )
         self._session.add(oauth)
         await self._session.flush()
+        self._invalidate_cache(account_id)
         return oauth
 
     async def create_passkey(
@@ -58,16 +151,110 @@ class AccountCommand:
         )
         self._session.add(passkey)
         await self._session.flush()
+        self._invalidate_cache(account_id)
         return passkey
 
     async def create_refresh_token(
         self, account_id: int, token: str, expires_at: datetime
     ) -> RefreshToken:
-        rt = RefreshToken(account_id=account_id, token=token, expires_at=expires_at)
+        rt = RefreshToken(
+            account_id=account_id,
+            token_hash=hash_refresh_token(token),
+            expires_at=expires_at,
+        )
         self._session.add(rt)
         await self._session.flush()
         return rt
 
+    async def rotate_refresh_token(
+        self, token: str, new_token: str, new_expires_at: datetime
+    ) -> int | None:
+        """
+        有効なリフレッシュトークンを revoke し、同じアカウントに新しいトークンを
+        発行する処理を1文（CTE）で行う。
+
+        条件付き UPDATE が行ロックを取るため、同じトークンで同時に呼ばれても
+        成功するのは1つだけになる。対象が無効・期限切れ・競合負けの場合は
+        何も変更せず None を返す。
+        """
+        revoked_token = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == hash_refresh_token(token),
+                ~RefreshToken.revoked,
+                RefreshToken.expires_at > func.now(),
+            )
+            .values(revoked=True)
+            .returning(RefreshToken.account_id)
+            .cte("revoked_token")
+        )
+        new_refresh_token = (
+            insert(RefreshToken)
+            .from_select(
+                ["account_id", "token_hash", "expires_at", "revoked"],
+                select(
+                    revoked_token.c.account_id,
+                    literal(hash_refresh_token(new_token), LargeBinary),
+                    literal(new_expires_at, DateTime(timezone=True)),
+                    literal(False),
+                ),
+            )
+            .returning(RefreshToken.account_id)
+            .cte("new_refresh_token")
+        )
+        result = await self._session.execute(select(new_refresh_token.c.account_id))
+        return result.scalar_one_or_none()
+
     async def revoke_refresh_token(self, refresh_token: RefreshToken) -> None:
         refresh_token.revoked = True
         await self._session.flush()
+
+    async def revoke_all_refresh_tokens(self, account_id: int) -> None:
+        await self._session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.account_id == account_id, ~RefreshToken.revoked)
+            .values(revoked=True)
+        )
+
+    async def deactivate_account(self, account_id: int) -> bool:
+        result = await self._session.execute(
+            update(Account)
+            .where(Account.id == account_id, Account.is_active)
+            .values(is_active=False)
+            .returning(Account.id)
+        )
+        self._invalidate_cache(account_id)
+        return result.scalar_one_or_none() is not None
+
+    async def delete_revoked_refresh_tokens(
+        self, after_id: int, limit: int
+    ) -> list[int]:
+        """
+        revoke 済みでまだ期限内のトークンを id 昇順で最大 limit 件削除し、
+        削除した id を返す。
+
+        期限切れの行はパーティションごと DROP TABLE で捨てる
+        （maintain_refresh_token_partitions）ため、行単位では削除しない。
+        expires_at の条件で期限切れのパーティションは走査からも外れる。
+
+        after_id より大きい id だけを対象にすることで、呼び出し側は
+        前回バッチの最大 id から続きを削除できる（キーセットページング）。
+        他のトランザクションがロック中の行は待たずに読み飛ばす。
+        """
+        stale_ids = (
+            select(RefreshToken.id)
+            .where(
+                RefreshToken.id > after_id,
+                RefreshToken.revoked,
+                RefreshToken.expires_at >= func.now(),
+            )
+            .order_by(RefreshToken.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._session.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(stale_ids.scalar_subquery()))
+            .returning(RefreshToken.id)
+        )
+        return list(result.scalars())
@@ -1,6 +1,8 @@
 import os
 from functools import lru_cache
+from typing import Literal
 
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 APP_ENV = os.getenv("APP_ENV", "development")
@@ -17,6 +19,9 @@ class Settings(BaseSettings):
     # App
     app_name: str = "Warry About API"
     debug: bool = False
+    # 認証エンドポイントのレスポンスを response_model で再検証せず、
+    # モデルのコンパイル済みシリアライザで直接 JSON にする
+    fast_response_serialization: bool = False
 
     # Database
     db_host: str
@@ -32,19 +37,176 @@ class Settings(BaseSettings):
             f"@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
+    # Connection pool（エンジンはワーカープロセスごとに作られる。DB の
+    # max_connections は (pool_size + max_overflow) × 全ワーカー数を目安にする）
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    # この秒数を超えて使われた接続は次の貸し出し時に張り直す（-1 で無効）
+    db_pool_recycle: int = 1800
+    # 貸し出しのたびに生存確認の往復を入れるか。DB・プロキシ側で
+    # アイドル接続が切られる環境以外は recycle だけで十分なことが多い
+    db_pool_pre_ping: bool = True
+    # 起動時に開いておく接続数（0 でウォームアップしない）
+    db_warmup_connections: int = 5
+
+    # SQL instrumentation（リクエストごとの文数・DB 時間を集計する）
+    # いずれかを超えたリクエストは WARNING でログに出す
+    sql_log_statement_threshold: int = 20
+    sql_log_duration_ms_threshold: float = 200.0
+    # 1リクエスト内で同じ SQL がこの回数以上実行されたら N+1 の疑いとしてログに出す
+    sql_n_plus_one_threshold: int = 5
+
+    # Read replica（未設定なら読み取りもプライマリで行う）
+    db_replica_host: str | None = None
+    db_replica_port: int | None = None
+
+    @property
+    def replica_database_url(self) -> str | None:
+        if self.db_replica_host is None:
+            return None
+        return (
+            f"postgresql+asyncpg://{self.db_user}:{self.db_password}"
+            f"@{self.db_replica_host}:{self.db_replica_port or self.db_port}"
+            f"/{self.db_name}"
+        )
+
     # JWT
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # 有効にすると認証時にアカウントを DB から引かず、トークンのクレームと
+    # 失効セット（無効化されたアカウント）だけで検証する。revocation_backend は
+    # redis にすること（memory ではテスト以外で起動を拒否する）
+    auth_stateless: bool = False
+
+    # Health check
+    # readiness の各チェック（DB・Redis・ブローカー）の打ち切り時間
+    health_check_timeout_seconds: float = 2.0
+    # readiness の結果を使い回す時間（プローブが集中しても実チェックは1回にまとめる）
+    health_check_cache_ttl_seconds: float = 2.0
+
+    # Shutdown
+    # SIGTERM を受けてから uvicorn の停止処理を始めるまで readiness を落として待つ秒数。
+    # ECS はロードバランサーから外して登録解除の遅延を待ってから SIGTERM を送るため 0 でよい。
+    # readiness の失敗で振り分けから外す環境では、プローブの間隔より長くする
+    shutdown_drain_delay_seconds: float = 0.0
+
+    # Event loop monitor
+    loop_monitor_enabled: bool = True
+    # ループ遅延を計測する間隔
+    loop_monitor_interval_seconds: float = 0.1
+    # ループがこれ以上止まったらブロックしているスタックをログに出す
+    loop_monitor_threshold_seconds: float = 0.1
+
+    # Request profiler
+    # X-Profile ヘッダーにこの値を付けたリクエストだけをプロファイルする（未設定なら無効）
+    profiler_token: str | None = None
+    # サンプリング間隔。短すぎるとサンプラーのスレッドが GIL を奪い合うため 1ms を下限とする
+    profiler_interval_seconds: float = Field(default=0.005, ge=0.001)
+    # 1リクエストあたりのサンプル数の上限
+    profiler_max_samples: int = 10000
+    # プロセス内で同時にプロファイルできるリクエスト数
+    profiler_max_concurrent: int = 1
+
+    # Password hashing
+    # bcrypt はイベントループ外のワーカープールで実行する
+    password_hash_executor: Literal["thread", "process"] = "thread"
+    password_hash_max_workers: int = 4
+    # ワーカーが埋まっている時にプールへ積める待ちジョブ数の上限
+    password_hash_max_queue: int = 64
+    # 待ち行列も埋まっている時に空きを待つ上限。超えたら待たずに 503 を返す
+    password_hash_queue_timeout_seconds: float = 1.0
+    # 新規ハッシュに使う方式（既存ハッシュは方式を判別して検証する）
+    password_hash_scheme: Literal["bcrypt", "argon2id"] = "bcrypt"
+    # コストは全ワーカーで同じにするため起動時には計測しない。デプロイ先の
+    # ハードウェアで scripts/calibrate_password_hash.py を実行して決め、ここに保存する。
+    # 変更すると、許容幅（1段階）を外れた既存ハッシュは次のログインで再ハッシュされる
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536  # KiB
+    argon2_parallelism: int = 4
+
+    # Admission control（ログイン・サインアップはリクエストごとにハッシュを計算する）
+    # 同時に処理する数。超えた分は待ち行列に入る
+    password_admission_max_concurrent: int = 8
+    # 待ち行列の上限。溢れたリクエストは待たずに 503 を返す
+    password_admission_max_queue: int = 32
+    # 待ち行列でこの秒数待っても順番が来なければ 503 を返す
+    password_admission_queue_timeout_seconds: float = 2.0
+    # 503 の Retry-After ヘッダーの値
+    password_admission_retry_after_seconds: int = 1
 
     # Redis
     redis_host: str = "localhost"
     redis_port: int = 6379
+    # アプリケーション側のデータ（失効セットなど）はブローカーと別の DB に置く
+    redis_db: int = 1
+    # 接続・応答を待つ上限。Redis が止まっても認証・回数制限の経路を
+    # 待たせず、RedisError（TimeoutError）として扱えるようにする
+    redis_socket_timeout_seconds: float = 0.5
+    redis_socket_connect_timeout_seconds: float = 0.5
 
     @property
     def celery_broker_url(self) -> str:
         return f"redis://{self.redis_host}:{self.redis_port}/0"
 
+    @property
+    def redis_url(self) -> str:
+        return f"redis://{self.redis_host}:{self.redis_port}/{self.redis_db}"
+
+    # Revocation
+    # memory はプロセス内のみで完結する（単一プロセス・テスト用）。複数ワーカーでは
+    # ログアウト・無効化が処理したワーカーでしか効かないため、既定は redis にしている。
+    # テスト以外で memory を選ぶと起動時に警告し、auth_stateless との組み合わせは
+    # 起動を拒否する
+    revocation_backend: Literal["memory", "redis"] = "redis"
+    # Redis の失効セットをプロセス内のミラーへ取り込む間隔（バックグラウンドで行う）
+    revocation_sync_interval_seconds: float = 5.0
+
+    # Rate limiting
+    # memory はプロセス内のみで数える（単一プロセス・テスト用）。複数ワーカー・複数
+    # タスクではワーカー数倍まで通してしまうため、既定は redis にしている。
+    # テスト以外で memory を選ぶと起動時に警告する
+    rate_limit_backend: Literal["memory", "redis"] = "redis"
+    # ログイン試行の上限（スライディングウィンドウ）。アカウントの検索と
+    # パスワードの検証より前に、クライアント IP とメールアドレスごとに数える
+    login_rate_limit_window_seconds: float = 60.0
+    login_rate_limit_per_ip: int = 20
+    login_rate_limit_per_email: int = 5
+
+    # Account cache
+    # AccountQuery.get_by_id / get_by_email の結果をプロセス内に保持する（0 で無効）。
+    # 認証（get_current_user）もこのキャッシュを引くため、無効化が届かない間は
+    # 無効化したアカウントでも TTL まで認証が通る。複数プロセスで有効にする場合は
+    # account_cache_invalidation を redis にし、TTL は数秒程度に短くすること
+    account_cache_ttl_seconds: float = 0.0
+    account_cache_max_size: int = 10000
+    # redis にすると AccountCommand の書き込みを pub/sub で全プロセスへ通知する
+    account_cache_invalidation: Literal["memory", "redis"] = "memory"
+
+    # Refresh tokens
+    # sql は refresh_tokens テーブル（リフレッシュごとにプライマリへ書き込む）、
+    # redis は期限付きのキーで保持する。memory はプロセス内のみ（単一プロセス・テスト用）
+    refresh_token_backend: Literal["sql", "redis", "memory"] = "sql"
+
+    # Refresh token cleanup（refresh_token_backend が sql の場合）
+    # 行単位で削除するのは revoke 済みで期限内のものだけ。期限切れの行は
+    # 下記のパーティション保守で月ごと DROP TABLE する
+    refresh_token_purge_interval_seconds: float = 3600.0
+    refresh_token_purge_batch_size: int = 1000
+    # バッチ間の待ち時間（ロック・WAL・autovacuum への負荷を平準化する）
+    refresh_token_purge_sleep_seconds: float = 0.1
+    # refresh_tokens は expires_at で月次パーティショニングしている
+    refresh_token_partition_interval_seconds: float = 86400.0
+    # 事前に作っておく月数（作成が遅れるとデフォルトパーティションの行を
+    # ATTACH のロック中に移すことになるため、余裕を持たせる）
+    refresh_token_partition_months_ahead: int = 3
+    # 作成・削除の DDL がロックを待つ上限。超えたら待ち時間を延ばしてやり直す
+    refresh_token_partition_lock_timeout_ms: int = 1000
+    refresh_token_partition_lock_attempts: int = 5
+    refresh_token_partition_retry_delay_seconds: float = 5.0
+
     # OpenAI
     openai_api_key: str = ""
     openai_model: str = "gpt-4o-mini"
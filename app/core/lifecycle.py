@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import signal
+import threading
+from types import FrameType
+from typing import Literal
+
+logger = logging.getLogger(__name__)
+
+Phase = Literal["serving", "draining"]
+
+
+class Lifecycle:
+    """
+    プロセスが新しいリクエストを受けてよい段階か（readiness に反映する）。
+
+    起動時のウォームアップは lifespan の startup で行い、uvicorn はその後で
+    ソケットを開くため、起動中の段階は持たない。
+    """
+
+    def __init__(self) -> None:
+        self.phase: Phase = "serving"
+
+    @property
+    def serving(self) -> bool:
+        return self.phase == "serving"
+
+    def install_drain_handler(self, delay_seconds: float) -> None:
+        """
+        SIGTERM を受けたら readiness を draining にし、delay_seconds 後に
+        元のハンドラ（uvicorn の停止処理）へ渡す。
+
+        uvicorn は SIGTERM を受けるとすぐにリスナーを閉じ、処理中のリクエストを
+        --timeout-graceful-shutdown まで待ってから lifespan の shutdown を実行する。
+        その前に readiness を落とし、ロードバランサーから外れる猶予を作る。
+        lifespan の startup から呼ぶ（uvicorn が自身のハンドラを設定した後）。
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signal.SIGTERM)
+        if not callable(previous):
+            return
+        loop = asyncio.get_running_loop()
+
+        def handle(signum: int, frame: FrameType | None) -> None:
+            if self.phase == "draining":
+                # 2回目の SIGTERM は待たずに停止処理へ渡す
+                previous(signum, frame)
+                return
+            self.phase = "draining"
+            logger.info("SIGTERM received; draining for %.1fs", delay_seconds)
+            loop.call_soon_threadsafe(
+                loop.call_later, delay_seconds, previous, signum, frame
+            )
+
+        signal.signal(signal.SIGTERM, handle)
+
+
+lifecycle = Lifecycle()
@@ -0,0 +1,75 @@
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from app.core.metrics import LOOP_LAG, LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """
+    イベントループのスケジューリング遅延を計測する。
+
+    ループ上のタスクが interval_seconds ごとに起き、予定より遅れた分を
+    遅延として記録する。別スレッドのウォッチドッグはそのタスクの最終実行
+    時刻を見張り、threshold_seconds 以上止まっていたらループのスレッドの
+    スタック（ブロックしているコード）をログに出す。
+    """
+
+    def __init__(self, interval_seconds: float, threshold_seconds: float):
+        self._interval = interval_seconds
+        self._threshold = threshold_seconds
+        self._last_tick = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    async def _measure(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self._interval)
+            now = time.monotonic()
+            self._last_tick = now
+            LOOP_LAG.observe(max(now - start - self._interval, 0.0))
+
+    def _watch(self) -> None:
+        reported_tick: float | None = None
+        while not self._stopping.wait(self._threshold / 2):
+            last_tick = self._last_tick
+            stalled = time.monotonic() - last_tick - self._interval
+            # 同じ停止は1回だけ報告する
+            if stalled < self._threshold or last_tick == reported_tick:
+                continue
+            reported_tick = last_tick
+            LOOP_STALLS.inc()
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            logger.warning("Event loop blocked for %.0fms+:\n%s", stalled * 1000, stack)
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
@@ -0,0 +1,101 @@
+import os
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.registry import Collector
+
+# PROMETHEUS_MULTIPROC_DIR が設定されていると、prometheus_client は値を
+# ワーカーごとの mmap ファイルに書き、スクレイプ時に全ワーカー分を合算する。
+# import 時に決まるため、アプリの起動前に環境変数として設定しておくこと。
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP リクエストの処理時間",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP レスポンスボディのサイズ",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000),
+)
+REQUESTS = Counter(
+    "http_requests",
+    "HTTP リクエスト数",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "処理中の HTTP リクエスト数",
+    multiprocess_mode="livesum",
+)
+
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "イベントループのスケジューリング遅延",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+LOOP_STALLS = Counter(
+    "event_loop_stalls",
+    "イベントループが閾値以上ブロックされた回数",
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight",
+    "流量制限を通過して処理中のリクエスト数",
+    ["limiter"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUED = Gauge(
+    "admission_queued",
+    "流量制限の待ち行列にいるリクエスト数",
+    ["limiter"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds",
+    "流量制限の待ち行列で待った時間",
+    ["limiter"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected",
+    "流量制限で断ったリクエスト数",
+    ["limiter", "reason"],
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get(MULTIPROC_DIR_ENV))
+
+
+def mark_process_dead() -> None:
+    """停止するワーカーの livesum ゲージを合算から外す"""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def render_metrics(*collectors: Collector) -> bytes:
+    """
+    Prometheus のテキスト形式でメトリクスを出力する。
+
+    collectors はプロセス内の状態を読むコレクタで、マルチプロセスモードでも
+    スクレイプを受けたプロセスの値になる。
+    """
+    registry = CollectorRegistry()
+    if multiprocess_enabled():
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(REGISTRY)
+    for collector in collectors:
+        registry.register(collector)
+    return generate_latest(registry)
@@ -0,0 +1,23 @@
+from functools import lru_cache
+
+from redis.asyncio import Redis
+
+from app.core.config import get_settings
+
+
+@lru_cache
+def get_redis() -> Redis:
+    """
+    アプリケーション用の Redis クライアントを返す。
+
+    接続は初回のコマンド実行時に張られるため、Redis を使わない設定では
+    接続は発生しない。応答待ちには socket_timeout の上限を設けるため、
+    待ち続けるもの（pub/sub の受信など）は get_message の timeout で区切ること。
+    """
+    settings = get_settings()
+    return Redis.from_url(
+        settings.redis_url,
+        decode_responses=True,
+        socket_timeout=settings.redis_socket_timeout_seconds,
+        socket_connect_timeout=settings.redis_socket_connect_timeout_seconds,
+    )
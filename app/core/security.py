@@ -1,36 +1,316 @@
+import asyncio
+import hashlib
+import logging
+import math
+import secrets
+import statistics
+import time
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from typing import ClassVar, Protocol, TypeVar
 
+import argon2
 import bcrypt
+from argon2.exceptions import InvalidHashError, VerificationError
 from jose import JWTError, jwt
 
 from app.core.config import get_settings
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_hash_executor: Executor | None = None
+# asyncio.Semaphore はイベントループに紐づくため、ループごとに保持する
+_hash_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class HashPoolFullError(Exception):
+    """ハッシュのワーカープールと待ち行列が埋まったまま、待ち時間の上限を超えた"""
+
+
+class PasswordHasher(Protocol):
+    """パスワードハッシュ方式のインターフェース"""
+
+    scheme: ClassVar[str]
+
+    @classmethod
+    def identify(cls, hashed_password: str) -> bool: ...
+
+    @classmethod
+    def calibrate(cls, target_seconds: float) -> "PasswordHasher":
+        """このハードウェアで1回のハッシュが target_seconds になるコストを計測する"""
+        ...
+
+    def hash(self, password: str) -> str: ...
+
+    def verify(self, password: str, hashed_password: str) -> bool: ...
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """保存済みハッシュの方式が異なるか、コストがポリシーの許容幅を外れているか"""
+        ...
+
+
+def measure_hash(hasher: PasswordHasher, samples: int = 5) -> float:
+    """hasher で1回ハッシュする時間（秒）を返す"""
+    # 1回の計測はぶれが大きく、プロセスごとに結果が変わるため中央値を使う
+    elapsed = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        elapsed.append(time.perf_counter() - start)
+    return statistics.median(elapsed)
+
+
+@dataclass(frozen=True)
+class BcryptHasher:
+    scheme: ClassVar[str] = "bcrypt"
+    MIN_ROUNDS: ClassVar[int] = 10
+    MAX_ROUNDS: ClassVar[int] = 16
+    # ポリシーより高いコストはこの段数まで再ハッシュしない（ローリングデプロイ中に
+    # 新旧のポリシーが混在しても、互いに再ハッシュし合わないようにする）
+    REHASH_TOLERANCE: ClassVar[int] = 1
+
+    rounds: int = 12
+
+    @classmethod
+    def identify(cls, hashed_password: str) -> bool:
+        return hashed_password.startswith(("$2a$", "$2b$", "$2y$"))
+
+    @classmethod
+    def calibrate(cls, target_seconds: float) -> "BcryptHasher":
+        # rounds が1増えるごとに計算量は2倍になる
+        base_rounds = 8
+        elapsed = measure_hash(cls(rounds=base_rounds))
+        rounds = base_rounds + round(math.log2(max(target_seconds / elapsed, 1.0)))
+        return cls(rounds=min(max(rounds, cls.MIN_ROUNDS), cls.MAX_ROUNDS))
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(
+            password.encode("utf-8"),
+            bcrypt.gensalt(rounds=self.rounds),
+        ).decode("utf-8")
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(
+            password.encode("utf-8"),
+            hashed_password.encode("utf-8"),
+        )
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        if not self.identify(hashed_password):
+            return True
+        # $2b$12$... の形式でコストが埋め込まれている。ポリシーを下げた場合も
+        # 許容幅を超えて高いハッシュは再ハッシュし、ログインあたりの CPU を減らす
+        rounds = int(hashed_password.split("$")[2])
+        return not self.rounds <= rounds <= self.rounds + self.REHASH_TOLERANCE
+
+
+@dataclass(frozen=True)
+class Argon2Hasher:
+    scheme: ClassVar[str] = "argon2id"
+    MAX_TIME_COST: ClassVar[int] = 16
+    # BcryptHasher と同じく、time_cost がこの分だけ高いハッシュは再ハッシュしない
+    REHASH_TOLERANCE: ClassVar[int] = 1
+
+    time_cost: int = 3
+    memory_cost: int = 65536
+    parallelism: int = 4
+
+    @classmethod
+    def identify(cls, hashed_password: str) -> bool:
+        return hashed_password.startswith("$argon2id$")
+
+    @classmethod
+    def calibrate(cls, target_seconds: float) -> "Argon2Hasher":
+        settings = get_settings()
+        # メモリコストは設定値で固定し、time_cost で所要時間を合わせる
+        base = cls(
+            time_cost=1,
+            memory_cost=settings.argon2_memory_cost,
+            parallelism=settings.argon2_parallelism,
+        )
+        elapsed = measure_hash(base)
+        time_cost = round(target_seconds / elapsed)
+        return replace(base, time_cost=min(max(time_cost, 1), cls.MAX_TIME_COST))
+
+    @property
+    def _hasher(self) -> argon2.PasswordHasher:
+        return argon2.PasswordHasher(
+            time_cost=self.time_cost,
+            memory_cost=self.memory_cost,
+            parallelism=self.parallelism,
+            type=argon2.Type.ID,
+        )
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        try:
+            return self._hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        if not self.identify(hashed_password):
+            return True
+        # time_cost は bcrypt と同じく許容幅で、メモリと並列度は一致で判定する
+        params = argon2.extract_parameters(hashed_password)
+        max_time_cost = self.time_cost + self.REHASH_TOLERANCE
+        return (
+            not self.time_cost <= params.time_cost <= max_time_cost
+            or params.memory_cost != self.memory_cost
+            or params.parallelism != self.parallelism
+        )
+
+
+PASSWORD_HASHERS: dict[str, type[PasswordHasher]] = {
+    BcryptHasher.scheme: BcryptHasher,
+    Argon2Hasher.scheme: Argon2Hasher,
+}
+
+
+def register_password_hasher(hasher_class: type[PasswordHasher]) -> None:
+    PASSWORD_HASHERS[hasher_class.scheme] = hasher_class
+
+
+def _default_password_hasher(scheme: str) -> PasswordHasher:
+    settings = get_settings()
+    if scheme == BcryptHasher.scheme:
+        return BcryptHasher(rounds=settings.bcrypt_rounds)
+    if scheme == Argon2Hasher.scheme:
+        return Argon2Hasher(
+            time_cost=settings.argon2_time_cost,
+            memory_cost=settings.argon2_memory_cost,
+            parallelism=settings.argon2_parallelism,
+        )
+    return PASSWORD_HASHERS[scheme]()
+
+
+@lru_cache
+def get_password_hasher() -> PasswordHasher:
+    """
+    新規ハッシュに使うハッシャー（現在のポリシー）を返す。
+
+    コストは設定値（bcrypt_rounds など）をそのまま使う。プロセスごとに計測すると
+    ワーカー・タスク間でポリシーがずれるため、計測はデプロイ先のハードウェアで
+    scripts/calibrate_password_hash.py を一度だけ実行し、結果を設定値として保存する。
+    """
+    return _default_password_hasher(get_settings().password_hash_scheme)
+
+
+def _identify_hasher(hashed_password: str) -> PasswordHasher | None:
+    for hasher_class in PASSWORD_HASHERS.values():
+        if hasher_class.identify(hashed_password):
+            return hasher_class()
+    return None
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(
-        plain_password.encode("utf-8"),
-        hashed_password.encode("utf-8"),
-    )
+    hasher = _identify_hasher(hashed_password)
+    if hasher is None:
+        return False
+    return hasher.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return bcrypt.hashpw(
-        password.encode("utf-8"),
-        bcrypt.gensalt(),
-    ).decode("utf-8")
+    return get_password_hasher().hash(password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """保存済みハッシュのパラメータが現在のポリシーと異なるか"""
+    return get_password_hasher().needs_rehash(hashed_password)
+
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    settings = get_settings()
+    if _hash_executor is None:
+        if settings.password_hash_executor == "process":
+            _hash_executor = ProcessPoolExecutor(
+                max_workers=settings.password_hash_max_workers
+            )
+        else:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.password_hash_max_workers,
+                thread_name_prefix="password-hash",
+            )
+    return _hash_executor
+
+
+def _get_hash_slots() -> asyncio.Semaphore:
+    settings = get_settings()
+    loop = asyncio.get_running_loop()
+    slots = _hash_slots.get(loop)
+    if slots is None:
+        slots = asyncio.Semaphore(
+            settings.password_hash_max_workers + settings.password_hash_max_queue
+        )
+        _hash_slots[loop] = slots
+    return slots
+
+
+async def _run_in_hash_pool(func: Callable[..., T], *args: object) -> T:
+    """
+    ハッシュ処理をワーカープールで実行する。
+
+    プールへ投入済みのジョブ数は max_workers + max_queue までに制限する。
+    それを超えた呼び出しは password_hash_queue_timeout_seconds だけ空きを待ち、
+    空かなければ HashPoolFullError を送出する（呼び出し側で 503 にする）。
+    """
+    slots = _get_hash_slots()
+    try:
+        await asyncio.wait_for(
+            slots.acquire(), get_settings().password_hash_queue_timeout_seconds
+        )
+    except TimeoutError:
+        raise HashPoolFullError("password hash pool is full") from None
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        slots.release()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    # プロセスプールでもポリシーが揃うよう、ハッシャーごと渡す
+    return await _run_in_hash_pool(get_password_hasher().hash, password)
+
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True)
+        _hash_executor = None
+
+
+def hash_refresh_token(token: str) -> bytes:
+    """リフレッシュトークンを保存・検索用の SHA-256 ダイジェストに変換する"""
+    return hashlib.sha256(token.encode("utf-8")).digest()
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
+    settings = get_settings()
     to_encode = data.copy()
+    now = datetime.now(UTC)
     if expires_delta:
-        expire = datetime.now(UTC) + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.now(UTC) + timedelta(
-            minutes=settings.access_token_expire_minutes
-        )
-    to_encode.update({"exp": expire})
+        expire = now + timedelta(minutes=settings.access_token_expire_minutes)
+    # iat は失効セットとの比較（失効より前に発行されたか）に使う
+    # jti はログアウトしたトークンを個別に失効させるための ID（96 ビット）
+    to_encode.update({"exp": expire, "iat": now, "jti": secrets.token_urlsafe(12)})
     encoded_jwt = jwt.encode(
         to_encode, settings.secret_key, algorithm=settings.algorithm
     )
@@ -38,6 +318,7 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
 
 
 def decode_access_token(token: str) -> dict | None:
+    settings = get_settings()
     try:
         payload = jwt.decode(
             token, settings.secret_key, algorithms=[settings.algorithm]
@@ -0,0 +1,71 @@
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+
+
+@dataclass
+class QueryStats:
+    """1リクエスト（または1ブロック）で実行された SQL の集計"""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        self.statements[statement] += 1
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """threshold 回以上実行された同一 SQL（N+1 の疑い）"""
+        return [(s, n) for s, n in self.statements.most_common() if n >= threshold]
+
+
+# ネストした計測（リクエスト全体とテスト内のブロックなど）すべてに記録する
+_collectors: ContextVar[tuple[QueryStats, ...]] = ContextVar(
+    "query_stats_collectors", default=()
+)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """ブロック内で実行された SQL を集計する"""
+    stats = QueryStats()
+    token = _collectors.set((*_collectors.get(), stats))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_times"].pop()
+    for stats in _collectors.get():
+        stats.record(statement, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # 失敗した文には after_cursor_execute が来ないため、ここで開始時刻を捨てる
+    # （接続時のエラーなど、文の実行に入る前の失敗では積まれていない）
+    if context.connection is None or context.execution_context is None:
+        return
+    start_times = context.connection.info.get("query_start_times")
+    if start_times:
+        start_times.pop()
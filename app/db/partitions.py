@@ -0,0 +1,117 @@
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+PARENT_TABLE = "refresh_tokens"
+DEFAULT_PARTITION = "refresh_tokens_default"
+_MONTHLY_PARTITION_NAME = re.compile(r"^refresh_tokens_p(\d{4})(\d{2})$")
+# lock_timeout でロック待ちを打ち切られたときの SQLSTATE（lock_not_available）
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1, tzinfo=UTC)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+@dataclass(frozen=True)
+class MonthlyPartition:
+    """refresh_tokens の月次パーティション [start, end)"""
+
+    start: datetime
+
+    @property
+    def name(self) -> str:
+        return f"refresh_tokens_p{self.start:%Y%m}"
+
+    @property
+    def end(self) -> datetime:
+        return add_months(self.start, 1)
+
+
+async def list_monthly_partitions(session: AsyncSession) -> list[MonthlyPartition]:
+    result = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    partitions = []
+    for (name,) in result:
+        match = _MONTHLY_PARTITION_NAME.match(name)
+        if match:
+            year, month = int(match.group(1)), int(match.group(2))
+            partitions.append(MonthlyPartition(datetime(year, month, 1, tzinfo=UTC)))
+    return sorted(partitions, key=lambda p: p.start)
+
+
+async def set_lock_timeout(session: AsyncSession, timeout_ms: int) -> None:
+    """
+    このトランザクションの間だけ、ロック待ちを timeout_ms ミリ秒で打ち切る。
+
+    ATTACH / DROP は親テーブルに強いロックを取るため、長いトランザクションの
+    後ろで待つと、その後ろに並んだ通常の SELECT / INSERT まで止まってしまう。
+    """
+    # SET はバインド変数を使えないため整数にしてから埋め込む
+    await session.execute(text(f"SET LOCAL lock_timeout = {int(timeout_ms)}"))
+
+
+def is_lock_timeout(error: DBAPIError) -> bool:
+    return getattr(error.orig, "sqlstate", None) == LOCK_NOT_AVAILABLE
+
+
+async def create_monthly_partition(
+    session: AsyncSession, partition: MonthlyPartition
+) -> int:
+    """
+    月次パーティションを作成し、デフォルトパーティションから移した行数を返す。
+
+    デフォルトパーティションに対象期間の行が残っていると ATTACH できないため、
+    同じテーブル定義で作成 → 行を移動 → ATTACH の順で行う。
+    """
+    await session.execute(
+        text(
+            f"CREATE TABLE {partition.name} "
+            f"(LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    moved = await session.execute(
+        text(
+            f"WITH moved AS ("
+            f"DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE expires_at >= :start AND expires_at < :end RETURNING *"
+            f") INSERT INTO {partition.name} SELECT * FROM moved"
+        ),
+        {"start": partition.start, "end": partition.end},
+    )
+    # パーティション境界はバインド変数を使えないためリテラルで埋め込む
+    await session.execute(
+        text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {partition.name} "
+            f"FOR VALUES FROM ('{partition.start.isoformat()}') "
+            f"TO ('{partition.end.isoformat()}')"
+        )
+    )
+    return moved.rowcount
+
+
+async def drop_monthly_partition(
+    session: AsyncSession, partition: MonthlyPartition
+) -> None:
+    """
+    月次パーティションを削除する。
+
+    DETACH PARTITION ... CONCURRENTLY はデフォルトパーティションがあると
+    使えないため、DROP TABLE で削除する（ロック待ちは set_lock_timeout で抑える）。
+    """
+    await session.execute(text(f"DROP TABLE {partition.name}"))
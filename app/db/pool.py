@@ -0,0 +1,62 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+
+@dataclass
+class PoolCounters:
+    """プール生成からの累計値"""
+
+    checkouts: int = 0
+    # 空き接続もオーバーフローの余地も無く、返却待ちになった回数と待ち時間の合計
+    waits: int = 0
+    wait_seconds: float = 0.0
+    timeouts: int = 0
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """貸し出し・待ち・タイムアウトを数える AsyncAdaptedQueuePool"""
+
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.counters = PoolCounters()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        saturated = (
+            self._max_overflow > -1
+            and self.checkedin() == 0
+            and self.overflow() >= self._max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.counters.timeouts += 1
+            raise
+        finally:
+            if saturated:
+                self.counters.waits += 1
+                self.counters.wait_seconds += time.perf_counter() - start
+        self.counters.checkouts += 1
+        return entry
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        pool = super().recreate()
+        # dispose() で作り直されても累計値は引き継ぐ
+        pool.counters = self.counters
+        return pool
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            # プールサイズを超えて開いている接続数（未使用分は負になるため 0 に丸める）
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.counters.checkouts,
+            "waits": self.counters.waits,
+            "wait_seconds": self.counters.wait_seconds,
+            "timeouts": self.counters.timeouts,
+        }
@@ -0,0 +1,41 @@
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+# レプリカで実行してよい読み取りに付ける実行オプション
+READ_REPLICA = "read_replica"
+
+# セッションが一度でもプライマリを使ったかを Session.info に記録するキー
+_USED_PRIMARY = "used_primary"
+
+
+class RoutingSession(Session):
+    """
+    READ_REPLICA を付けた読み取りだけをレプリカへ振り分けるセッション。
+
+    それ以外（書き込み・フラッシュ・オプション無しの読み取り）はプライマリで
+    実行する。一度プライマリを使ったセッションは、以降の読み取りも
+    プライマリで行う（同一リクエスト内の read-your-writes を保つ）。
+    replica_bind が無ければ全てプライマリで実行する。
+    """
+
+    def __init__(self, *args: Any, replica_bind: Engine | None = None, **kw: Any):
+        super().__init__(*args, **kw)
+        self._replica_bind = replica_bind
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        read_replica = kw.pop(READ_REPLICA, False)
+        if read_replica and not self.info.get(_USED_PRIMARY):
+            if self._replica_bind is not None:
+                return self._replica_bind
+        else:
+            self.info[_USED_PRIMARY] = True
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _route_replica_reads(orm_execute_state: ORMExecuteState) -> None:
+    # 実行オプションは selectinload などの関連ロードにも引き継がれる
+    if orm_execute_state.execution_options.get(READ_REPLICA):
+        orm_execute_state.bind_arguments[READ_REPLICA] = True
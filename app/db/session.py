@@ -1,29 +1,156 @@
-from collections.abc import AsyncGenerator
+import os
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.core.config import get_settings
+from app.db.pool import InstrumentedAsyncQueuePool
+from app.db.routing import RoutingSession
 
-settings = get_settings()
+# エンジンとセッションファクトリはプロセスごとに初回利用時に作る。
+# fork 前に作られたものを子プロセスで使い回すと接続を共有してしまうため、
+# 作成したプロセスの PID と一緒に保持する。
+_state: dict[str, Any] = {}
+_state_pid: int | None = None
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-)
 
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+def _process_state() -> dict[str, Any]:
+    global _state_pid
+    if _state_pid != os.getpid():
+        # 親プロセスから引き継いだ接続は閉じずに手放す（親側で使用中のため）
+        for engine in (_state.get("engine"), _state.get("replica_engine")):
+            if engine is not None:
+                engine.sync_engine.dispose(close=False)
+        _state.clear()
+        _state_pid = os.getpid()
+    return _state
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    settings = get_settings()
+    return create_async_engine(
+        url,
+        echo=settings.debug,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+
+
+def get_engine() -> AsyncEngine:
+    state = _process_state()
+    if "engine" not in state:
+        state["engine"] = _create_engine(get_settings().database_url)
+    return state["engine"]
+
+
+def get_replica_engine() -> AsyncEngine | None:
+    """レプリカのエンジンを返す（未設定なら None）"""
+    settings = get_settings()
+    if settings.replica_database_url is None:
+        return None
+    state = _process_state()
+    if "replica_engine" not in state:
+        state["replica_engine"] = _create_engine(settings.replica_database_url)
+    return state["replica_engine"]
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    state = _process_state()
+    if "session_factory" not in state:
+        replica_engine = get_replica_engine()
+        state["session_factory"] = async_sessionmaker(
+            get_engine(),
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            # レプリカ側は読み取り専用トランザクションで実行し、誤った書き込みを防ぐ
+            replica_bind=(
+                replica_engine.sync_engine.execution_options(postgresql_readonly=True)
+                if replica_engine
+                else None
+            ),
+            expire_on_commit=False,
+        )
+    return state["session_factory"]
+
+
+def get_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    state = _process_state()
+    if "read_session_factory" not in state:
+        engine = get_replica_engine() or get_engine()
+        state["read_session_factory"] = async_sessionmaker(
+            engine.execution_options(postgresql_readonly=True),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    return state["read_session_factory"]
+
+
+def pool_stats() -> dict[str, dict[str, float]]:
+    """このプロセスで作成済みのエンジンのプール統計"""
+    state = _process_state()
+    return {
+        name: engine.sync_engine.pool.stats()
+        for name, engine in (
+            ("primary", state.get("engine")),
+            ("replica", state.get("replica_engine")),
+        )
+        if engine is not None
+    }
+
+
+async def dispose_engines() -> None:
+    """このプロセスのエンジンの接続をすべて閉じる"""
+    state = _process_state()
+    for name in ("engine", "replica_engine"):
+        engine = state.get(name)
+        if engine is not None:
+            await engine.dispose()
+    state.clear()
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
+    async with get_session_factory()() as session:
         try:
             yield session
             await session.commit()
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    読み取り専用のセッション（レプリカがあればレプリカ）を返す。
+
+    書き込みは DB 側で拒否される。COMMIT は発行せず、終了時に接続を返す。
+    """
+    async with get_read_session_factory()() as session:
+        yield session
+
+
+@asynccontextmanager
+async def scoped_transaction(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    ブロック内の処理を1つのトランザクションとして実行し、抜けたらコミットする。
+
+    AsyncSession はトランザクションが終わると接続をプールへ返すため、
+    ユースケース内で CPU を使う処理（パスワードハッシュなど）の前後を
+    このブロックで区切れば、その間は接続を保持しない。
+    """
+    try:
+        yield session
+    except Exception:
+        await session.rollback()
+        raise
+    await session.commit()
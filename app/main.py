@@ -1,15 +1,70 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
 from app.core.config import get_settings
+from app.core.lifecycle import lifecycle
+from app.core.loop_monitor import LoopMonitor
+from app.core.metrics import mark_process_dead
+from app.core.security import shutdown_hash_executor
+from app.db.session import dispose_engines
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiler import ProfilerMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.services.account_cache import get_account_cache
+from app.services.rate_limit import check_rate_limit_backend
+from app.services.revocation import (
+    check_revocation_backend,
+    get_account_revocations,
+    get_token_revocations,
+)
+from app.services.warmup import warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    起動時: ウォームアップを済ませる（uvicorn はこの後でソケットを開く）。
+    停止時: 接続・ワーカーを閉じる。処理中のリクエストは uvicorn が
+    --timeout-graceful-shutdown まで待ってから shutdown を実行する。
+    """
+    # 設定（.env）は import 時ではなくここで初めて読む
+    settings = get_settings()
+    app.title = settings.app_name
+    check_revocation_backend()
+    check_rate_limit_backend()
+
+    loop_monitor = None
+    if settings.loop_monitor_enabled:
+        loop_monitor = LoopMonitor(
+            settings.loop_monitor_interval_seconds,
+            settings.loop_monitor_threshold_seconds,
+        )
+        loop_monitor.start()
+
+    await warm_up(settings.db_warmup_connections)
+    if settings.shutdown_drain_delay_seconds > 0:
+        lifecycle.install_drain_handler(settings.shutdown_drain_delay_seconds)
+
+    yield
+
+    if loop_monitor is not None:
+        await loop_monitor.stop()
+    await get_account_cache().close()
+    await get_account_revocations().close()
+    await get_token_revocations().close()
+    await dispose_engines()
+    shutdown_hash_executor()
+    mark_process_dead()
 
-settings = get_settings()
 
 app = FastAPI(
-    title=settings.app_name,
     description="お悩み相談チャットアプリ API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -19,6 +74,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfilerMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 app.include_router(api_router)
@@ -0,0 +1,79 @@
+import time
+
+from prometheus_client import Counter, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    REQUEST_DURATION,
+    REQUESTS,
+    REQUESTS_IN_PROGRESS,
+    RESPONSE_SIZE,
+)
+
+# ルートにマッチしなかったリクエスト（404 など）はパスをラベルにせずまとめる
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ルートテンプレートごとの処理時間・レスポンスサイズ・ステータス数を記録する。
+
+    ラベル付きの子メトリクスは初回だけ labels() で引き、以降は dict から取り出す
+    （labels() はメトリクス全体のロックを取るため、ホットパスでは呼ばない）。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_metrics: dict[tuple[str, str], tuple[Histogram, Histogram]] = {}
+        self._request_counters: dict[tuple[str, str, int], Counter] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        response_size = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_PROGRESS.dec()
+            self._observe(scope, status_code, response_size, elapsed)
+
+    def _observe(
+        self, scope: Scope, status_code: int, response_size: int, elapsed: float
+    ) -> None:
+        # scope["route"] はルーティング時に設定される
+        route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+        method = scope["method"]
+
+        route_key = (method, route)
+        route_metrics = self._route_metrics.get(route_key)
+        if route_metrics is None:
+            route_metrics = (
+                REQUEST_DURATION.labels(method, route),
+                RESPONSE_SIZE.labels(method, route),
+            )
+            self._route_metrics[route_key] = route_metrics
+        duration, size = route_metrics
+        duration.observe(elapsed)
+        size.observe(response_size)
+
+        counter_key = (method, route, status_code)
+        counter = self._request_counters.get(counter_key)
+        if counter is None:
+            counter = REQUESTS.labels(method, route, str(status_code))
+            self._request_counters[counter_key] = counter
+        counter.inc()
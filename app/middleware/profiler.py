@@ -0,0 +1,190 @@
+import asyncio
+import hmac
+import logging
+import sys
+import threading
+from collections import Counter
+from types import CodeType, FrameType
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+PROFILE_HEADER = "x-profile"
+# await 中（DB・ワーカープールの応答待ちなど）に取れたスタックの末尾に付ける
+AWAITING = "<await>"
+
+
+def _frame_name(code: CodeType, module: str | None) -> str:
+    return f"{module}:{code.co_name}" if module else code.co_name
+
+
+class StackSampler:
+    """
+    1つの asyncio タスクのスタックを別スレッドから一定間隔でサンプリングする。
+
+    タスクが実行中ならループのスレッドのフレームを、await で中断中なら
+    コルーチンの await の連鎖をたどり、タスクの外（イベントループ自体や
+    他のリクエスト）のフレームは含めない。
+    """
+
+    # サンプリング間隔の下限（設定値を検証しない経路でもスレッドが回り続けないように）
+    MIN_INTERVAL_SECONDS = 0.001
+    # stop でサンプラーのスレッドの終了を待つ上限
+    STOP_TIMEOUT_SECONDS = 1.0
+
+    def __init__(self, task: asyncio.Task, interval_seconds: float, max_samples: int):
+        self._task = task
+        self._loop = task.get_loop()
+        self._thread_id = threading.get_ident()
+        self._interval = max(interval_seconds, self.MIN_INTERVAL_SECONDS)
+        self._max_samples = max_samples
+        self._stacks: Counter[tuple[str, ...]] = Counter()
+        self._samples = 0
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+
+    @property
+    def samples(self) -> int:
+        return self._samples
+
+    def _running_stack(self) -> tuple[str, ...] | None:
+        root = self._task.get_coro().cr_frame
+        frame: FrameType | None = sys._current_frames().get(self._thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(_frame_name(frame.f_code, frame.f_globals.get("__name__")))
+            if frame is root:
+                return tuple(reversed(stack))
+            frame = frame.f_back
+        # 判定の直後に別のタスクへ切り替わった
+        return None
+
+    def _awaiting_stack(self) -> tuple[str, ...]:
+        stack = []
+        coro = self._task.get_coro()
+        while coro is not None:
+            frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+            if frame is None:
+                break
+            stack.append(_frame_name(frame.f_code, frame.f_globals.get("__name__")))
+            coro = getattr(coro, "cr_await", None) or getattr(
+                coro, "gi_yieldfrom", None
+            )
+        stack.append(AWAITING)
+        return tuple(stack)
+
+    def _sample(self) -> None:
+        if asyncio.current_task(self._loop) is self._task:
+            stack = self._running_stack()
+        else:
+            stack = self._awaiting_stack()
+        if stack is None:
+            return
+        self._stacks[stack] += 1
+        self._samples += 1
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self._interval):
+            if self._task.done() or self._samples >= self._max_samples:
+                return
+            try:
+                self._sample()
+            except Exception:
+                # 取得中にフレームが入れ替わった場合などはそのサンプルを捨てる
+                logger.debug("Failed to sample stack", exc_info=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    @property
+    def interval_seconds(self) -> float:
+        return self._interval
+
+    async def stop(self) -> None:
+        """サンプリングを止める（スレッドの終了はイベントループの外で待つ）"""
+        self._stopping.set()
+        await asyncio.to_thread(self._thread.join, self.STOP_TIMEOUT_SECONDS)
+        if self._thread.is_alive():
+            logger.warning("Profiler sampler did not stop in time")
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope が読める collapsed stack 形式"""
+        return "".join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in self._stacks.most_common()
+        )
+
+
+class ProfilerMiddleware:
+    """
+    X-Profile ヘッダーに profiler_token が指定されたリクエストだけをプロファイルする。
+
+    レスポンスは本来の内容の代わりに collapsed stack 形式のプロファイルになり、
+    本来のステータスは X-Profile-Status で返す。同時にプロファイルできる
+    リクエストは profiler_max_concurrent までで、超えた分は通常どおり処理する。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._active = 0
+
+    def _requested(self, scope: Scope) -> bool:
+        settings = get_settings()
+        if not settings.profiler_token:
+            return False
+        token = Headers(scope=scope).get(PROFILE_HEADER)
+        return token is not None and hmac.compare_digest(
+            token.encode(), settings.profiler_token.encode()
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        settings = get_settings()
+        if (
+            scope["type"] != "http"
+            or not self._requested(scope)
+            or self._active >= settings.profiler_max_concurrent
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def discard_response(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        sampler = StackSampler(
+            asyncio.current_task(),
+            settings.profiler_interval_seconds,
+            settings.profiler_max_samples,
+        )
+        self._active += 1
+        sampler.start()
+        try:
+            await self.app(scope, receive, discard_response)
+        finally:
+            await sampler.stop()
+            self._active -= 1
+
+        body = sampler.collapsed().encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"x-profile-status", str(status_code).encode()),
+                    (b"x-profile-samples", str(sampler.samples).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,73 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.db.instrumentation import QueryStats, capture_queries
+
+logger = logging.getLogger(__name__)
+
+
+def server_timing(stats: QueryStats) -> str:
+    return f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries"'
+
+
+class QueryStatsMiddleware:
+    """
+    リクエストごとに実行された SQL の文数・合計時間・最も遅い文を集計する。
+
+    debug 時はレスポンスに Server-Timing ヘッダーを付け、閾値を超えた
+    リクエストや N+1 の疑いがある SQL は WARNING でログに出す。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with capture_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start" and get_settings().debug:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(stats))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                _log_stats(scope, stats)
+
+
+def _log_stats(scope: Scope, stats: QueryStats) -> None:
+    settings = get_settings()
+    if stats.count == 0:
+        return
+
+    total_ms = stats.total_seconds * 1000
+    if (
+        stats.count > settings.sql_log_statement_threshold
+        or total_ms > settings.sql_log_duration_ms_threshold
+    ):
+        logger.warning(
+            "SQL budget exceeded: %s %s statements=%d db=%.1fms slowest=%.1fms %s",
+            scope["method"],
+            scope["path"],
+            stats.count,
+            total_ms,
+            stats.slowest_seconds * 1000,
+            stats.slowest_statement,
+        )
+
+    for statement, count in stats.repeated(settings.sql_n_plus_one_threshold):
+        logger.warning(
+            "Possible N+1: %s %s executed %d times: %s",
+            scope["method"],
+            scope["path"],
+            count,
+            statement,
+        )
@@ -1,23 +1,52 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
 
 class RefreshToken(Base):
+    """
+    リフレッシュトークン
+
+    expires_at で月ごとにレンジパーティショニングしている。
+    パーティションの作成・削除は app/db/partitions.py を参照。
+    パーティションの一意制約・主キーにはパーティションキーを含める必要がある。
+    """
+
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # 検索対象は未 revoke のトークンのみなので、インデックスもそれに絞る
+        Index(
+            "ix_refresh_tokens_token_hash_live",
+            "token_hash",
+            "expires_at",
+            unique=True,
+            postgresql_where=text("NOT revoked"),
+        ),
+        {"postgresql_partition_by": "RANGE (expires_at)"},
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     account_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False
     )
-    token: Mapped[str] = mapped_column(
-        String(512), unique=True, nullable=False, index=True
-    )
+    # トークン本体は保存せず、SHA-256 ダイジェスト（32バイト）のみ保存する
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
     expires_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
+        DateTime(timezone=True), primary_key=True, nullable=False
     )
     revoked: Mapped[bool] = mapped_column(
         Boolean, nullable=False, default=False, server_default="false"
@@ -29,3 +58,11 @@ class RefreshToken(Base):
     account: Mapped["Account"] = relationship(
         "Account", back_populates="refresh_tokens"
     )
+
+
+# 月次パーティションが未作成の期間の行を受け止めるデフォルトパーティション
+event.listen(
+    RefreshToken.__table__,
+    "after_create",
+    DDL("CREATE TABLE refresh_tokens_default PARTITION OF refresh_tokens DEFAULT"),
+)
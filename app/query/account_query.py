@@ -1,37 +1,118 @@
+from dataclasses import dataclass
+from datetime import datetime
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import make_transient_to_detached, selectinload
 
+from app.core.security import hash_refresh_token
+from app.db.routing import READ_REPLICA
 from app.models.account import Account
+from app.models.account_password import AccountPassword
 from app.models.refresh_token import RefreshToken
+from app.services.account_cache import get_account_cache
+
+
+@dataclass
+class LoginCredentials:
+    account_id: int
+    email: str
+    is_active: bool
+    created_at: datetime
+    hashed_password: str
 
 
 class AccountQuery:
     def __init__(self, session: AsyncSession):
         self._session = session
 
+    async def _execute_on_replica(self, statement):
+        # 同一リクエストで書き込み済みならセッション側でプライマリに切り替わる
+        return await self._session.execute(
+            statement, execution_options={READ_REPLICA: True}
+        )
+
+    async def _from_cache(self, values: dict) -> Account:
+        # キャッシュした列の値から永続化済みのインスタンスを組み立て、
+        # SELECT を発行せずにセッションへ取り込む
+        account = Account(**values)
+        make_transient_to_detached(account)
+        return await self._session.merge(account, load=False)
+
+    async def _get_account(self, values: dict | None, condition) -> Account | None:
+        if values is not None:
+            return await self._from_cache(values)
+
+        cache = get_account_cache()
+        if not cache.enabled:
+            result = await self._execute_on_replica(select(Account).where(condition))
+            return result.scalar_one_or_none()
+
+        # 読み取り中に無効化された行を入れないよう、読む前に世代を控える。
+        # レプリカの遅延で旧い行を入れないよう、キャッシュに入れる読み取りは
+        # プライマリで行う
+        generation = cache.generation
+        result = await self._session.execute(select(Account).where(condition))
+        account = result.scalar_one_or_none()
+        if account is not None:
+            cache.set(
+                {
+                    c.key: getattr(account, c.key)
+                    for c in Account.__mapper__.column_attrs
+                },
+                generation,
+            )
+        return account
+
     async def get_by_id(self, account_id: int) -> Account | None:
-        result = await self._session.execute(
-            select(Account).where(Account.id == account_id)
+        return await self._get_account(
+            get_account_cache().get_by_id(account_id), Account.id == account_id
         )
-        return result.scalar_one_or_none()
 
     async def get_by_email(self, email: str) -> Account | None:
-        result = await self._session.execute(
-            select(Account).where(Account.email == email)
+        return await self._get_account(
+            get_account_cache().get_by_email(email), Account.email == email
         )
-        return result.scalar_one_or_none()
 
     async def get_with_password(self, account_id: int) -> Account | None:
-        result = await self._session.execute(
+        result = await self._execute_on_replica(
             select(Account)
             .where(Account.id == account_id)
             .options(selectinload(Account.password))
         )
         return result.scalar_one_or_none()
 
-    async def get_with_auth_methods(self, account_id: int) -> Account | None:
+    async def get_login_credentials(self, email: str) -> LoginCredentials | None:
+        """
+        パスワードログインに必要な項目を1回のクエリで取得する。
+
+        サインアップ直後のログインやパスワード更新を取りこぼさないよう、
+        レプリカではなくプライマリで読む。
+        """
         result = await self._session.execute(
+            select(
+                Account.id,
+                Account.email,
+                Account.is_active,
+                Account.created_at,
+                AccountPassword.hashed_password,
+            )
+            .join(AccountPassword, AccountPassword.account_id == Account.id)
+            .where(Account.email == email)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return LoginCredentials(
+            account_id=row.id,
+            email=row.email,
+            is_active=row.is_active,
+            created_at=row.created_at,
+            hashed_password=row.hashed_password,
+        )
+
+    async def get_with_auth_methods(self, account_id: int) -> Account | None:
+        result = await self._execute_on_replica(
             select(Account)
             .where(Account.id == account_id)
             .options(
@@ -43,7 +124,15 @@ class AccountQuery:
         return result.scalar_one_or_none()
 
     async def get_refresh_token(self, token: str) -> RefreshToken | None:
+        """
+        未 revoke のリフレッシュトークンを取得する。
+
+        ローテーション・revoke 直後の状態を読む必要があるためプライマリで読む。
+        """
         result = await self._session.execute(
-            select(RefreshToken).where(RefreshToken.token == token)
+            select(RefreshToken).where(
+                RefreshToken.token_hash == hash_refresh_token(token),
+                ~RefreshToken.revoked,
+            )
         )
         return result.scalar_one_or_none()
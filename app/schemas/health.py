@@ -1,15 +1,37 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
+from app.schemas.stats import PoolStats
 
-class DatabaseHealth(BaseModel):
-    """データベース接続状態"""
+
+class DependencyHealth(BaseModel):
+    """依存サービスの接続状態"""
 
     status: str  # "connected" | "disconnected"
     error: str | None = None
+    # False のサービスは切断されていても readiness を落とさない
+    required: bool = True
+
+
+class DatabaseHealth(DependencyHealth):
+    """データベース接続状態"""
+
+
+class LivenessResponse(BaseModel):
+    """liveness レスポンス"""
+
+    status: str  # "alive"
 
 
 class HealthResponse(BaseModel):
-    """ヘルスチェックレスポンス"""
+    """ヘルスチェック（readiness）レスポンス"""
 
     status: str  # "healthy" | "unhealthy"
+    # "serving" | "draining"（SIGTERM を受けて停止処理を待っている）
+    lifecycle: str = "serving"
     database: DatabaseHealth
+    redis: DependencyHealth | None = None
+    broker: DependencyHealth | None = None
+    db_pool: dict[str, PoolStats] = {}
+    checked_at: datetime | None = None
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    """キャッシュのヒット・ミス件数"""
+
+    hits: int
+    misses: int
+    size: int
+
+
+class PoolStats(BaseModel):
+    """DB コネクションプールの状態と累計値"""
+
+    size: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    waits: int
+    wait_seconds: float
+    timeouts: int
+
+
+class StatsResponse(BaseModel):
+    """プロセス内統計レスポンス"""
+
+    account_cache: CacheStats
+    # 作成済みのエンジンのみ（primary / replica）
+    db_pool: dict[str, PoolStats]
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+from app.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+# Session.info に、コミット後に無効化するアカウント ID を積むキー
+_PENDING_KEY = "invalidated_account_ids"
+
+
+class AccountCache:
+    """
+    accounts 行（列の値のみ）のプロセス内キャッシュ。
+
+    ID をキーに行を、メールアドレスをキーに ID を保持する。
+    redis を渡すと無効化を pub/sub で全プロセスへ配信し、自身も購読して
+    他プロセスからの無効化を反映する。
+
+    読み取りの間にコミット・無効化された行を旧い値のまま入れないよう、
+    無効化ごとに世代を進め、読み取り前に控えた世代より後に無効化された
+    ID は set で入れない。
+    """
+
+    CHANNEL = "account-cache:invalidate"
+    # 無効化通知を待つ1回あたりの秒数
+    POLL_SECONDS = 1.0
+
+    def __init__(self, max_size: int, ttl_seconds: float, redis: Redis | None = None):
+        self._by_id: TTLCache[int, dict[str, Any]] = TTLCache(max_size, ttl_seconds)
+        self._by_email: TTLCache[str, int] = TTLCache(max_size, ttl_seconds)
+        self._redis = redis
+        self._listener: asyncio.Task | None = None
+        self._publishing: set[asyncio.Task] = set()
+        self._max_size = max_size
+        self._generation = 0
+        # ID → 最後に無効化した世代（古いものから max_size 件を超えた分は忘れる）
+        self._invalidated: OrderedDict[int, int] = OrderedDict()
+        # 忘れた無効化のうち最新の世代。これより前に始めた読み取りは入れない
+        self._forgotten_generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._by_id.enabled
+
+    @property
+    def generation(self) -> int:
+        """読み取りの前に控え、set に渡す"""
+        return self._generation
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._by_id)}
+
+    def _count(self, values: dict[str, Any] | None) -> dict[str, Any] | None:
+        if values is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return values
+
+    def get_by_id(self, account_id: int) -> dict[str, Any] | None:
+        self._ensure_listener()
+        return self._count(self._by_id.get(account_id))
+
+    def get_by_email(self, email: str) -> dict[str, Any] | None:
+        self._ensure_listener()
+        account_id = self._by_email.get(email)
+        values = self._by_id.get(account_id) if account_id is not None else None
+        if values is not None and values["email"] != email:
+            values = None
+        return self._count(values)
+
+    def set(self, values: dict[str, Any], generation: int) -> None:
+        """generation 以降に無効化された行は、読み取りより新しい値がありうるため入れない"""
+        account_id = values["id"]
+        if (
+            generation < self._forgotten_generation
+            or self._invalidated.get(account_id, 0) > generation
+        ):
+            return
+        self._by_id.set(account_id, values)
+        self._by_email.set(values["email"], account_id)
+
+    def discard(self, account_ids: Iterable[int]) -> None:
+        # メール索引は残しても、ID 側が無ければ読み直しになる
+        for account_id in account_ids:
+            self._generation += 1
+            self._invalidated[account_id] = self._generation
+            self._invalidated.move_to_end(account_id)
+            self._by_id.delete(account_id)
+        while len(self._invalidated) > self._max_size:
+            _, forgotten = self._invalidated.popitem(last=False)
+            self._forgotten_generation = forgotten
+
+    def clear(self) -> None:
+        # 読み取り中のものも含めて、これまでの読み取り結果は入れない
+        self._generation += 1
+        self._forgotten_generation = self._generation
+        self._invalidated.clear()
+        self._by_id.clear()
+        self._by_email.clear()
+
+    def invalidate(self, account_ids: Iterable[int]) -> None:
+        """自プロセスから削除し、Redis があれば他プロセスへ配信する"""
+        account_ids = list(account_ids)
+        self.discard(account_ids)
+        if self._redis is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._publish(account_ids))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    async def _publish(self, account_ids: list[int]) -> None:
+        try:
+            await self._redis.publish(self.CHANNEL, ",".join(map(str, account_ids)))
+        except RedisError:
+            logger.warning("Failed to publish account cache invalidation")
+
+    def _ensure_listener(self) -> None:
+        if self._redis is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if (
+            self._listener is None
+            or self._listener.done()
+            or self._listener.get_loop() is not loop
+        ):
+            self._listener = loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    while True:
+                        # listen() は socket_timeout で切れるため、timeout で区切って待つ
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=self.POLL_SECONDS
+                        )
+                        if message is not None:
+                            self.discard(int(i) for i in message["data"].split(","))
+            except RedisError:
+                # 切断中の無効化は取りこぼしている可能性があるため全て捨てる
+                logger.warning("Account cache invalidation channel disconnected")
+                self.clear()
+                await asyncio.sleep(1.0)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+
+@lru_cache
+def get_account_cache() -> AccountCache:
+    settings = get_settings()
+    redis = get_redis() if settings.account_cache_invalidation == "redis" else None
+    return AccountCache(
+        max_size=settings.account_cache_max_size,
+        ttl_seconds=settings.account_cache_ttl_seconds,
+        redis=redis,
+    )
+
+
+def invalidate_on_commit(session: Session, account_id: int) -> None:
+    """セッションのコミット後にアカウントのキャッシュを無効化する"""
+    session.info.setdefault(_PENDING_KEY, set()).add(account_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    account_ids = session.info.pop(_PENDING_KEY, None)
+    if account_ids:
+        get_account_cache().invalidate(account_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from app.core.config import get_settings
+from app.core.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_WAIT,
+    ADMISSION_QUEUED,
+    ADMISSION_REJECTED,
+)
+
+
+class OverloadedError(Exception):
+    """待ち行列が満杯、または待ち時間の上限を超えた"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionLimiter:
+    """
+    同時実行数を max_concurrent に制限し、超えた分を FIFO で待たせる。
+
+    待ちが max_queue 件を超える呼び出しは待たずに、queue_timeout_seconds
+    待っても順番が来ない呼び出しはその時点で OverloadedError を送出する。
+    無制限に待たせるとタイムアウトまで全員が遅くなるため、溢れた分は早く断る。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout_seconds: float,
+    ):
+        self.name = name
+        self._max_concurrent = max_concurrent
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout_seconds
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._in_flight = ADMISSION_IN_FLIGHT.labels(name)
+        self._queued = ADMISSION_QUEUED.labels(name)
+        self._queue_wait = ADMISSION_QUEUE_WAIT.labels(name)
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _reject(self, reason: str) -> OverloadedError:
+        ADMISSION_REJECTED.labels(self.name, reason).inc()
+        return OverloadedError(reason)
+
+    def _release(self) -> None:
+        # 待っている呼び出しがあれば、枠を減らさずにそのまま引き渡す
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            self._queued.dec()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+        self._in_flight.dec()
+
+    async def _wait_for_slot(self) -> None:
+        if len(self._waiters) >= self._max_queue:
+            raise self._reject("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._queued.inc()
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(self._queue_timeout):
+                await waiter
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # 取り消しと同時に枠を受け取っていた場合は、次の呼び出しへ回す
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._queued.dec()
+            if isinstance(e, TimeoutError):
+                raise self._reject("queue_timeout") from None
+            raise
+        finally:
+            self._queue_wait.observe(time.monotonic() - start)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        if self._active < self._max_concurrent and not self._waiters:
+            self._active += 1
+            self._in_flight.inc()
+        else:
+            await self._wait_for_slot()
+        try:
+            yield
+        finally:
+            self._release()
+
+
+@lru_cache
+def get_password_admission() -> AdmissionLimiter:
+    """パスワードハッシュを伴うエンドポイント（ログイン・サインアップ）用"""
+    settings = get_settings()
+    return AdmissionLimiter(
+        "password",
+        max_concurrent=settings.password_admission_max_concurrent,
+        max_queue=settings.password_admission_max_queue,
+        queue_timeout_seconds=settings.password_admission_queue_timeout_seconds,
+    )
@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Protocol
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import APP_ENV, get_settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """1つのキーに対する上限（窓の長さはリミッターごとに共通）"""
+
+    key: str
+    limit: int
+
+
+class RateLimiter(Protocol):
+    """スライディングウィンドウで試行回数を数えるリミッターのインターフェース"""
+
+    async def hit(self, limits: Sequence[RateLimit]) -> float:
+        """
+        すべてのキーに空きがあれば1回の試行として数えて 0 を返す。
+
+        どれかが上限に達していれば何も数えずに、空くまでの秒数を返す。
+        """
+        ...
+
+
+class MemoryRateLimiter:
+    """プロセス内で試行時刻のログを保持するリミッター（単一プロセス・テスト用）"""
+
+    def __init__(
+        self,
+        window_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._window_seconds = window_seconds
+        self._clock = clock
+        self._hits: dict[str, deque[float]] = {}
+        self._swept_at = clock()
+
+    def _sweep(self, cutoff: float) -> None:
+        # 窓の外の試行しか残っていないキーを捨てる
+        self._hits = {k: v for k, v in self._hits.items() if v and v[-1] > cutoff}
+
+    async def hit(self, limits: Sequence[RateLimit]) -> float:
+        now = self._clock()
+        cutoff = now - self._window_seconds
+        if now - self._swept_at >= self._window_seconds:
+            self._sweep(cutoff)
+            self._swept_at = now
+
+        retry_after = 0.0
+        for limit in limits:
+            hits = self._hits.get(limit.key, deque())
+            while hits and hits[0] <= cutoff:
+                hits.popleft()
+            if len(hits) >= limit.limit:
+                oldest = hits[0] if hits else now
+                retry_after = max(retry_after, oldest + self._window_seconds - now)
+        if retry_after > 0:
+            return retry_after
+
+        for limit in limits:
+            self._hits.setdefault(limit.key, deque()).append(now)
+        return 0.0
+
+
+# KEYS: 対象のキー, ARGV[1]: 窓(ms), ARGV[2]: 試行の ID, ARGV[3..]: 各キーの上限
+# 時刻は Redis サーバーのものを使い、プロセス間の時計のずれの影響を受けない
+SLIDING_WINDOW_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local window = tonumber(ARGV[1])
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[i + 2]) then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        local wait = window
+        if oldest[2] then
+            wait = tonumber(oldest[2]) + window - now
+        end
+        retry_after = math.max(retry_after, wait, 1)
+    end
+end
+if retry_after > 0 then
+    return retry_after
+end
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[2])
+    redis.call('PEXPIRE', key, window)
+end
+return 0
+"""
+
+
+class RedisRateLimiter:
+    """
+    Redis の ZSET（試行 ID → 時刻）で試行を数えるリミッター。
+
+    全キーの確認と記録を1つの Lua スクリプトで行うため、1回の往復で
+    アトミックに判定できる。Redis に到達できない間は制限せずに通す
+    （CPU の保護は流量制限が受け持つ）。
+    """
+
+    def __init__(self, redis: Redis, window_seconds: float):
+        self._window_ms = int(window_seconds * 1000)
+        self._script = redis.register_script(SLIDING_WINDOW_SCRIPT)
+
+    async def hit(self, limits: Sequence[RateLimit]) -> float:
+        try:
+            retry_after_ms = await self._script(
+                keys=[limit.key for limit in limits],
+                args=[
+                    self._window_ms,
+                    uuid.uuid4().hex,
+                    *(limit.limit for limit in limits),
+                ],
+            )
+        except RedisError:
+            # 接続エラーに加え、socket_timeout による TimeoutError もここに来る
+            logger.warning("Rate limiter is unavailable; allowing request")
+            return 0.0
+        return retry_after_ms / 1000
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def login_limits(client_ip: str | None, email: str) -> list[RateLimit]:
+    """ログイン試行の制限（メールアドレスはハッシュ化してキーにする）"""
+    settings = get_settings()
+    email_digest = hashlib.sha256(normalize_email(email).encode("utf-8")).hexdigest()
+    limits = [
+        RateLimit(
+            f"ratelimit:login:email:{email_digest}",
+            settings.login_rate_limit_per_email,
+        )
+    ]
+    if client_ip is not None:
+        limits.append(
+            RateLimit(
+                f"ratelimit:login:ip:{client_ip}",
+                settings.login_rate_limit_per_ip,
+            )
+        )
+    return limits
+
+
+def check_rate_limit_backend(app_env: str = APP_ENV) -> None:
+    """起動時に回数制限の保存先を確認し、テスト以外で memory なら警告する"""
+    if get_settings().rate_limit_backend == "memory" and app_env != "test":
+        logger.warning(
+            "RATE_LIMIT_BACKEND=memory: login attempts are counted per worker, "
+            "so each worker allows the full limit; use redis with multiple workers"
+        )
+
+
+@lru_cache
+def get_login_rate_limiter() -> RateLimiter:
+    settings = get_settings()
+    window_seconds = settings.login_rate_limit_window_seconds
+    if settings.rate_limit_backend == "redis":
+        return RedisRateLimiter(get_redis(), window_seconds)
+    return MemoryRateLimiter(window_seconds)
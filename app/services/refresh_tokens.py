@@ -0,0 +1,305 @@
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Protocol
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.command.account_command import AccountCommand
+from app.core.config import get_settings
+from app.core.redis import get_redis
+from app.core.security import hash_refresh_token
+from app.query.account_query import AccountQuery
+
+
+class RefreshTokenStore(Protocol):
+    """
+    リフレッシュトークンの保存先のインターフェース。
+
+    トークン本体は保存せず、hash_refresh_token のダイジェストだけを保存する。
+    """
+
+    # True のストアは DB に保存するため、アカウントの作成と同じ文でトークンも
+    # 作成できる（AccountCommand.create_account_with_password に渡す）
+    in_database: bool
+
+    async def issue(self, account_id: int, token: str, expires_at: datetime) -> None:
+        """トークンを発行する"""
+        ...
+
+    async def rotate(
+        self, token: str, new_token: str, new_expires_at: datetime
+    ) -> int | None:
+        """
+        有効なトークンを失効させ、同じアカウントに新しいトークンを発行する。
+
+        アトミックに行い、同じトークンで同時に呼ばれても成功するのは1つだけ。
+        成功したらアカウント ID を、無効・期限切れ・競合負けなら None を返す。
+        """
+        ...
+
+    async def expired(self, token: str) -> bool:
+        """未失効のトークンが期限切れで残っているか（エラー内容の判定用）"""
+        ...
+
+    async def revoke(self, token: str) -> None: ...
+
+    async def revoke_all(self, account_id: int) -> None: ...
+
+
+class SqlRefreshTokenStore:
+    """refresh_tokens テーブルに保存するストア（リクエストのセッションで書き込む）"""
+
+    in_database = True
+
+    def __init__(self, session: AsyncSession):
+        self._query = AccountQuery(session)
+        self._command = AccountCommand(session)
+
+    async def issue(self, account_id: int, token: str, expires_at: datetime) -> None:
+        await self._command.create_refresh_token(account_id, token, expires_at)
+
+    async def rotate(
+        self, token: str, new_token: str, new_expires_at: datetime
+    ) -> int | None:
+        return await self._command.rotate_refresh_token(
+            token, new_token, new_expires_at
+        )
+
+    async def expired(self, token: str) -> bool:
+        token_record = await self._query.get_refresh_token(token)
+        return token_record is not None and token_record.expires_at.replace(
+            tzinfo=UTC
+        ) < datetime.now(UTC)
+
+    async def revoke(self, token: str) -> None:
+        token_record = await self._query.get_refresh_token(token)
+        if token_record:
+            await self._command.revoke_refresh_token(token_record)
+
+    async def revoke_all(self, account_id: int) -> None:
+        await self._command.revoke_all_refresh_tokens(account_id)
+
+
+class MemoryRefreshTokenStore:
+    """
+    プロセス内の dict だけで保持するストア（単一プロセス・テスト用）。
+
+    失効させたトークンはその場で捨てる。期限切れのトークンは expired で
+    判定できるよう残し、アカウント単位の revoke_all で捨てる。
+    """
+
+    in_database = False
+
+    def __init__(self):
+        self._tokens: dict[bytes, tuple[int, datetime]] = {}
+        self._by_account: dict[int, set[bytes]] = {}
+
+    async def issue(self, account_id: int, token: str, expires_at: datetime) -> None:
+        digest = hash_refresh_token(token)
+        self._tokens[digest] = (account_id, expires_at)
+        self._by_account.setdefault(account_id, set()).add(digest)
+
+    def _pop(self, digest: bytes) -> int | None:
+        entry = self._tokens.pop(digest, None)
+        if entry is None:
+            return None
+        account_id, _ = entry
+        self._by_account[account_id].discard(digest)
+        return account_id
+
+    async def rotate(
+        self, token: str, new_token: str, new_expires_at: datetime
+    ) -> int | None:
+        # await を挟まないため、イベントループ上ではこのまま不可分になる
+        digest = hash_refresh_token(token)
+        entry = self._tokens.get(digest)
+        if entry is None or entry[1] <= datetime.now(UTC):
+            return None
+        account_id = self._pop(digest)
+        await self.issue(account_id, new_token, new_expires_at)
+        return account_id
+
+    async def expired(self, token: str) -> bool:
+        entry = self._tokens.get(hash_refresh_token(token))
+        return entry is not None and entry[1] <= datetime.now(UTC)
+
+    async def revoke(self, token: str) -> None:
+        self._pop(hash_refresh_token(token))
+
+    async def revoke_all(self, account_id: int) -> None:
+        for digest in self._by_account.pop(account_id, set()):
+            self._tokens.pop(digest, None)
+
+
+# prune: 索引から、キーが期限切れで消えたダイジェストを取り除く（肥大化を防ぐ）
+# extend: 索引の期限を、含まれるトークンの最も遅い期限まで延ばす（縮めない）
+# prune はトークンのキーをスクリプト内で組み立てるため、Redis Cluster には対応しない
+_INDEX_FUNCTIONS = """
+local function prune(index, token_prefix)
+    for _, digest in ipairs(redis.call('SMEMBERS', index)) do
+        if redis.call('EXISTS', token_prefix .. digest) == 0 then
+            redis.call('SREM', index, digest)
+        end
+    end
+end
+
+local function extend(index, expires_at_ms)
+    local now = redis.call('TIME')
+    local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+    local ttl = redis.call('PTTL', index)
+    if ttl < 0 or now_ms + ttl < tonumber(expires_at_ms) then
+        redis.call('PEXPIREAT', index, expires_at_ms)
+    end
+end
+"""
+
+# KEYS[1]: トークンのキー, KEYS[2]: アカウント索引のキー
+# ARGV[1]: アカウント ID, ARGV[2]: 期限(UNIX ms), ARGV[3]: ダイジェスト,
+# ARGV[4]: トークンのキーの接頭辞
+ISSUE_SCRIPT = (
+    _INDEX_FUNCTIONS
+    + """
+redis.call('SET', KEYS[1], ARGV[1], 'PXAT', ARGV[2])
+prune(KEYS[2], ARGV[4])
+redis.call('SADD', KEYS[2], ARGV[3])
+extend(KEYS[2], ARGV[2])
+return 0
+"""
+)
+
+# KEYS[1]: 旧トークンのキー, KEYS[2]: 新トークンのキー
+# ARGV[1]: 新トークンの期限(UNIX ms), ARGV[2]: アカウント索引のキーの接頭辞,
+# ARGV[3]: 旧トークンのダイジェスト, ARGV[4]: 新トークンのダイジェスト,
+# ARGV[5]: トークンのキーの接頭辞
+# 索引のキーはスクリプト内で組み立てるため、Redis Cluster には対応しない
+ROTATE_SCRIPT = (
+    _INDEX_FUNCTIONS
+    + """
+local account_id = redis.call('GET', KEYS[1])
+if not account_id then
+    return false
+end
+redis.call('DEL', KEYS[1])
+redis.call('SET', KEYS[2], account_id, 'PXAT', ARGV[1])
+local index = ARGV[2] .. account_id
+redis.call('SREM', index, ARGV[3])
+prune(index, ARGV[5])
+redis.call('SADD', index, ARGV[4])
+extend(index, ARGV[1])
+return account_id
+"""
+)
+
+# KEYS[1]: トークンのキー, ARGV[1]: 索引のキーの接頭辞, ARGV[2]: ダイジェスト
+REVOKE_SCRIPT = """
+local account_id = redis.call('GET', KEYS[1])
+if account_id then
+    redis.call('DEL', KEYS[1])
+    redis.call('SREM', ARGV[1] .. account_id, ARGV[2])
+end
+return 0
+"""
+
+# KEYS[1]: アカウント索引のキー, ARGV[1]: トークンのキーの接頭辞
+REVOKE_ALL_SCRIPT = """
+for _, digest in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    redis.call('DEL', ARGV[1] .. digest)
+end
+redis.call('DEL', KEYS[1])
+return 0
+"""
+
+
+class RedisRefreshTokenStore:
+    """
+    Redis に保存するストア。
+
+    トークンごとに「ダイジェスト → アカウント ID」のキーを期限付き（PXAT）で
+    作り、期限切れのトークンは Redis が消す。revoke_all のためにアカウントごとの
+    ダイジェストの集合も持ち、発行・ローテーションのたびに期限切れで消えた
+    ダイジェストを取り除く。どちらも Lua スクリプトで1回の往復で行う。
+    期限切れと未発行は区別できないため、expired は常に False を返す。
+    PXAT を使うため Redis 6.2 以降が必要。
+    """
+
+    in_database = False
+
+    TOKEN_PREFIX = "refresh:token:"
+    ACCOUNT_PREFIX = "refresh:account:"
+
+    def __init__(self, redis: Redis):
+        self._redis = redis
+        self._issue = redis.register_script(ISSUE_SCRIPT)
+        self._rotate = redis.register_script(ROTATE_SCRIPT)
+        self._revoke = redis.register_script(REVOKE_SCRIPT)
+        self._revoke_all = redis.register_script(REVOKE_ALL_SCRIPT)
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hash_refresh_token(token).hex()
+
+    @staticmethod
+    def _expires_at_ms(expires_at: datetime) -> int:
+        return int(expires_at.timestamp() * 1000)
+
+    async def issue(self, account_id: int, token: str, expires_at: datetime) -> None:
+        digest = self._digest(token)
+        await self._issue(
+            keys=[
+                f"{self.TOKEN_PREFIX}{digest}",
+                f"{self.ACCOUNT_PREFIX}{account_id}",
+            ],
+            args=[
+                account_id,
+                self._expires_at_ms(expires_at),
+                digest,
+                self.TOKEN_PREFIX,
+            ],
+        )
+
+    async def rotate(
+        self, token: str, new_token: str, new_expires_at: datetime
+    ) -> int | None:
+        digest = self._digest(token)
+        new_digest = self._digest(new_token)
+        account_id = await self._rotate(
+            keys=[f"{self.TOKEN_PREFIX}{digest}", f"{self.TOKEN_PREFIX}{new_digest}"],
+            args=[
+                self._expires_at_ms(new_expires_at),
+                self.ACCOUNT_PREFIX,
+                digest,
+                new_digest,
+                self.TOKEN_PREFIX,
+            ],
+        )
+        return int(account_id) if account_id is not None else None
+
+    async def expired(self, token: str) -> bool:
+        return False
+
+    async def revoke(self, token: str) -> None:
+        digest = self._digest(token)
+        await self._revoke(
+            keys=[f"{self.TOKEN_PREFIX}{digest}"], args=[self.ACCOUNT_PREFIX, digest]
+        )
+
+    async def revoke_all(self, account_id: int) -> None:
+        await self._revoke_all(
+            keys=[f"{self.ACCOUNT_PREFIX}{account_id}"], args=[self.TOKEN_PREFIX]
+        )
+
+
+@lru_cache
+def _get_shared_store(backend: str) -> RefreshTokenStore:
+    if backend == "redis":
+        return RedisRefreshTokenStore(get_redis())
+    return MemoryRefreshTokenStore()
+
+
+def get_refresh_token_store(session: AsyncSession) -> RefreshTokenStore:
+    """設定に応じたストアを返す（sql の場合はそのセッションで読み書きする）"""
+    settings = get_settings()
+    if settings.refresh_token_backend == "sql":
+        return SqlRefreshTokenStore(session)
+    return _get_shared_store(settings.refresh_token_backend)
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Protocol
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import APP_ENV, get_settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationSet(Protocol):
+    """失効させた識別子と失効時刻（UNIX 秒）を保持する集合のインターフェース"""
+
+    async def revoke(self, member: str, revoked_at: float | None = None) -> None: ...
+
+    async def revoked_at(self, member: str) -> float | None: ...
+
+    async def start(self) -> None:
+        """起動時に呼ぶ（共有ストアの取り込みを済ませ、同期を始める）"""
+        ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryRevocationSet:
+    """
+    プロセス内の dict だけで保持する失効セット。
+
+    retention_seconds を過ぎたエントリは判定に使わず、retention_seconds ごとに
+    失効の登録のついでにまとめて捨てる（登録1回あたりは O(1) に保つ）。
+    アクセストークンの有効期間を retention にすれば、それより古い失効は
+    判定に影響しないため集合は小さいまま保たれる。
+    """
+
+    def __init__(self, retention_seconds: float):
+        self._retention_seconds = retention_seconds
+        self._entries: dict[str, float] = {}
+        self._next_prune = time.time() + retention_seconds
+
+    def _cutoff(self) -> float:
+        return time.time() - self._retention_seconds
+
+    def _prune(self) -> None:
+        now = time.time()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self._retention_seconds
+        cutoff = now - self._retention_seconds
+        for member in [m for m, t in self._entries.items() if t < cutoff]:
+            del self._entries[member]
+
+    async def revoke(self, member: str, revoked_at: float | None = None) -> None:
+        revoked_at = time.time() if revoked_at is None else revoked_at
+        self._prune()
+        self._entries[member] = max(revoked_at, self._entries.get(member, revoked_at))
+
+    async def revoked_at(self, member: str) -> float | None:
+        revoked_at = self._entries.get(member)
+        if revoked_at is None or revoked_at < self._cutoff():
+            return None
+        return revoked_at
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisRevocationSet(MemoryRevocationSet):
+    """
+    Redis の ZSET（member → 失効時刻）を正とし、プロセス内にミラーする失効セット。
+
+    判定はミラーに対してだけ行い、Redis には問い合わせない。ミラーは
+    バックグラウンドのタスクが sync_interval_seconds ごとに ZSET を丸ごと
+    取り込み直す。他プロセスで登録した失効は最大でこの間隔だけ遅れて反映される。
+    Redis に到達できない間は最後に取り込んだ内容で判定を続ける。
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        key: str,
+        retention_seconds: float,
+        sync_interval_seconds: float,
+    ):
+        super().__init__(retention_seconds)
+        self._redis = redis
+        self._key = key
+        self._sync_interval_seconds = sync_interval_seconds
+        # 取り込み中に自プロセスで登録した失効（取り込み結果で上書きしないため）
+        self._revoked_during_sync: dict[str, float] = {}
+        self._syncer: asyncio.Task | None = None
+
+    async def revoke(self, member: str, revoked_at: float | None = None) -> None:
+        revoked_at = time.time() if revoked_at is None else revoked_at
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self._key, {member: revoked_at}, gt=True)
+            pipe.zremrangebyscore(self._key, "-inf", f"({self._cutoff()}")
+            await pipe.execute()
+        await super().revoke(member, revoked_at)
+        self._revoked_during_sync[member] = self._entries[member]
+
+    async def sync(self) -> None:
+        self._revoked_during_sync = {}
+        entries = dict(
+            await self._redis.zrangebyscore(
+                self._key, self._cutoff(), "+inf", withscores=True
+            )
+        )
+        # ZRANGEBYSCORE の後に届いた revoke の分を戻す
+        for member, revoked_at in self._revoked_during_sync.items():
+            entries[member] = max(revoked_at, entries.get(member, revoked_at))
+        self._entries = entries
+
+    async def _try_sync(self) -> None:
+        try:
+            await self.sync()
+        except RedisError:
+            logger.warning("Failed to sync revocation set %s", self._key)
+
+    async def _sync_periodically(self, delay: float) -> None:
+        while True:
+            await asyncio.sleep(delay)
+            await self._try_sync()
+            delay = self._sync_interval_seconds
+
+    def _ensure_syncer(self, delay: float = 0.0) -> None:
+        loop = asyncio.get_running_loop()
+        if (
+            self._syncer is None
+            or self._syncer.done()
+            or self._syncer.get_loop() is not loop
+        ):
+            self._syncer = loop.create_task(self._sync_periodically(delay))
+
+    async def revoked_at(self, member: str) -> float | None:
+        self._ensure_syncer()
+        return await super().revoked_at(member)
+
+    async def start(self) -> None:
+        # 最初のリクエストの判定より前に一度取り込んでおく
+        await self._try_sync()
+        self._ensure_syncer(delay=self._sync_interval_seconds)
+
+    async def close(self) -> None:
+        if self._syncer is not None:
+            self._syncer.cancel()
+            self._syncer = None
+
+
+def _access_token_revocation_set(key: str) -> RevocationSet:
+    # アクセストークンの有効期間より古い失効は判定に影響しない
+    settings = get_settings()
+    retention_seconds = settings.access_token_expire_minutes * 60
+    if settings.revocation_backend == "redis":
+        return RedisRevocationSet(
+            get_redis(),
+            key=key,
+            retention_seconds=retention_seconds,
+            sync_interval_seconds=settings.revocation_sync_interval_seconds,
+        )
+    return MemoryRevocationSet(retention_seconds)
+
+
+def check_revocation_backend(app_env: str = APP_ENV) -> None:
+    """
+    起動時に失効セットの保存先を確認する（テストでは何もしない）。
+
+    memory の失効は登録したプロセスにしか残らないため、複数ワーカーで動かすと
+    ログアウト・アカウント無効化がそのリクエストを処理したワーカーでしか効かない。
+    失効セットだけで認証する auth_stateless との組み合わせは起動を拒否し、
+    それ以外は警告を出す。
+    """
+    settings = get_settings()
+    if settings.revocation_backend != "memory" or app_env == "test":
+        return
+    if settings.auth_stateless:
+        raise RuntimeError(
+            "AUTH_STATELESS=true requires REVOCATION_BACKEND=redis; "
+            "the memory backend only revokes tokens in the worker that handled it"
+        )
+    logger.warning(
+        "REVOCATION_BACKEND=memory: logout and deactivation only take effect "
+        "in the worker that handled them; use redis with multiple workers"
+    )
+
+
+@lru_cache
+def get_account_revocations() -> RevocationSet:
+    """無効化したアカウント ID の失効セットを返す"""
+    return _access_token_revocation_set("revoked:accounts")
+
+
+@lru_cache
+def get_token_revocations() -> RevocationSet:
+    """
+    ログアウトしたアクセストークンの jti の失効セットを返す。
+
+    失効時刻にはトークンの iat を登録する。保持期間がアクセストークンの
+    有効期間なので、エントリはトークンの exp を過ぎた時点で捨てられ、
+    集合にはまだ有効期限内の失効トークンだけが残る。
+    """
+    return _access_token_revocation_set("revoked:tokens")
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    get_password_hash_async,
+)
+from app.db.session import get_engine, get_replica_engine
+from app.models.account import Account
+from app.schemas.account import AccountCreateRequest, AccountResponse
+from app.schemas.auth import SignupResponse, TokenResponse
+from app.services.revocation import get_account_revocations, get_token_revocations
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_engine(engine: AsyncEngine, connections: int) -> None:
+    """
+    プールに connections 本の接続を開き、それぞれでクエリを1回実行する。
+
+    接続の確立と asyncpg の型情報の取得、SQLAlchemy のコンパイル済み
+    クエリのキャッシュを、最初のリクエストより前に済ませる。
+    """
+    async with AsyncExitStack() as stack:
+        # 同時に借りることで、別々の接続を開かせる
+        conns = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections))
+        )
+        await asyncio.gather(
+            *(conn.execute(select(Account).limit(0)) for conn in conns)
+        )
+
+
+async def warm_up_security() -> None:
+    """JWT の署名・検証と、パスワードハッシュのワーカープールを起動しておく"""
+    token = create_access_token({"sub": "0"})
+    decode_access_token(token)
+    await get_password_hash_async("warm-up-password")
+
+
+async def warm_up_revocations() -> None:
+    """失効セットを取り込み、以後の同期をバックグラウンドで始める"""
+    await asyncio.gather(
+        get_account_revocations().start(), get_token_revocations().start()
+    )
+
+
+def warm_up_serialization() -> None:
+    """リクエスト・レスポンスのスキーマの検証とシリアライズを一度通しておく"""
+    AccountCreateRequest(email="warm-up@example.com", password="warm-up-password")
+    SignupResponse(
+        account=AccountResponse(
+            id=0,
+            email="warm-up@example.com",
+            is_active=True,
+            has_password=True,
+            oauth_providers=[],
+            passkey_count=0,
+            created_at=datetime.now(UTC),
+        ),
+        token=TokenResponse(access_token="", refresh_token=""),
+    ).model_dump_json()
+
+
+async def warm_up(db_connections: int) -> None:
+    """起動時のウォームアップ（失敗しても起動は止めず、ログだけ残す）"""
+    start = time.perf_counter()
+
+    engines = [get_engine(), get_replica_engine()]
+    results = await asyncio.gather(
+        *(
+            warm_up_engine(engine, db_connections)
+            for engine in engines
+            if engine is not None and db_connections > 0
+        ),
+        warm_up_security(),
+        warm_up_revocations(),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning("Warm-up step failed: %r", result)
+
+    warm_up_serialization()
+    logger.info("Warm-up finished in %.0fms", (time.perf_counter() - start) * 1000)
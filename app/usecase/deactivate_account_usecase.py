@@ -0,0 +1,24 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.command.account_command import AccountCommand
+from app.services.refresh_tokens import RefreshTokenStore, get_refresh_token_store
+from app.services.revocation import get_account_revocations
+
+
+class DeactivateAccountUseCase:
+    def __init__(
+        self,
+        session: AsyncSession,
+        refresh_tokens: RefreshTokenStore | None = None,
+    ):
+        self._session = session
+        self._refresh_tokens = refresh_tokens or get_refresh_token_store(session)
+        self._command = AccountCommand(session)
+
+    async def execute(self, account_id: int) -> None:
+        if not await self._command.deactivate_account(account_id):
+            raise ValueError("アカウントが見つからないか、既に無効です")
+
+        # リフレッシュでの再発行を止め、発行済みのアクセストークンは失効セットで弾く
+        await self._refresh_tokens.revoke_all(account_id)
+        await get_account_revocations().revoke(str(account_id))
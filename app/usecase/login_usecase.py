@@ -5,8 +5,15 @@ from datetime import UTC, datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.command.account_command import AccountCommand
-from app.core.security import create_access_token, verify_password
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async,
+)
+from app.db.session import scoped_transaction
 from app.query.account_query import AccountQuery
+from app.services.refresh_tokens import RefreshTokenStore, get_refresh_token_store
 
 
 @dataclass
@@ -22,39 +29,53 @@ class LoginResult:
 class LoginUseCase:
     REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        refresh_tokens: RefreshTokenStore | None = None,
+    ):
         self._session = session
+        self._refresh_tokens = refresh_tokens or get_refresh_token_store(session)
         self._query = AccountQuery(session)
         self._command = AccountCommand(session)
 
     async def execute(self, email: str, password: str) -> LoginResult:
-        account = await self._query.get_by_email(email)
-        if not account:
+        # 読み取りが終わったら接続をプールへ返してから bcrypt を実行する
+        async with scoped_transaction(self._session):
+            credentials = await self._query.get_login_credentials(email)
+        if not credentials:
             raise ValueError("メールアドレスまたはパスワードが正しくありません")
 
-        account_with_pw = await self._query.get_with_password(account.id)
-        if not account_with_pw or not account_with_pw.password:
+        if not await verify_password_async(password, credentials.hashed_password):
             raise ValueError("メールアドレスまたはパスワードが正しくありません")
 
-        if not verify_password(password, account_with_pw.password.hashed_password):
-            raise ValueError("メールアドレスまたはパスワードが正しくありません")
-
-        if not account.is_active:
+        if not credentials.is_active:
             raise ValueError("アカウントが無効です")
 
+        # ハッシュ方式・コストが現在のポリシーと異なれば、平文がある今のうちに更新する
+        new_hashed_password = None
+        if password_needs_rehash(credentials.hashed_password):
+            new_hashed_password = await get_password_hash_async(password)
+
+        # 書き込みは CPU 処理を終えてから短いトランザクションで行う
         refresh_token_raw = secrets.token_urlsafe()
         expires_at = datetime.now(UTC) + timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
-        await self._command.create_refresh_token(
-            account.id, refresh_token_raw, expires_at
-        )
+        async with scoped_transaction(self._session):
+            if new_hashed_password is not None:
+                await self._command.update_password_hash(
+                    credentials.account_id, new_hashed_password
+                )
+            await self._refresh_tokens.issue(
+                credentials.account_id, refresh_token_raw, expires_at
+            )
 
-        access_token = create_access_token(data={"sub": str(account.id)})
+        access_token = create_access_token(data={"sub": str(credentials.account_id)})
 
         return LoginResult(
-            account_id=account.id,
-            email=account.email,
-            is_active=account.is_active,
-            created_at=account.created_at,
+            account_id=credentials.account_id,
+            email=credentials.email,
+            is_active=credentials.is_active,
+            created_at=credentials.created_at,
             access_token=access_token,
             refresh_token=refresh_token_raw,
         )
@@ -1,16 +1,28 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.command.account_command import AccountCommand
-from app.query.account_query import AccountQuery
+from app.services.refresh_tokens import RefreshTokenStore, get_refresh_token_store
+from app.services.revocation import get_token_revocations
 
 
 class LogoutUseCase:
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        refresh_tokens: RefreshTokenStore | None = None,
+    ):
         self._session = session
-        self._query = AccountQuery(session)
-        self._command = AccountCommand(session)
+        self._refresh_tokens = refresh_tokens or get_refresh_token_store(session)
 
-    async def execute(self, refresh_token: str) -> None:
-        token_record = await self._query.get_refresh_token(refresh_token)
-        if token_record and not token_record.revoked:
-            await self._command.revoke_refresh_token(token_record)
+    async def execute(
+        self,
+        refresh_token: str,
+        access_token_id: str | None = None,
+        access_token_issued_at: float | None = None,
+    ) -> None:
+        await self._refresh_tokens.revoke(refresh_token)
+
+        # アクセストークンも exp を待たずに失効させる（失効時刻として iat を登録する）
+        if access_token_id is not None:
+            await get_token_revocations().revoke(
+                access_token_id, revoked_at=access_token_issued_at
+            )
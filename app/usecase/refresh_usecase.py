@@ -4,9 +4,8 @@ from datetime import UTC, datetime, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.command.account_command import AccountCommand
 from app.core.security import create_access_token
-from app.query.account_query import AccountQuery
+from app.services.refresh_tokens import RefreshTokenStore, get_refresh_token_store
 
 
 @dataclass
@@ -18,33 +17,30 @@ class RefreshResult:
 class RefreshUseCase:
     REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        refresh_tokens: RefreshTokenStore | None = None,
+    ):
         self._session = session
-        self._query = AccountQuery(session)
-        self._command = AccountCommand(session)
+        self._refresh_tokens = refresh_tokens or get_refresh_token_store(session)
 
     async def execute(self, refresh_token: str) -> RefreshResult:
-        token_record = await self._query.get_refresh_token(refresh_token)
-        if not token_record:
-            raise ValueError("無効なリフレッシュトークンです")
-
-        if token_record.revoked:
-            raise ValueError("無効なリフレッシュトークンです")
-
-        if token_record.expires_at.replace(tzinfo=UTC) < datetime.now(UTC):
-            raise ValueError("リフレッシュトークンの有効期限が切れています")
-
-        # リフレッシュトークンローテーション: 旧トークンをrevoke
-        await self._command.revoke_refresh_token(token_record)
-
-        # 新しいリフレッシュトークンを発行
+        # リフレッシュトークンローテーション: 旧トークンの revoke と新トークンの発行を
+        # ストアがアトミックに行う（SQL なら1文、Redis なら1回のスクリプト実行）
         new_refresh_token_raw = secrets.token_urlsafe()
         expires_at = datetime.now(UTC) + timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
-        await self._command.create_refresh_token(
-            token_record.account_id, new_refresh_token_raw, expires_at
+        account_id = await self._refresh_tokens.rotate(
+            refresh_token, new_refresh_token_raw, expires_at
         )
 
-        access_token = create_access_token(data={"sub": str(token_record.account_id)})
+        if account_id is None:
+            # 失敗時のみトークンを読み直してエラー内容を決める
+            if await self._refresh_tokens.expired(refresh_token):
+                raise ValueError("リフレッシュトークンの有効期限が切れています")
+            raise ValueError("無効なリフレッシュトークンです")
+
+        access_token = create_access_token(data={"sub": str(account_id)})
 
         return RefreshResult(
             access_token=access_token,
@@ -5,8 +5,8 @@ from datetime import UTC, datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.command.account_command import AccountCommand
-from app.core.security import create_access_token, get_password_hash
-from app.query.account_query import AccountQuery
+from app.core.security import create_access_token, get_password_hash_async
+from app.services.refresh_tokens import RefreshTokenStore, get_refresh_token_store
 
 
 @dataclass
@@ -22,31 +22,40 @@ class SignupResult:
 class SignupUseCase:
     REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        refresh_tokens: RefreshTokenStore | None = None,
+    ):
         self._session = session
-        self._query = AccountQuery(session)
+        self._refresh_tokens = refresh_tokens or get_refresh_token_store(session)
         self._command = AccountCommand(session)
 
     async def execute(self, email: str, password: str) -> SignupResult:
-        existing = await self._query.get_by_email(email)
-        if existing:
-            raise ValueError("このメールアドレスは既に登録されています")
-
-        account = await self._command.create_account(email)
-
-        hashed_password = get_password_hash(password)
-        await self._command.create_password(account.id, hashed_password)
+        hashed_password = await get_password_hash_async(password)
 
         refresh_token_raw = secrets.token_urlsafe()
         expires_at = datetime.now(UTC) + timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
-        await self._command.create_refresh_token(
-            account.id, refresh_token_raw, expires_at
+        # 事前の存在確認はせず、一意制約の衝突で重複を判定する
+        # DB に保存するストアなら、トークンもアカウントと同じ文で作成する
+        in_database = self._refresh_tokens.in_database
+        account = await self._command.create_account_with_password(
+            email,
+            hashed_password,
+            refresh_token_raw if in_database else None,
+            expires_at,
         )
+        if account is None:
+            raise ValueError("このメールアドレスは既に登録されています")
+        if not in_database:
+            await self._refresh_tokens.issue(
+                account.account_id, refresh_token_raw, expires_at
+            )
 
-        access_token = create_access_token(data={"sub": str(account.id)})
+        access_token = create_access_token(data={"sub": str(account.account_id)})
 
         return SignupResult(
-            account_id=account.id,
+            account_id=account.account_id,
             email=account.email,
             is_active=account.is_active,
             created_at=account.created_at,
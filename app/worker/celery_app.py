@@ -16,6 +16,11 @@ celery_app.conf.update(
     enable_utc=True,
     task_track_started=True,
     worker_hijack_root_logger=False,
+    include=[
+        "app.worker.tasks.health_check",
+        "app.worker.tasks.purge_refresh_tokens",
+        "app.worker.tasks.maintain_refresh_token_partitions",
+    ],
 )
 
 celery_app.autodiscover_tasks(["app.worker.tasks"])
@@ -25,4 +30,15 @@ celery_app.conf.beat_schedule = {
         "task": "app.worker.tasks.health_check.health_check",
         "schedule": 60.0,
     },
+    "purge-refresh-tokens": {
+        "task": "app.worker.tasks.purge_refresh_tokens.purge_refresh_tokens",
+        "schedule": settings.refresh_token_purge_interval_seconds,
+    },
+    "maintain-refresh-token-partitions": {
+        "task": (
+            "app.worker.tasks.maintain_refresh_token_partitions"
+            ".maintain_refresh_token_partitions"
+        ),
+        "schedule": settings.refresh_token_partition_interval_seconds,
+    },
 }
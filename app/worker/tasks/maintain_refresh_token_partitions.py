@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from functools import partial
+from typing import TypeVar
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import get_settings
+from app.db.partitions import (
+    MonthlyPartition,
+    add_months,
+    create_monthly_partition,
+    drop_monthly_partition,
+    is_lock_timeout,
+    list_monthly_partitions,
+    month_start,
+    set_lock_timeout,
+)
+from app.worker.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# セッションファクトリの型
+SessionFactory = Callable[[], AsyncSession]
+
+T = TypeVar("T")
+
+
+async def _run_with_lock_timeout(
+    session_factory: SessionFactory,
+    operation: Callable[[AsyncSession], Awaitable[T]],
+    lock_timeout_ms: int,
+    lock_attempts: int,
+    retry_delay_seconds: float,
+) -> T:
+    """
+    operation を lock_timeout 付きの1トランザクションで実行する。
+
+    ロック待ちで打ち切られた場合は、待ち時間を延ばしながら lock_attempts 回まで
+    やり直す（それでも取れなければ例外をそのまま送出する）。
+    """
+    for attempt in range(1, lock_attempts + 1):
+        try:
+            async with session_factory() as session:
+                await set_lock_timeout(session, lock_timeout_ms)
+                result = await operation(session)
+                await session.commit()
+                return result
+        except DBAPIError as e:
+            if not is_lock_timeout(e) or attempt == lock_attempts:
+                raise
+            logger.warning(
+                "Lock timeout during partition maintenance (attempt %d/%d)",
+                attempt,
+                lock_attempts,
+            )
+            await asyncio.sleep(retry_delay_seconds * attempt)
+    raise AssertionError("lock_attempts must be positive")
+
+
+async def maintain_partitions(
+    session_factory: SessionFactory,
+    months_ahead: int,
+    now: datetime | None = None,
+    lock_timeout_ms: int = 1000,
+    lock_attempts: int = 5,
+    retry_delay_seconds: float = 5.0,
+) -> dict:
+    """
+    refresh_tokens の月次パーティションを保守する。
+
+    - 当月から months_ahead ヶ月先までのパーティションを作成する
+    - 期間の終端を過ぎた（全行が期限切れの）パーティションを DROP TABLE で削除する
+
+    各 DDL は lock_timeout 付きで実行し、ロックが取れなければリトライする。
+    """
+    run = partial(
+        _run_with_lock_timeout,
+        session_factory,
+        lock_timeout_ms=lock_timeout_ms,
+        lock_attempts=lock_attempts,
+        retry_delay_seconds=retry_delay_seconds,
+    )
+    if now is None:
+        now = datetime.now(UTC)
+
+    async with session_factory() as session:
+        existing = await list_monthly_partitions(session)
+    existing_names = {p.name for p in existing}
+
+    created = []
+    current = month_start(now)
+    for offset in range(months_ahead + 1):
+        partition = MonthlyPartition(add_months(current, offset))
+        if partition.name in existing_names:
+            continue
+        moved = await run(partial(create_monthly_partition, partition=partition))
+        if moved:
+            # 事前作成が間に合わず、ロック中に行を移動したことを示す
+            logger.warning(
+                "Moved %d rows from the default partition into %s; "
+                "increase REFRESH_TOKEN_PARTITION_MONTHS_AHEAD",
+                moved,
+                partition.name,
+            )
+        created.append(partition.name)
+
+    dropped = []
+    for partition in existing:
+        if partition.end > now:
+            continue
+        await run(partial(drop_monthly_partition, partition=partition))
+        dropped.append(partition.name)
+
+    return {"created": created, "dropped": dropped}
+
+
+async def _maintain_with_new_engine() -> dict:
+    # タスクごとにイベントループが変わるため、接続はプールせず都度作る
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    try:
+        session_factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        return await maintain_partitions(
+            session_factory,
+            months_ahead=settings.refresh_token_partition_months_ahead,
+            lock_timeout_ms=settings.refresh_token_partition_lock_timeout_ms,
+            lock_attempts=settings.refresh_token_partition_lock_attempts,
+            retry_delay_seconds=settings.refresh_token_partition_retry_delay_seconds,
+        )
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
+def maintain_refresh_token_partitions(self) -> dict:
+    """refresh_tokens の月次パーティションを作成・削除し、結果をログに出力する。"""
+    result = {"status": "ok", **asyncio.run(_maintain_with_new_engine())}
+
+    logger.info("Maintained refresh token partitions: %s", result)
+    return result
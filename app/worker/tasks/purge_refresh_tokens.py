@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from collections.abc import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.command.account_command import AccountCommand
+from app.core.config import get_settings
+from app.worker.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# セッションファクトリの型
+SessionFactory = Callable[[], AsyncSession]
+
+
+async def purge_revoked_refresh_tokens(
+    session_factory: SessionFactory,
+    batch_size: int,
+    sleep_seconds: float,
+) -> dict:
+    """
+    revoke 済みでまだ期限内のリフレッシュトークンを小さなバッチで削除する。
+
+    1バッチごとにトランザクションをコミットし、ロックを短く保つ。
+    期限切れの行はパーティション保守の DROP TABLE に任せ、ここでは消さない
+    （行単位の DELETE による WAL・VACUUM の負荷を避けるため）。
+    """
+    deleted = 0
+    batches = 0
+    last_id = 0
+    while True:
+        async with session_factory() as session:
+            ids = await AccountCommand(session).delete_revoked_refresh_tokens(
+                after_id=last_id, limit=batch_size
+            )
+            await session.commit()
+
+        if not ids:
+            break
+        deleted += len(ids)
+        batches += 1
+        last_id = max(ids)
+        if len(ids) < batch_size:
+            break
+        await asyncio.sleep(sleep_seconds)
+
+    return {"deleted": deleted, "batches": batches}
+
+
+async def _purge_with_new_engine() -> dict:
+    # タスクごとにイベントループが変わるため、接続はプールせず都度作る
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    try:
+        session_factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        return await purge_revoked_refresh_tokens(
+            session_factory,
+            batch_size=settings.refresh_token_purge_batch_size,
+            sleep_seconds=settings.refresh_token_purge_sleep_seconds,
+        )
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
+def purge_refresh_tokens(self) -> dict:
+    """revoke 済みで期限内のリフレッシュトークンを削除し、削除件数をログに出力する。"""
+    result = {"status": "ok", **asyncio.run(_purge_with_new_engine())}
+
+    logger.info("Purged refresh tokens: %s", result)
+    return result
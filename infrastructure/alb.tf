@@ -19,6 +19,10 @@ resource "aws_lb_target_group" "app" {
   vpc_id      = aws_vpc.main.id
   target_type = "ip"
 
+  # タスクの停止時、ECS はターゲットを登録解除し、この秒数だけ既存の接続を流し切って
+  # から SIGTERM を送る（その後の待ちは uvicorn の --timeout-graceful-shutdown）
+  deregistration_delay = 30
+
   health_check {
     enabled             = true
     healthy_threshold   = 2
@@ -78,6 +78,9 @@ resource "aws_ecs_task_definition" "app" {
       name  = "app"
       image = "${aws_ecr_repository.app.repository_url}:latest"
 
+      # SIGTERM から SIGKILL までの猶予（Dockerfile の --timeout-graceful-shutdown より長く）
+      stopTimeout = 30
+
       portMappings = [
         {
           containerPort = var.app_port
@@ -90,7 +93,14 @@ resource "aws_ecs_task_definition" "app" {
         { name = "DB_PORT", value = "5432" },
         { name = "DB_NAME", value = var.db_name },
         { name = "DB_USER", value = var.db_username },
-        { name = "DEBUG", value = "false" }
+        { name = "DEBUG", value = "false" },
+        # Redis を用意していないため、1タスク・1プロセス（desired_count = 1）の間は
+        # 回数制限・失効セットをプロセス内に持つ。タスクを増やす場合は ElastiCache を
+        # 用意して redis にする（AUTH_STATELESS は redis にするまで有効にしない）
+        { name = "RATE_LIMIT_BACKEND", value = "memory" },
+        { name = "REVOCATION_BACKEND", value = "memory" },
+        # X-Forwarded-For は ALB からの接続のときだけ信用する
+        { name = "FORWARDED_ALLOW_IPS", value = join(",", aws_subnet.public[*].cidr_block) }
       ]
 
       secrets = [
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+認証付きリクエストのスループットをアカウントキャッシュの有無で比較するベンチマーク
+
+get_current_user（Account を DB から引く依存）だけを通すルートを追加し、
+キャッシュ無効（毎回 SELECT）とキャッシュ有効（温まった状態）で
+1秒あたりのリクエスト数と /stats のヒット・ミス件数を出力する。
+
+使い方:
+    uv run python scripts/benchmarks/auth_throughput.py
+    uv run python scripts/benchmarks/auth_throughput.py --concurrency 32 --seconds 10
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi import Depends  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import delete  # noqa: E402
+
+import app.models  # noqa: E402, F401
+from app.api.deps import get_current_user  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import dispose_engines, get_engine, get_session_factory  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.account import Account  # noqa: E402
+from app.services import account_cache  # noqa: E402
+
+EMAIL = "bench-auth@example.com"
+PASSWORD = "benchpassword1"
+
+
+@app.get("/bench/me", include_in_schema=False)
+async def me(account: Account = Depends(get_current_user)) -> dict:  # noqa: B008
+    return {"id": account.id}
+
+
+async def _run(client: AsyncClient, token: str, args: argparse.Namespace) -> int:
+    headers = {"Authorization": f"Bearer {token}"}
+    deadline = time.perf_counter() + args.seconds
+
+    async def worker() -> int:
+        count = 0
+        while time.perf_counter() < deadline:
+            response = await client.get("/bench/me", headers=headers)
+            response.raise_for_status()
+            count += 1
+        return count
+
+    return sum(await asyncio.gather(*(worker() for _ in range(args.concurrency))))
+
+
+async def _measure(
+    client: AsyncClient, token: str, ttl_seconds: float, args: argparse.Namespace
+) -> None:
+    get_settings().account_cache_ttl_seconds = ttl_seconds
+    account_cache.get_account_cache.cache_clear()
+    if ttl_seconds > 0:
+        # 1回通してキャッシュを温める
+        await client.get("/bench/me", headers={"Authorization": f"Bearer {token}"})
+
+    total = await _run(client, token, args)
+    stats = (await client.get("/stats")).json()["account_cache"]
+    label = "warm" if ttl_seconds > 0 else "cold"
+    print(
+        f"{label}: {total / args.seconds:.0f} req/s "
+        f"(hits={stats['hits']} misses={stats['misses']})"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        response = await client.post(
+            "/auth/signup/password", json={"email": EMAIL, "password": PASSWORD}
+        )
+        if response.status_code == 409:
+            response = await client.post(
+                "/auth/login/password", json={"email": EMAIL, "password": PASSWORD}
+            )
+        token = response.json()["token"]["access_token"]
+
+        await _measure(client, token, 0, args)
+        await _measure(client, token, 60, args)
+
+    async with get_session_factory()() as session:
+        await session.execute(delete(Account).where(Account.email == EMAIL))
+        await session.commit()
+    await dispose_engines()
+    security.shutdown_hash_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+ログイン集中時に無関係なエンドポイントのレイテンシを計測するベンチマーク
+
+アプリを同一プロセス・同一イベントループ上で動かし、大量のログインを投げながら
+/health を一定間隔で叩いて p50 / p99 / max を出力する。
+--blocking を付けると bcrypt をイベントループ上で直接実行した場合と比較できる。
+
+使い方:
+    uv run python scripts/benchmarks/login_storm.py
+    uv run python scripts/benchmarks/login_storm.py --logins 200 --concurrency 50
+    uv run python scripts/benchmarks/login_storm.py --blocking
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+import app.models  # noqa: E402, F401
+from app.core import security  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import dispose_engines, get_engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+EMAIL = "bench-login-storm@example.com"
+PASSWORD = "benchpassword1"
+
+
+def _summary(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p50 = statistics.median(ordered)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (
+        f"n={len(ordered)} p50={p50 * 1000:.1f}ms "
+        f"p99={p99 * 1000:.1f}ms max={ordered[-1] * 1000:.1f}ms"
+    )
+
+
+async def _probe_health(client: AsyncClient, stop: asyncio.Event) -> list[float]:
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/health")
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+    return samples
+
+
+async def _login_storm(client: AsyncClient, logins: int, concurrency: int) -> None:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def login() -> None:
+        async with sem:
+            await client.post(
+                "/auth/login/password", json={"email": EMAIL, "password": PASSWORD}
+            )
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.blocking:
+        # 変更前の挙動（イベントループ上で直接 bcrypt を実行）を再現する
+        async def run_inline(func, *func_args):
+            return func(*func_args)
+
+        security._run_in_hash_pool = run_inline
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        await client.post(
+            "/auth/signup/password", json={"email": EMAIL, "password": PASSWORD}
+        )
+
+        stop = asyncio.Event()
+        idle = asyncio.create_task(_probe_health(client, stop))
+        await asyncio.sleep(args.idle_seconds)
+        stop.set()
+        print(f"/health (idle):        {_summary(await idle)}")
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_health(client, stop))
+        start = time.perf_counter()
+        await _login_storm(client, args.logins, args.concurrency)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        print(f"/health (login storm): {_summary(await probe)}")
+        print(f"logins: {args.logins} in {elapsed:.2f}s")
+
+    await dispose_engines()
+    security.shutdown_hash_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--idle-seconds", type=float, default=2.0)
+    parser.add_argument("--blocking", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+メトリクスミドルウェアの1リクエストあたりのオーバーヘッドを計測するベンチマーク
+
+ルートが1つだけの FastAPI アプリを ASGI として直接呼び出し（HTTP サーバーは
+介さない）、MetricsMiddleware の有無で 1リクエストあたりの時間を比較する。
+PROMETHEUS_MULTIPROC_DIR を設定して実行するとマルチプロセスモード
+（mmap ファイルへの書き込み）のコストになる。
+
+使い方:
+    uv run python scripts/benchmarks/metrics_overhead.py
+    PROMETHEUS_MULTIPROC_DIR=/tmp/metrics uv run python scripts/benchmarks/metrics_overhead.py
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi import FastAPI  # noqa: E402
+from starlette.types import ASGIApp, Message  # noqa: E402
+
+from app.core.metrics import multiprocess_enabled  # noqa: E402
+from app.middleware.metrics import MetricsMiddleware  # noqa: E402
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/items/1",
+    "raw_path": b"/items/1",
+    "query_string": b"",
+    "root_path": "",
+    "headers": [],
+    "client": ("127.0.0.1", 12345),
+    "server": ("127.0.0.1", 8000),
+}
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        return {"id": item_id}
+
+    return app
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: Message) -> None:
+    pass
+
+
+async def _run(app: ASGIApp, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), _receive, _send)
+    return time.perf_counter() - start
+
+
+async def main(args: argparse.Namespace) -> None:
+    app = _build_app()
+    instrumented = MetricsMiddleware(app)
+
+    # ルーティングとラベルのキャッシュを温める
+    await _run(app, 1000)
+    await _run(instrumented, 1000)
+
+    baseline = min([await _run(app, args.requests) for _ in range(args.rounds)])
+    measured = min(
+        [await _run(instrumented, args.requests) for _ in range(args.rounds)]
+    )
+
+    per_request_us = (measured - baseline) / args.requests * 1_000_000
+    mode = "multiprocess" if multiprocess_enabled() else "single process"
+    print(f"mode: {mode}")
+    print(f"baseline:     {baseline / args.requests * 1_000_000:.1f} us/request")
+    print(f"with metrics: {measured / args.requests * 1_000_000:.1f} us/request")
+    print(f"overhead:     {per_request_us:.1f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
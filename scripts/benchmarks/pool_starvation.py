@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+ログイン集中時のコネクションプール枯渇を再現するロードテスト
+
+小さなプール（既定 5 接続・オーバーフローなし）のエンジンで get_db を差し替え、
+大量のログインを同時に投げて、成功数・プール待ちタイムアウト数・
+同時に貸し出された接続数の最大値を出力する。
+--pinned を付けると bcrypt 実行中も接続を保持する変更前の挙動と比較できる。
+
+使い方:
+    uv run python scripts/benchmarks/pool_starvation.py
+    uv run python scripts/benchmarks/pool_starvation.py --logins 200 --concurrency 50
+    uv run python scripts/benchmarks/pool_starvation.py --pinned
+"""
+
+import argparse
+import asyncio
+import contextlib
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+import app.models  # noqa: E402, F401
+from app.core import security  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.usecase import login_usecase  # noqa: E402
+
+EMAIL = "bench-pool@example.com"
+PASSWORD = "benchpassword1"
+
+
+async def _sample_checked_out(engine, stop: asyncio.Event) -> int:
+    peak = 0
+    while not stop.is_set():
+        peak = max(peak, engine.pool.checkedout())
+        await asyncio.sleep(0.005)
+    return peak
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.pinned:
+        # 変更前の挙動（リクエストの最後まで同じトランザクション＝接続を保持）を再現する
+        @contextlib.asynccontextmanager
+        async def keep_transaction(session):
+            yield session
+
+        login_usecase.scoped_transaction = keep_transaction
+
+    engine = create_async_engine(
+        get_settings().database_url,
+        pool_size=args.pool_size,
+        max_overflow=0,
+        pool_timeout=args.pool_timeout,
+    )
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        await client.post(
+            "/auth/signup/password", json={"email": EMAIL, "password": PASSWORD}
+        )
+
+        sem = asyncio.Semaphore(args.concurrency)
+        results = {"ok": 0, "pool_timeout": 0}
+
+        async def login() -> None:
+            async with sem:
+                try:
+                    response = await client.post(
+                        "/auth/login/password",
+                        json={"email": EMAIL, "password": PASSWORD},
+                    )
+                    response.raise_for_status()
+                    results["ok"] += 1
+                except PoolTimeoutError:
+                    results["pool_timeout"] += 1
+
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(_sample_checked_out(engine, stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(args.logins)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        peak = await sampler
+
+    mode = "pinned" if args.pinned else "scoped"
+    print(
+        f"{mode}: ok={results['ok']} pool_timeout={results['pool_timeout']} "
+        f"peak_checked_out={peak}/{args.pool_size} in {elapsed:.2f}s"
+    )
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    security.shutdown_hash_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=30)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--pool-timeout", type=float, default=2.0)
+    parser.add_argument("--pinned", action="store_true")
+    asyncio.run(main(parser.parse_args()))
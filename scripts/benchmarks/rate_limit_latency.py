@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+ログイン試行の回数制限のチェック 1回あたりの時間を計測するベンチマーク
+
+IP とメールアドレスの 2キーを、Redis バックエンド（Lua スクリプト 1回の往復）と
+メモリバックエンドで判定する。上限に掛からないよう試行ごとに別のキーを使う。
+Redis バックエンドには REDIS_HOST / REDIS_PORT の Redis が必要。
+
+使い方:
+    APP_ENV=test uv run python scripts/benchmarks/rate_limit_latency.py
+    APP_ENV=test uv run python scripts/benchmarks/rate_limit_latency.py --iterations 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.redis import get_redis  # noqa: E402
+from app.services.rate_limit import (  # noqa: E402
+    MemoryRateLimiter,
+    RateLimit,
+    RateLimiter,
+    RedisRateLimiter,
+    login_limits,
+)
+
+WINDOW_SECONDS = 60
+
+
+def _limits(n: int) -> list[list[RateLimit]]:
+    return [login_limits(f"bench-{i}", f"bench-{i}@example.com") for i in range(n)]
+
+
+async def _measure(limiter: RateLimiter, n: int) -> list[float]:
+    samples = []
+    for limits in _limits(n):
+        start = time.perf_counter()
+        await limiter.hit(limits)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(name: str, samples: list[float]) -> None:
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{name:<8}p50={statistics.median(samples):.3f}ms p99={p99:.3f}ms")
+
+
+async def main(args: argparse.Namespace) -> None:
+    _report(
+        "memory", await _measure(MemoryRateLimiter(WINDOW_SECONDS), args.iterations)
+    )
+
+    redis = get_redis()
+    limiter = RedisRateLimiter(redis, WINDOW_SECONDS)
+    await _measure(limiter, 100)  # スクリプトの読み込みと接続の確立
+    _report("redis", await _measure(limiter, args.iterations))
+    await redis.delete(
+        *{limit.key for limits in _limits(args.iterations) for limit in limits}
+    )
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
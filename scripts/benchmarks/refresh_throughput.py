@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+リフレッシュトークンのローテーションのスループットを計測するベンチマーク
+
+並列数ぶんのトークンチェーンを用意し、各チェーンで RefreshUseCase を
+繰り返し実行して 1秒あたりのリフレッシュ回数を出力する。
+--backend でリフレッシュトークンのストア（sql / redis / memory）を選ぶ。
+redis には REDIS_HOST / REDIS_PORT の Redis が必要。
+
+使い方:
+    uv run python scripts/benchmarks/refresh_throughput.py
+    uv run python scripts/benchmarks/refresh_throughput.py --concurrency 32 --seconds 10
+    uv run python scripts/benchmarks/refresh_throughput.py --backend redis
+"""
+
+import argparse
+import asyncio
+import secrets
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import delete  # noqa: E402
+
+import app.models  # noqa: E402, F401
+from app.command.account_command import AccountCommand  # noqa: E402
+from app.core.redis import get_redis  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import dispose_engines, get_engine, get_session_factory  # noqa: E402
+from app.models.account import Account  # noqa: E402
+from app.services.refresh_tokens import (  # noqa: E402
+    MemoryRefreshTokenStore,
+    RedisRefreshTokenStore,
+    RefreshTokenStore,
+    SqlRefreshTokenStore,
+)
+from app.usecase.refresh_usecase import RefreshUseCase  # noqa: E402
+
+EMAIL = "bench-refresh@example.com"
+
+
+def _store_factory(backend: str):
+    if backend == "sql":
+        return SqlRefreshTokenStore
+    shared: RefreshTokenStore = (
+        RedisRefreshTokenStore(get_redis())
+        if backend == "redis"
+        else MemoryRefreshTokenStore()
+    )
+    return lambda _session: shared
+
+
+async def _setup(concurrency: int, store_for) -> tuple[int, list[str]]:
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with get_session_factory()() as session:
+        await session.execute(delete(Account).where(Account.email == EMAIL))
+        account = await AccountCommand(session).create_account(EMAIL)
+        store = store_for(session)
+        tokens = []
+        for _ in range(concurrency):
+            token = secrets.token_urlsafe()
+            await store.issue(account.id, token, datetime.now(UTC) + timedelta(days=7))
+            tokens.append(token)
+        await session.commit()
+    return account.id, tokens
+
+
+async def _refresh_chain(token: str, deadline: float, store_for) -> int:
+    count = 0
+    while time.perf_counter() < deadline:
+        async with get_session_factory()() as session:
+            usecase = RefreshUseCase(session, refresh_tokens=store_for(session))
+            result = await usecase.execute(refresh_token=token)
+            await session.commit()
+        token = result.refresh_token
+        count += 1
+    return count
+
+
+async def main(args: argparse.Namespace) -> None:
+    store_for = _store_factory(args.backend)
+    account_id, tokens = await _setup(args.concurrency, store_for)
+
+    start = time.perf_counter()
+    deadline = start + args.seconds
+    counts = await asyncio.gather(
+        *(_refresh_chain(t, deadline, store_for) for t in tokens)
+    )
+    elapsed = time.perf_counter() - start
+
+    total = sum(counts)
+    print(
+        f"refreshes: {total} in {elapsed:.2f}s "
+        f"({total / elapsed:.0f}/s, backend={args.backend}, "
+        f"concurrency={args.concurrency})"
+    )
+
+    async with get_session_factory()() as session:
+        await store_for(session).revoke_all(account_id)
+        await session.execute(delete(Account).where(Account.email == EMAIL))
+        await session.commit()
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--backend", choices=["sql", "redis", "memory"], default="sql")
+    asyncio.run(main(parser.parse_args()))
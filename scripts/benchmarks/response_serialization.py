@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+認証エンドポイントのレスポンスのシリアライズのコストを計測するベンチマーク
+
+各エンドポイントのレスポンスモデルについて、FastAPI の通常の経路
+（response_model による再検証 + JSON 化）と ModelResponse
+（コンパイル済みシリアライザで直接 JSON 化）の 1回あたりの時間を比較する。
+モデルの組み立て自体は両方で同じため含めない。
+
+使い方:
+    uv run python scripts/benchmarks/response_serialization.py
+    uv run python scripts/benchmarks/response_serialization.py --iterations 100000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi import Response  # noqa: E402
+from fastapi.routing import APIRoute, serialize_response  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from app.api.responses import ModelResponse  # noqa: E402
+from app.api.v1.endpoints import auth  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.schemas.account import AccountResponse  # noqa: E402
+from app.schemas.auth import SignupResponse, TokenResponse  # noqa: E402
+
+
+def _token() -> TokenResponse:
+    return TokenResponse(
+        access_token=create_access_token({"sub": "1"}),
+        refresh_token="r" * 43,
+    )
+
+
+def _account_response() -> SignupResponse:
+    return SignupResponse(
+        account=AccountResponse(
+            id=1,
+            email="bench@example.com",
+            is_active=True,
+            has_password=True,
+            oauth_providers=[],
+            passkey_count=0,
+            created_at=datetime.now(UTC),
+        ),
+        token=_token(),
+    )
+
+
+def _route(path: str) -> APIRoute:
+    return next(route for route in auth.router.routes if route.path == path)
+
+
+async def _fastapi_path(route: APIRoute, model: BaseModel) -> Response:
+    # fastapi.routing.get_request_handler の既定の経路と同じ呼び出し
+    content = await serialize_response(
+        field=route.response_field,
+        response_content=model,
+        dump_json=True,
+        is_coroutine=True,
+    )
+    return Response(content=content, media_type="application/json")
+
+
+async def _fast_path(route: APIRoute, model: BaseModel) -> Response:
+    return ModelResponse(model)
+
+
+async def _measure(serialize, route: APIRoute, model: BaseModel, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        await serialize(route, model)
+    return (time.perf_counter() - start) / n * 1_000_000
+
+
+async def main(args: argparse.Namespace) -> None:
+    endpoints = [
+        ("/auth/signup/password", _account_response()),
+        ("/auth/login/password", _account_response()),
+        ("/auth/refresh", _token()),
+    ]
+    print(f"{'endpoint':<24}{'fastapi':>10}{'fast path':>12}")
+    for path, model in endpoints:
+        route = _route(path)
+        before = min(
+            [
+                await _measure(_fastapi_path, route, model, args.iterations)
+                for _ in range(3)
+            ]
+        )
+        after = min(
+            [
+                await _measure(_fast_path, route, model, args.iterations)
+                for _ in range(3)
+            ]
+        )
+        print(f"{path:<24}{before:>8.2f}us{after:>10.2f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    asyncio.run(main(parser.parse_args()))
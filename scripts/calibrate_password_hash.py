@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+パスワードハッシュのコストを、このハードウェアで計測して決めるスクリプト
+
+1回のハッシュが目標時間になるコストを計測し、設定値として保存する行を出力する。
+全ワーカーで同じポリシーにするため、アプリケーションは起動時に計測しない。
+デプロイ先と同じ種類のインスタンスで実行し、出力をタスク定義の環境変数に設定する。
+
+使い方:
+    APP_ENV=test uv run python scripts/calibrate_password_hash.py
+    APP_ENV=test uv run python scripts/calibrate_password_hash.py --scheme argon2id --target-ms 250
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.security import (  # noqa: E402
+    PASSWORD_HASHERS,
+    Argon2Hasher,
+    BcryptHasher,
+    measure_hash,
+)
+
+
+def main(args: argparse.Namespace) -> None:
+    hasher = PASSWORD_HASHERS[args.scheme].calibrate(args.target_ms / 1000)
+    elapsed_ms = measure_hash(hasher) * 1000
+    print(f"# {hasher}: {elapsed_ms:.0f}ms per hash", file=sys.stderr)
+    if isinstance(hasher, BcryptHasher):
+        print(f"BCRYPT_ROUNDS={hasher.rounds}")
+    elif isinstance(hasher, Argon2Hasher):
+        print(f"ARGON2_TIME_COST={hasher.time_cost}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scheme", choices=list(PASSWORD_HASHERS), default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    main(parser.parse_args())
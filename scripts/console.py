@@ -14,10 +14,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # アプリケーションのimport
 
 from app.core.config import get_settings  # noqa: E402
-from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.db.session import get_session_factory  # noqa: E402
 
 settings = get_settings()
-db = AsyncSessionLocal()
+db = get_session_factory()()
 
 if __name__ == "__main__":
     from IPython import embed
@@ -1,4 +1,10 @@
+import time
+
+import pytest
+
+from app.core.config import get_settings
 from app.core.security import create_access_token
+from app.services.revocation import get_account_revocations
 
 
 class TestGetCurrentUser:
@@ -42,3 +48,49 @@ class TestGetCurrentUser:
         )
 
         assert response.status_code == 401
+
+
+class TestGetCurrentPrincipalStateless:
+    """auth_stateless 有効時の get_current_principal 依存のテスト"""
+
+    @pytest.fixture(autouse=True)
+    def stateless(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "auth_stateless", True)
+
+    async def test_token_is_accepted_without_account_lookup(self, client):
+        """アカウントを DB から引かずにトークンのクレームだけで認証されること"""
+        token = create_access_token(data={"sub": "99999"})
+        response = await client.post(
+            "/auth/logout",
+            json={"refresh_token": "some-token"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 204
+
+    async def test_token_issued_before_revocation_returns_401(self, client):
+        """失効以前に発行されたトークンで401が返却されること"""
+        token = create_access_token(data={"sub": "1"})
+        await get_account_revocations().revoke("1", revoked_at=time.time() + 1)
+
+        response = await client.post(
+            "/auth/logout",
+            json={"refresh_token": "some-token"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 401
+        assert response.json()["detail"] == "アカウントが無効です"
+
+    async def test_token_issued_after_revocation_is_accepted(self, client):
+        """失効後に発行されたトークン（再有効化後の再ログイン）は受け付けること"""
+        await get_account_revocations().revoke("1", revoked_at=time.time() - 10)
+        token = create_access_token(data={"sub": "1"})
+
+        response = await client.post(
+            "/auth/logout",
+            json={"refresh_token": "some-token"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 204
@@ -0,0 +1,66 @@
+import json
+from datetime import UTC, datetime
+
+from app.api.responses import ModelResponse, model_response
+from app.core.config import get_settings
+from app.schemas.account import AccountResponse
+from app.schemas.auth import SignupResponse, TokenResponse
+
+
+def _signup_response() -> SignupResponse:
+    return SignupResponse(
+        account=AccountResponse(
+            id=1,
+            email="user@example.com",
+            is_active=True,
+            has_password=True,
+            oauth_providers=[],
+            passkey_count=0,
+            created_at=datetime(2025, 1, 1, tzinfo=UTC),
+        ),
+        token=TokenResponse(access_token="access", refresh_token="refresh"),
+    )
+
+
+class TestModelResponse:
+    """コンパイル済みシリアライザによるレスポンスのテスト"""
+
+    def test_renders_same_json_as_model_dump(self):
+        """model_dump(mode="json") と同じ内容の JSON になること"""
+        model = _signup_response()
+
+        response = ModelResponse(model, status_code=201)
+
+        assert response.status_code == 201
+        assert response.headers["content-type"] == "application/json"
+        assert json.loads(response.body) == model.model_dump(mode="json")
+
+    def test_model_response_returns_model_when_disabled(self, monkeypatch):
+        """無効なら FastAPI に任せるためモデルをそのまま返すこと"""
+        monkeypatch.setattr(get_settings(), "fast_response_serialization", False)
+        model = _signup_response()
+
+        assert model_response(model) is model
+
+
+class TestFastSerializationEndpoints:
+    """fast_response_serialization 有効時のエンドポイントのテスト"""
+
+    async def test_signup_and_refresh_return_same_body(self, client, monkeypatch):
+        """有効時もステータスとレスポンスの形が変わらないこと"""
+        monkeypatch.setattr(get_settings(), "fast_response_serialization", True)
+
+        signup = await client.post(
+            "/auth/signup/password",
+            json={"email": "user@example.com", "password": "mypassword1"},
+        )
+        refresh = await client.post(
+            "/auth/refresh",
+            json={"refresh_token": signup.json()["token"]["refresh_token"]},
+        )
+
+        assert signup.status_code == 201
+        assert signup.json()["account"]["email"] == "user@example.com"
+        assert signup.json()["token"]["token_type"] == "bearer"
+        assert refresh.status_code == 200
+        assert set(refresh.json()) == {"access_token", "refresh_token", "token_type"}
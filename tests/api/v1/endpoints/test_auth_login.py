@@ -1,3 +1,12 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app.api import deps
+from app.core.config import get_settings
+from app.services.admission import AdmissionLimiter
+
+
 class TestLoginEndpoint:
     """POST /auth/login/password"""
 
@@ -35,3 +44,100 @@ class TestLoginEndpoint:
         )
 
         assert response.status_code == 401
+
+    async def test_login_statement_budget(self, client, statement_budget):
+        """ログインの SQL は認証情報の取得とリフレッシュトークンの保存の2文に収まること"""
+        await client.post(
+            "/auth/signup/password",
+            json={"email": "user@example.com", "password": "mypassword1"},
+        )
+
+        with statement_budget(2):
+            response = await client.post(
+                "/auth/login/password",
+                json={"email": "user@example.com", "password": "mypassword1"},
+            )
+
+        assert response.status_code == 200
+
+    async def test_login_returns_503_when_overloaded(self, client, monkeypatch):
+        """同時実行数と待ち行列が埋まっていれば 503 と Retry-After を返すこと"""
+        monkeypatch.setattr(
+            deps,
+            "get_password_admission",
+            lambda: AdmissionLimiter(
+                "password", max_concurrent=0, max_queue=0, queue_timeout_seconds=1.0
+            ),
+        )
+
+        response = await client.post(
+            "/auth/login/password",
+            json={"email": "user@example.com", "password": "mypassword1"},
+        )
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+    async def test_login_returns_429_after_too_many_attempts(self, client, monkeypatch):
+        """同じメールアドレスへの試行が上限を超えたら 429 と Retry-After を返すこと"""
+        monkeypatch.setattr(get_settings(), "login_rate_limit_per_email", 2)
+
+        statuses = [
+            (
+                await client.post(
+                    "/auth/login/password",
+                    json={"email": "User@Example.com", "password": "wrongpassword"},
+                )
+            ).status_code
+            for _ in range(3)
+        ]
+        response = await client.post(
+            "/auth/login/password",
+            json={"email": "user@example.com", "password": "wrongpassword"},
+        )
+
+        assert statuses == [401, 401, 429]
+        assert response.status_code == 429
+        assert 0 < int(response.headers["retry-after"]) <= 60
+
+    @pytest.mark.parametrize(
+        ("peer", "expected"),
+        [("203.0.113.9", [401, 401, 429]), ("10.0.0.1", [401, 401, 401])],
+    )
+    async def test_forwarded_for_is_only_trusted_from_proxy(
+        self, test_session_factory, monkeypatch, peer, expected
+    ):
+        """信用しない接続元が X-Forwarded-For を偽っても IP ごとの制限のキーは変わらないこと"""
+        from app.db.session import get_db
+        from app.main import app
+
+        async def override_get_db():
+            async with test_session_factory() as session:
+                yield session
+
+        monkeypatch.setattr(get_settings(), "login_rate_limit_per_ip", 2)
+        app.dependency_overrides[get_db] = override_get_db
+        # 本番と同じく uvicorn のプロキシヘッダー処理を ALB のサブネットだけ信用して通す
+        proxied = ProxyHeadersMiddleware(app, trusted_hosts="10.0.0.0/24")
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=proxied, client=(peer, 1234)),
+                base_url="http://test",
+            ) as client:
+                statuses = [
+                    (
+                        await client.post(
+                            "/auth/login/password",
+                            json={
+                                "email": f"user{i}@example.com",
+                                "password": "wrongpassword",
+                            },
+                            headers={"X-Forwarded-For": f"6.6.6.{i}"},
+                        )
+                    ).status_code
+                    for i in range(3)
+                ]
+        finally:
+            app.dependency_overrides.clear()
+
+        assert statuses == expected
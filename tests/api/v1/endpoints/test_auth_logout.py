@@ -17,6 +17,39 @@ class TestLogoutEndpoint:
 
         assert response.status_code == 204
 
+    async def test_access_token_is_rejected_after_logout(self, client):
+        """ログアウトしたアクセストークンは exp 前でも拒否され、他のトークンは使えること"""
+        signup_response = await client.post(
+            "/auth/signup/password",
+            json={"email": "user@example.com", "password": "mypassword1"},
+        )
+        token_data = signup_response.json()["token"]
+        login_response = await client.post(
+            "/auth/login/password",
+            json={"email": "user@example.com", "password": "mypassword1"},
+        )
+        other_token_data = login_response.json()["token"]
+        await client.post(
+            "/auth/logout",
+            json={"refresh_token": token_data["refresh_token"]},
+            headers={"Authorization": f"Bearer {token_data['access_token']}"},
+        )
+
+        reused = await client.post(
+            "/auth/logout",
+            json={"refresh_token": token_data["refresh_token"]},
+            headers={"Authorization": f"Bearer {token_data['access_token']}"},
+        )
+        other = await client.post(
+            "/auth/logout",
+            json={"refresh_token": other_token_data["refresh_token"]},
+            headers={"Authorization": f"Bearer {other_token_data['access_token']}"},
+        )
+
+        assert reused.status_code == 401
+        assert reused.json()["detail"] == "トークンは失効しています"
+        assert other.status_code == 204
+
     async def test_logout_returns_401_without_auth(self, client):
         """認証なしの場合 401/403 が返却されること"""
         response = await client.post(
@@ -1,3 +1,8 @@
+from app.api import deps
+from app.core.config import get_settings
+from app.services.admission import AdmissionLimiter
+
+
 class TestRefreshEndpoint:
     """POST /auth/refresh"""
 
@@ -28,3 +33,50 @@ class TestRefreshEndpoint:
         )
 
         assert response.status_code == 401
+
+    async def test_refresh_is_not_subject_to_admission_control(
+        self, client, monkeypatch
+    ):
+        """ハッシュを伴わないリフレッシュは流量制限の対象外であること"""
+        signup_response = await client.post(
+            "/auth/signup/password",
+            json={"email": "user@example.com", "password": "mypassword1"},
+        )
+        monkeypatch.setattr(
+            deps,
+            "get_password_admission",
+            lambda: AdmissionLimiter(
+                "password", max_concurrent=0, max_queue=0, queue_timeout_seconds=1.0
+            ),
+        )
+
+        response = await client.post(
+            "/auth/refresh",
+            json={"refresh_token": signup_response.json()["token"]["refresh_token"]},
+        )
+
+        assert response.status_code == 200
+
+    async def test_refresh_with_external_store_does_not_write_to_db(
+        self, client, monkeypatch, statement_budget
+    ):
+        """DB 以外のストアでは、リフレッシュで SQL を発行しないこと"""
+        monkeypatch.setattr(get_settings(), "refresh_token_backend", "memory")
+        signup_response = await client.post(
+            "/auth/signup/password",
+            json={"email": "user@example.com", "password": "mypassword1"},
+        )
+        refresh_token = signup_response.json()["token"]["refresh_token"]
+
+        with statement_budget(0):
+            response = await client.post(
+                "/auth/refresh",
+                json={"refresh_token": refresh_token},
+            )
+        reused = await client.post(
+            "/auth/refresh",
+            json={"refresh_token": refresh_token},
+        )
+
+        assert response.status_code == 200
+        assert reused.status_code == 401
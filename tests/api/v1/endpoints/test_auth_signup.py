@@ -1,3 +1,7 @@
+from app.core import security
+from app.core.config import get_settings
+
+
 class TestSignupEndpoint:
     """POST /api/v1/auth/signup/password"""
 
@@ -59,3 +63,33 @@ class TestSignupEndpoint:
         )
 
         assert response.status_code == 422
+
+    async def test_signup_statement_budget(self, client, statement_budget):
+        """サインアップの SQL は1文に収まること"""
+        with statement_budget(1):
+            response = await client.post(
+                "/auth/signup/password",
+                json={"email": "user@example.com", "password": "mypassword1"},
+            )
+
+        assert response.status_code == 201
+
+    async def test_signup_returns_503_when_hash_pool_is_full(self, client, monkeypatch):
+        """ハッシュのワーカープールと待ち行列が埋まっていれば 503 を返すこと"""
+        monkeypatch.setattr(get_settings(), "password_hash_queue_timeout_seconds", 0.05)
+        slots = security._get_hash_slots()
+        held = 0
+        while not slots.locked():
+            await slots.acquire()
+            held += 1
+        try:
+            response = await client.post(
+                "/auth/signup/password",
+                json={"email": "user@example.com", "password": "mypassword1"},
+            )
+        finally:
+            for _ in range(held):
+                slots.release()
+
+        assert response.status_code == 503
+        assert "retry-after" in response.headers
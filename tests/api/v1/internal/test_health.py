@@ -1,6 +1,11 @@
+import asyncio
+
 import pytest
 
-from app.api.v1.internal.health import check_database
+from app.api.v1.internal.health import CachedCheck, check_database, get_readiness
+from app.core.lifecycle import lifecycle
+from app.db import session as db_session
+from app.schemas.health import DatabaseHealth, HealthResponse
 
 
 class TestHealthCheckSuccess:
@@ -63,3 +68,111 @@ class TestHealthCheckEndpoint:
         assert "status" in data
         assert "database" in data
         assert "status" in data["database"]
+
+
+class HangingSession:
+    """SELECT 1 が返ってこない DB を模したセッション"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        await asyncio.sleep(3600)
+
+
+class TestHealthCheckTimeout:
+    """応答しない DB のテスト"""
+
+    async def test_health_check_fails_fast_when_database_hangs(self):
+        """DB が応答しなくても timeout で "disconnected" を返すこと"""
+        result = await check_database(session_factory=HangingSession, timeout=0.05)
+
+        assert result.status == "disconnected"
+        assert result.error is not None
+
+
+class TestCachedCheck:
+    """readiness 結果のキャッシュのテスト"""
+
+    async def test_concurrent_probes_share_one_check(self):
+        """同時に来たプローブと TTL 内のプローブは1回のチェックを共有すること"""
+        calls = 0
+
+        async def check():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return HealthResponse(
+                status="healthy", database=DatabaseHealth(status="connected")
+            )
+
+        cached = CachedCheck(check, ttl_seconds=60)
+        results = await asyncio.gather(*(cached.get() for _ in range(10)))
+        await cached.get()
+
+        assert calls == 1
+        assert all(r.status == "healthy" for r in results)
+
+    async def test_result_is_refreshed_after_ttl(self):
+        """TTL を過ぎたら再チェックすること"""
+        calls = 0
+
+        async def check():
+            nonlocal calls
+            calls += 1
+            return HealthResponse(
+                status="healthy", database=DatabaseHealth(status="connected")
+            )
+
+        cached = CachedCheck(check, ttl_seconds=0)
+        await cached.get()
+        await cached.get()
+
+        assert calls == 2
+
+
+class TestLivenessAndReadinessEndpoints:
+    """liveness / readiness エンドポイントのテスト"""
+
+    async def test_liveness_returns_alive(self, client):
+        """liveness は依存サービスを確認せず 200 を返すこと"""
+        response = await client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    async def test_readiness_includes_dependencies_and_pool(self, client, monkeypatch):
+        """readiness に各依存サービスとプール統計が含まれること"""
+        # 他のテストのイベントループで作られたエンジンを使わないよう作り直させる
+        monkeypatch.setattr(db_session, "_state_pid", None)
+        monkeypatch.setattr(get_readiness(), "_result", None)
+        try:
+            response = await client.get("/health/ready")
+        finally:
+            await db_session.dispose_engines()
+        data = response.json()
+
+        assert data["database"]["status"] == "connected"
+        assert "redis" in data
+        assert data["broker"]["required"] is False
+        assert "primary" in data["db_pool"]
+
+    async def test_readiness_is_unhealthy_while_draining(self, client, monkeypatch):
+        """SIGTERM を受けた後は依存サービスが正常でも 503 を返すこと"""
+        monkeypatch.setattr(lifecycle, "phase", "draining")
+        monkeypatch.setattr(
+            get_readiness(),
+            "_result",
+            HealthResponse(
+                status="healthy", database=DatabaseHealth(status="connected")
+            ),
+        )
+        monkeypatch.setattr(get_readiness(), "_expires_at", float("inf"))
+
+        response = await client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["lifecycle"] == "draining"
@@ -0,0 +1,27 @@
+from app.db.session import get_engine
+
+
+class TestMetricsEndpoint:
+    """メトリクスエンドポイントのテスト"""
+
+    async def test_metrics_returns_text_format(self, client):
+        """Prometheus のテキスト形式で HTTP メトリクスが返ること"""
+        await client.get("/health/live")
+
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            'http_requests_total{method="GET",route="/health/live",status="200"}'
+            in response.text
+        )
+
+    async def test_metrics_include_runtime_stats(self, client):
+        """アカウントキャッシュと DB プールの統計が含まれること"""
+        get_engine()
+
+        response = await client.get("/metrics")
+
+        assert "account_cache_hits_total 0.0" in response.text
+        assert 'db_pool_size{engine="primary"}' in response.text
@@ -0,0 +1,19 @@
+from app.db.session import get_engine
+
+
+class TestStatsEndpoint:
+    """統計エンドポイントのテスト"""
+
+    async def test_stats_reports_account_cache_counters(self, client):
+        """アカウントキャッシュのヒット・ミス件数が返ること"""
+        response = await client.get("/stats")
+
+        assert response.status_code == 200
+        assert response.json()["account_cache"] == {"hits": 0, "misses": 0, "size": 0}
+
+    async def test_stats_reports_db_pool(self, client):
+        """作成済みエンジンのプール統計が返ること"""
+        get_engine()
+        response = await client.get("/stats")
+
+        assert response.json()["db_pool"]["primary"]["size"] >= 1
@@ -1,6 +1,9 @@
 import os
 
 os.environ["APP_ENV"] = "test"  # config.py の import より前に設定
+# 既定は redis だが、テストはプロセス内の実装で動かす（Redis のテストは個別に行う）
+os.environ.setdefault("RATE_LIMIT_BACKEND", "memory")
+os.environ.setdefault("REVOCATION_BACKEND", "memory")
 
 import pytest
 from httpx import ASGITransport, AsyncClient
@@ -71,3 +74,69 @@ async def client(test_session_factory):
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_revocations():
+    """プロセス内の失効セットをテストごとに作り直す（アカウントIDはテスト間で再利用される）"""
+    from app.services.revocation import get_account_revocations, get_token_revocations
+
+    get_account_revocations.cache_clear()
+    get_token_revocations.cache_clear()
+    yield
+    get_account_revocations.cache_clear()
+    get_token_revocations.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_account_cache():
+    """プロセス内のアカウントキャッシュをテストごとに作り直す"""
+    from app.services.account_cache import get_account_cache
+
+    get_account_cache.cache_clear()
+    yield
+    get_account_cache.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """ログイン試行の回数制限をテストごとに作り直す（同じメールアドレス・IP を使い回すため）"""
+    from app.services.rate_limit import get_login_rate_limiter
+
+    get_login_rate_limiter.cache_clear()
+    yield
+    get_login_rate_limiter.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_refresh_token_store():
+    """プロセス内で共有するリフレッシュトークンのストアをテストごとに作り直す"""
+    from app.services.refresh_tokens import _get_shared_store
+
+    _get_shared_store.cache_clear()
+    yield
+    _get_shared_store.cache_clear()
+
+
+@pytest.fixture
+def statement_budget():
+    """
+    ブロック内で実行された SQL が予算以内であることを検証する。
+
+    with statement_budget(2):
+        await client.post("/auth/login/password", json=...)
+    """
+    from contextlib import contextmanager
+
+    from app.db.instrumentation import capture_queries
+
+    @contextmanager
+    def budget(max_statements: int):
+        with capture_queries() as stats:
+            yield stats
+        assert stats.count <= max_statements, (
+            f"SQL 文が予算を超えました: {stats.count} > {max_statements}\n"
+            + "\n".join(f"{n}x {s}" for s, n in stats.statements.items())
+        )
+
+    return budget
@@ -0,0 +1,42 @@
+import asyncio
+import signal
+
+import pytest
+
+from app.core.lifecycle import Lifecycle
+
+
+@pytest.fixture
+def received():
+    """uvicorn の代わりに SIGTERM を受けるハンドラ"""
+    signals = []
+    original = signal.signal(
+        signal.SIGTERM, lambda signum, frame: signals.append(signum)
+    )
+    yield signals
+    signal.signal(signal.SIGTERM, original)
+
+
+class TestLifecycleDrainHandler:
+    async def test_sigterm_drains_before_handing_over(self, received):
+        """SIGTERM で draining になり、猶予の後に元のハンドラへ渡すこと"""
+        lifecycle = Lifecycle()
+        lifecycle.install_drain_handler(0.1)
+
+        signal.raise_signal(signal.SIGTERM)
+        await asyncio.sleep(0)
+
+        assert lifecycle.phase == "draining"
+        assert received == []
+        await asyncio.sleep(0.3)
+        assert received == [signal.SIGTERM]
+
+    async def test_second_sigterm_is_handed_over_immediately(self, received):
+        """2回目の SIGTERM は猶予を待たずに元のハンドラへ渡すこと"""
+        lifecycle = Lifecycle()
+        lifecycle.install_drain_handler(60)
+
+        signal.raise_signal(signal.SIGTERM)
+        signal.raise_signal(signal.SIGTERM)
+
+        assert received == [signal.SIGTERM]
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+
+from app.core import loop_monitor as loop_monitor_module
+from app.core.loop_monitor import LoopMonitor
+from app.core.metrics import LOOP_LAG
+
+
+def _block_event_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def _lag_count() -> float:
+    for family in LOOP_LAG.collect():
+        for sample in family.samples:
+            if sample.name.endswith("_count"):
+                return sample.value
+    return 0.0
+
+
+class TestLoopMonitor:
+    """イベントループ遅延モニターのテスト"""
+
+    async def test_records_loop_lag(self):
+        """一定間隔でループ遅延が記録されること"""
+        before = _lag_count()
+        monitor = LoopMonitor(interval_seconds=0.01, threshold_seconds=1.0)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            await monitor.stop()
+
+        assert _lag_count() > before
+
+    async def test_logs_blocking_stack(self, caplog):
+        """ループが閾値以上止まったら、ブロックしている関数のスタックがログに出ること"""
+        monitor = LoopMonitor(interval_seconds=0.01, threshold_seconds=0.05)
+        monitor.start()
+        try:
+            with caplog.at_level(logging.WARNING, logger=loop_monitor_module.__name__):
+                await asyncio.sleep(0.02)
+                _block_event_loop(0.3)
+                await asyncio.sleep(0.02)
+        finally:
+            await monitor.stop()
+
+        assert "Event loop blocked" in caplog.text
+        assert "_block_event_loop" in caplog.text
+        # 1回の停止は1回だけ報告する
+        assert caplog.text.count("Event loop blocked") == 1
+
+    async def test_no_warning_when_loop_is_responsive(self, caplog):
+        """ループが止まらなければ何もログに出ないこと"""
+        monitor = LoopMonitor(interval_seconds=0.01, threshold_seconds=0.1)
+        monitor.start()
+        try:
+            with caplog.at_level(logging.WARNING, logger=loop_monitor_module.__name__):
+                await asyncio.sleep(0.2)
+        finally:
+            await monitor.stop()
+
+        assert "Event loop blocked" not in caplog.text
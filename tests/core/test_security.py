@@ -0,0 +1,162 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core import security
+from app.core.config import get_settings
+from app.core.security import (
+    Argon2Hasher,
+    BcryptHasher,
+    HashPoolFullError,
+    create_access_token,
+    decode_access_token,
+    get_password_hash,
+    get_password_hash_async,
+    get_password_hasher,
+    password_needs_rehash,
+    verify_password,
+    verify_password_async,
+)
+
+
+class TestPasswordHashAsync:
+    """ワーカープールでのパスワードハッシュ処理のテスト"""
+
+    async def test_hash_and_verify_roundtrip(self):
+        """非同期APIで生成したハッシュを検証できること"""
+        hashed = await get_password_hash_async("mypassword1")
+
+        assert await verify_password_async("mypassword1", hashed)
+        assert not await verify_password_async("wrongpassword", hashed)
+
+    async def test_async_hash_is_compatible_with_sync_api(self):
+        """同期APIと同じ形式のハッシュであること"""
+        hashed = await get_password_hash_async("mypassword1")
+
+        assert verify_password("mypassword1", hashed)
+        assert await verify_password_async(
+            "mypassword1", get_password_hash("mypassword1")
+        )
+
+    async def test_event_loop_is_not_blocked_while_hashing(self):
+        """ハッシュ計算中もイベントループが他の処理を進められること"""
+        hashed = get_password_hash("mypassword1")
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(verify_password_async("mypassword1", hashed) for _ in range(4))
+        )
+        elapsed = time.perf_counter() - start
+        task.cancel()
+
+        # 5ms 間隔の ticker がハッシュ計算時間の半分以上は動けていること
+        assert ticks >= elapsed / 0.005 / 2
+
+    async def test_fails_fast_when_pool_and_queue_are_full(self, monkeypatch):
+        """ワーカーと待ち行列が埋まっていれば、待ち続けずに HashPoolFullError になること"""
+        monkeypatch.setattr(get_settings(), "password_hash_queue_timeout_seconds", 0.05)
+        slots = security._get_hash_slots()
+        held = 0
+        while not slots.locked():
+            await slots.acquire()
+            held += 1
+        try:
+            with pytest.raises(HashPoolFullError):
+                await asyncio.wait_for(verify_password_async("x", "y"), timeout=1)
+        finally:
+            for _ in range(held):
+                slots.release()
+
+        # 空けば再び実行できること
+        assert not await verify_password_async("x", "y")
+
+
+class TestPasswordHasherRegistry:
+    """ハッシュ方式レジストリのテスト"""
+
+    def test_verify_password_identifies_argon2id_hash(self):
+        """argon2id のハッシュも方式を判別して検証できること"""
+        hashed = Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=1).hash(
+            "mypassword1"
+        )
+
+        assert verify_password("mypassword1", hashed)
+        assert not verify_password("wrongpassword", hashed)
+
+    def test_verify_password_rejects_unknown_scheme(self):
+        """未知の形式のハッシュは検証に失敗すること"""
+        assert not verify_password("mypassword1", "plain-text")
+
+    def test_bcrypt_needs_rehash_outside_tolerance(self):
+        """bcrypt のコストがポリシーより低いか、1段階を超えて高い場合に再ハッシュ対象になること"""
+        hashed = BcryptHasher(rounds=6).hash("mypassword1")
+
+        assert BcryptHasher(rounds=7).needs_rehash(hashed)
+        assert not BcryptHasher(rounds=6).needs_rehash(hashed)
+        # ローリングデプロイ中の1段階の差では再ハッシュし合わないこと
+        assert not BcryptHasher(rounds=5).needs_rehash(hashed)
+        # ポリシーを下げたら、既存の高いハッシュも下げられること
+        assert BcryptHasher(rounds=4).needs_rehash(hashed)
+
+    def test_argon2_needs_rehash_outside_tolerance(self):
+        """argon2id の time_cost が許容幅を外れるか、メモリ・並列度が異なれば対象になること"""
+        hashed = Argon2Hasher(time_cost=3, memory_cost=1024, parallelism=1).hash(
+            "mypassword1"
+        )
+
+        def policy(**kwargs):
+            return Argon2Hasher(
+                **{"time_cost": 3, "memory_cost": 1024, "parallelism": 1, **kwargs}
+            )
+
+        assert not policy().needs_rehash(hashed)
+        assert not policy(time_cost=2).needs_rehash(hashed)
+        assert policy(time_cost=4).needs_rehash(hashed)
+        assert policy(time_cost=1).needs_rehash(hashed)
+        assert policy(memory_cost=2048).needs_rehash(hashed)
+        assert policy(memory_cost=512).needs_rehash(hashed)
+        assert policy(parallelism=2).needs_rehash(hashed)
+
+    def test_needs_rehash_when_scheme_differs(self):
+        """方式が異なるハッシュは再ハッシュ対象になること"""
+        hashed = BcryptHasher(rounds=4).hash("mypassword1")
+
+        assert Argon2Hasher().needs_rehash(hashed)
+
+    def test_bcrypt_calibrate_respects_bounds(self):
+        """キャリブレーション結果が許容範囲に収まること"""
+        assert BcryptHasher.calibrate(0.0).rounds == BcryptHasher.MIN_ROUNDS
+        assert BcryptHasher.calibrate(3600.0).rounds == BcryptHasher.MAX_ROUNDS
+
+    def test_policy_uses_configured_cost(self, monkeypatch):
+        """ポリシーは計測せず設定値のコストを使うこと（全ワーカーで同じになる）"""
+        monkeypatch.setattr(get_settings(), "password_hash_scheme", "bcrypt")
+        monkeypatch.setattr(get_settings(), "bcrypt_rounds", 11)
+        get_password_hasher.cache_clear()
+        try:
+            assert get_password_hasher() == BcryptHasher(rounds=11)
+        finally:
+            get_password_hasher.cache_clear()
+
+    def test_current_policy_hash_does_not_need_rehash(self):
+        """現在のポリシーで生成したハッシュは再ハッシュ不要であること"""
+        assert not password_needs_rehash(get_password_hash("mypassword1"))
+
+
+class TestAccessToken:
+    def test_each_token_has_a_unique_jti(self):
+        """失効させるための jti がトークンごとに異なること"""
+        first = decode_access_token(create_access_token({"sub": "1"}))
+        second = decode_access_token(create_access_token({"sub": "1"}))
+
+        assert first["jti"]
+        assert first["jti"] != second["jti"]
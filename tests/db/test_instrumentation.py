@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.db.instrumentation import capture_queries
+
+
+class TestCaptureQueries:
+    """SQL 集計のテスト"""
+
+    async def test_counts_statements_and_time(self, test_session_factory):
+        """実行した文数・合計時間・最も遅い文が集計されること"""
+        async with test_session_factory() as session:
+            with capture_queries() as stats:
+                await session.execute(text("SELECT 1"))
+                await session.execute(text("SELECT pg_sleep(0.01)"))
+
+        assert stats.count == 2
+        assert stats.total_seconds >= 0.01
+        assert stats.slowest_statement == "SELECT pg_sleep(0.01)"
+
+    async def test_nested_captures_both_record(self, test_session_factory):
+        """ネストした集計の両方に記録されること"""
+        async with test_session_factory() as session:
+            with capture_queries() as outer:
+                await session.execute(text("SELECT 1"))
+                with capture_queries() as inner:
+                    await session.execute(text("SELECT 1"))
+
+        assert outer.count == 2
+        assert inner.count == 1
+
+    async def test_repeated_reports_identical_statements(self, test_session_factory):
+        """閾値回以上実行された同一の SQL が N+1 の疑いとして返ること"""
+        async with test_session_factory() as session:
+            with capture_queries() as stats:
+                for _ in range(3):
+                    await session.execute(text("SELECT 1"))
+                await session.execute(text("SELECT 2"))
+
+        assert stats.repeated(3) == [("SELECT 1", 3)]
+
+    async def test_failed_statement_does_not_leak_start_time(
+        self, test_session_factory
+    ):
+        """失敗した文の開始時刻が接続に残らず、次の文の計測がずれないこと"""
+        async with test_session_factory() as session:
+            conn = await session.connection()
+            with pytest.raises(DBAPIError):
+                await session.execute(text("SELECT 1 / 0"))
+            assert conn.info["query_start_times"] == []
+            await session.rollback()
+
+            with capture_queries() as stats:
+                await session.execute(text("SELECT pg_sleep(0.01)"))
+
+        assert stats.count == 1
+        assert 0.01 <= stats.total_seconds < 1
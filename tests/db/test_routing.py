@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.command.account_command import AccountCommand
+from app.core.config import get_settings
+from app.core.security import get_password_hash
+from app.db.routing import READ_REPLICA, RoutingSession
+from app.db.session import get_read_db
+from app.models.account import Account
+from app.models.account_password import AccountPassword
+from app.query.account_query import AccountQuery
+
+settings = get_settings()
+
+
+class StatementLog:
+    """エンジンごとに実行された SQL を記録する"""
+
+    def __init__(self, engine):
+        self.statements = []
+        self._engine = engine
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def close(self):
+        event.remove(self._engine, "before_cursor_execute", self._record)
+
+
+@pytest.fixture
+async def routing(test_session_factory):
+    """同じ DB を指す2つ目のエンジンをレプリカに見立てたセッションファクトリ"""
+    primary = test_session_factory.kw["bind"]
+    # 接続先は同じでもエンジンが別なので、どちらで実行されたかを区別できる
+    replica = create_async_engine(settings.database_url)
+    primary_log = StatementLog(primary.sync_engine)
+    replica_log = StatementLog(replica.sync_engine)
+
+    async with test_session_factory() as session:
+        account = Account(email="user@example.com")
+        session.add(account)
+        await session.flush()
+        session.add(
+            AccountPassword(
+                account_id=account.id, hashed_password=get_password_hash("password1")
+            )
+        )
+        await session.commit()
+    primary_log.statements.clear()
+
+    session_factory = async_sessionmaker(
+        primary,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        replica_bind=replica.sync_engine.execution_options(postgresql_readonly=True),
+        expire_on_commit=False,
+    )
+    yield session_factory, account.id, primary_log, replica_log
+    primary_log.close()
+    replica_log.close()
+    await replica.dispose()
+
+
+class TestRoutingSession:
+    """RoutingSession の振り分けのテスト"""
+
+    async def test_query_reads_run_on_replica(self, routing):
+        """AccountQuery の読み取りは関連ロードも含めてレプリカで実行されること"""
+        session_factory, account_id, primary_log, replica_log = routing
+        async with session_factory() as session:
+            account = await AccountQuery(session).get_with_password(account_id)
+
+        assert account.password is not None
+        assert primary_log.statements == []
+        assert len(replica_log.statements) == 2
+
+    async def test_reads_after_write_run_on_primary(self, routing):
+        """同じセッションで書き込んだ後の読み取りはプライマリで実行されること"""
+        session_factory, account_id, primary_log, replica_log = routing
+        async with session_factory() as session:
+            await AccountCommand(session).deactivate_account(account_id)
+            await session.commit()
+            account = await AccountQuery(session).get_with_password(account_id)
+
+        assert account.is_active is False
+        assert replica_log.statements == []
+
+    async def test_login_credentials_are_read_on_primary(self, routing):
+        """ログイン認証情報の取得はプライマリで実行されること"""
+        session_factory, _, primary_log, replica_log = routing
+        async with session_factory() as session:
+            await AccountQuery(session).get_login_credentials("user@example.com")
+
+        assert len(primary_log.statements) == 1
+        assert replica_log.statements == []
+
+    async def test_replica_rejects_writes(self, routing):
+        """レプリカ側の接続は読み取り専用トランザクションであること"""
+        session_factory, _, _, _ = routing
+        async with session_factory() as session:
+            with pytest.raises(DBAPIError, match="read-only transaction"):
+                await session.execute(
+                    text("DELETE FROM accounts"),
+                    execution_options={READ_REPLICA: True},
+                )
+
+
+class TestGetReadDb:
+    """読み取り専用セッション依存のテスト"""
+
+    async def test_read_session_rejects_writes(self, test_session_factory):
+        """読み取りはでき、書き込みは DB 側で拒否されること"""
+        session = await anext(get_read_db())
+        try:
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+            with pytest.raises(DBAPIError, match="read-only transaction"):
+                await session.execute(text("DELETE FROM accounts"))
+        finally:
+            await session.close()
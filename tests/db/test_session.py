@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import get_settings
+from app.db import session as db_session
+from app.db.pool import InstrumentedAsyncQueuePool
+
+settings = get_settings()
+
+
+class TestGetEngine:
+    """プロセスごとのエンジン生成のテスト"""
+
+    def test_engine_uses_pool_settings(self):
+        """プール設定が反映されたエンジンが作られること"""
+        pool = db_session.get_engine().sync_engine.pool
+
+        assert isinstance(pool, InstrumentedAsyncQueuePool)
+        assert pool.size() == settings.db_pool_size
+        assert pool.stats()["max_overflow"] == settings.db_max_overflow
+
+    def test_engine_is_reused_within_process(self):
+        """同じプロセス内では同じエンジンを返すこと"""
+        assert db_session.get_engine() is db_session.get_engine()
+
+    def test_engine_is_recreated_after_fork(self, monkeypatch):
+        """別プロセスで作られたエンジンは使い回さず作り直すこと"""
+        engine = db_session.get_engine()
+        # fork 後の子プロセスでは記録済みの PID と現在の PID が一致しない
+        monkeypatch.setattr(db_session, "_state_pid", -1)
+
+        assert db_session.get_engine() is not engine
+
+
+class TestInstrumentedAsyncQueuePool:
+    """プール統計のテスト"""
+
+    @pytest.fixture
+    async def engine(self):
+        engine = create_async_engine(
+            settings.database_url,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.1,
+        )
+        yield engine
+        await engine.dispose()
+
+    async def test_counts_checkouts_waits_and_timeouts(self, engine):
+        """貸し出し・待ち・タイムアウトが計上されること"""
+        async with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = engine.sync_engine.pool.stats()
+        assert stats["checkouts"] == 1
+        assert stats["waits"] == 1
+        assert stats["wait_seconds"] >= 0.1
+        assert stats["timeouts"] == 1
+        assert stats["checked_out"] == 0
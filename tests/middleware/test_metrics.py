@@ -0,0 +1,48 @@
+from app.core.metrics import REQUEST_DURATION, REQUESTS, RESPONSE_SIZE
+
+
+def _sample(metric, suffix: str, **labels) -> float:
+    for family in metric.collect():
+        for sample in family.samples:
+            if sample.name.endswith(suffix) and sample.labels == labels:
+                return sample.value
+    return 0.0
+
+
+class TestMetricsMiddleware:
+    """HTTP メトリクスミドルウェアのテスト"""
+
+    async def test_records_request_by_route_template(self, client):
+        """パスではなくルートテンプレートとステータスごとに数えること"""
+        labels = {"method": "POST", "route": "/auth/signup/password", "status": "201"}
+        before = _sample(REQUESTS, "_total", **labels)
+
+        await client.post(
+            "/auth/signup/password",
+            json={"email": "user@example.com", "password": "mypassword1"},
+        )
+
+        assert _sample(REQUESTS, "_total", **labels) == before + 1
+
+    async def test_records_duration_and_response_size(self, client):
+        """処理時間とレスポンスサイズのヒストグラムに記録されること"""
+        labels = {"method": "GET", "route": "/health/live"}
+        count_before = _sample(REQUEST_DURATION, "_count", **labels)
+        size_before = _sample(RESPONSE_SIZE, "_sum", **labels)
+
+        response = await client.get("/health/live")
+
+        assert _sample(REQUEST_DURATION, "_count", **labels) == count_before + 1
+        assert _sample(RESPONSE_SIZE, "_sum", **labels) == size_before + len(
+            response.content
+        )
+
+    async def test_unmatched_paths_share_one_label(self, client):
+        """ルートにマッチしないパスは1つのラベルにまとめること"""
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = _sample(REQUESTS, "_total", **labels)
+
+        await client.get("/no-such-path/1")
+        await client.get("/no-such-path/2")
+
+        assert _sample(REQUESTS, "_total", **labels) == before + 2
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from pydantic import ValidationError
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.config import Settings, get_settings
+from app.middleware.profiler import AWAITING, ProfilerMiddleware, StackSampler
+
+TOKEN = "profile-token"
+
+
+def _busy_work(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def _wait_for_io(seconds: float) -> None:
+    await asyncio.sleep(seconds)
+
+
+async def slow_endpoint(request):
+    _busy_work(0.1)
+    await _wait_for_io(0.1)
+    return PlainTextResponse("ok", status_code=201)
+
+
+def _client() -> AsyncClient:
+    app = ProfilerMiddleware(Starlette(routes=[Route("/slow", slow_endpoint)]))
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+class TestProfilerMiddleware:
+    """リクエスト単位のサンプリングプロファイラのテスト"""
+
+    async def test_returns_collapsed_profile(self, monkeypatch):
+        """トークン付きのリクエストは collapsed stack 形式のプロファイルを返すこと"""
+        monkeypatch.setattr(get_settings(), "profiler_token", TOKEN)
+
+        async with _client() as client:
+            response = await client.get("/slow", headers={"X-Profile": TOKEN})
+
+        assert response.status_code == 200
+        assert response.headers["x-profile-status"] == "201"
+        assert int(response.headers["x-profile-samples"]) > 0
+        lines = response.text.splitlines()
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        # 実行中のスタックと await 中のスタックの両方が取れること
+        assert any(line.split(" ")[0].endswith("_busy_work") for line in lines), (
+            response.text
+        )
+        assert any("_wait_for_io" in line and AWAITING in line for line in lines), (
+            response.text
+        )
+
+    async def test_ignores_wrong_token(self, monkeypatch):
+        """トークンが一致しなければ通常のレスポンスを返すこと"""
+        monkeypatch.setattr(get_settings(), "profiler_token", TOKEN)
+
+        async with _client() as client:
+            response = await client.get("/slow", headers={"X-Profile": "wrong"})
+
+        assert response.status_code == 201
+        assert response.text == "ok"
+
+    async def test_disabled_without_token_setting(self, monkeypatch):
+        """profiler_token が未設定ならプロファイルしないこと"""
+        monkeypatch.setattr(get_settings(), "profiler_token", "")
+
+        async with _client() as client:
+            response = await client.get("/slow", headers={"X-Profile": ""})
+
+        assert response.text == "ok"
+
+    async def test_skips_profiling_over_concurrency_limit(self, monkeypatch):
+        """同時プロファイル数の上限を超えたリクエストは通常どおり処理すること"""
+        monkeypatch.setattr(get_settings(), "profiler_token", TOKEN)
+        monkeypatch.setattr(get_settings(), "profiler_max_concurrent", 1)
+
+        async with _client() as client:
+            first, second = await asyncio.gather(
+                client.get("/slow", headers={"X-Profile": TOKEN}),
+                client.get("/slow", headers={"X-Profile": TOKEN}),
+            )
+
+        assert sorted([first.text == "ok", second.text == "ok"]) == [False, True]
+
+
+class TestStackSampler:
+    """サンプラーのテスト"""
+
+    async def test_interval_is_clamped_to_minimum(self):
+        """0 などの極端に短い間隔は下限に丸められること"""
+        sampler = StackSampler(asyncio.current_task(), 0, max_samples=10)
+
+        assert sampler.interval_seconds == StackSampler.MIN_INTERVAL_SECONDS
+
+    def test_settings_reject_too_short_interval(self):
+        """設定値でも下限より短い間隔は受け付けないこと"""
+        with pytest.raises(ValidationError):
+            Settings(profiler_interval_seconds=1e-6)
+
+    async def test_stop_does_not_block_event_loop(self):
+        """サンプラーの終了待ちの間もイベントループが進むこと"""
+        sampler = StackSampler(asyncio.current_task(), 0.05, max_samples=10)
+        sampler.start()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        await sampler.stop()
+        task.cancel()
+
+        assert ticks > 1
@@ -0,0 +1,45 @@
+import logging
+
+from app.core.config import get_settings
+from app.middleware import query_stats
+
+
+class TestQueryStatsMiddleware:
+    """リクエストごとの SQL 集計ミドルウェアのテスト"""
+
+    async def test_server_timing_header_in_debug(self, client, monkeypatch):
+        """debug 時は Server-Timing ヘッダーに DB 時間と文数が付くこと"""
+        monkeypatch.setattr(get_settings(), "debug", True)
+
+        response = await client.post(
+            "/auth/signup/password",
+            json={"email": "user@example.com", "password": "mypassword1"},
+        )
+
+        assert response.headers["server-timing"].startswith("db;dur=")
+        assert 'desc="1 queries"' in response.headers["server-timing"]
+
+    async def test_no_server_timing_header_without_debug(self, client, monkeypatch):
+        """debug でなければ Server-Timing ヘッダーを付けないこと"""
+        monkeypatch.setattr(get_settings(), "debug", False)
+
+        response = await client.post(
+            "/auth/signup/password",
+            json={"email": "user@example.com", "password": "mypassword1"},
+        )
+
+        assert "server-timing" not in response.headers
+
+    async def test_logs_when_statement_threshold_exceeded(
+        self, client, monkeypatch, caplog
+    ):
+        """文数が閾値を超えたリクエストは WARNING でログに出ること"""
+        monkeypatch.setattr(get_settings(), "sql_log_statement_threshold", 0)
+
+        with caplog.at_level(logging.WARNING, logger=query_stats.__name__):
+            await client.post(
+                "/auth/signup/password",
+                json={"email": "user@example.com", "password": "mypassword1"},
+            )
+
+        assert "SQL budget exceeded: POST /auth/signup/password" in caplog.text
@@ -3,6 +3,7 @@ from datetime import UTC, datetime
 import pytest
 from sqlalchemy.exc import IntegrityError
 
+from app.core.security import hash_refresh_token
 from app.models.account import Account
 from app.models.refresh_token import RefreshToken
 
@@ -18,7 +19,7 @@ class TestRefreshToken:
 
             rt = RefreshToken(
                 account_id=account.id,
-                token="token_abc_123",
+                token_hash=hash_refresh_token("token_abc_123"),
                 expires_at=datetime(2099, 1, 1, tzinfo=UTC),
             )
             session.add(rt)
@@ -26,7 +27,7 @@ class TestRefreshToken:
             await session.refresh(rt)
 
             assert rt.id is not None
-            assert rt.token == "token_abc_123"
+            assert rt.token_hash == hash_refresh_token("token_abc_123")
             assert rt.account_id == account.id
 
             await session.delete(rt)
@@ -42,7 +43,7 @@ class TestRefreshToken:
 
             rt1 = RefreshToken(
                 account_id=account.id,
-                token="dup_token",
+                token_hash=hash_refresh_token("dup_token"),
                 expires_at=datetime(2099, 1, 1, tzinfo=UTC),
             )
             session.add(rt1)
@@ -50,18 +51,19 @@ class TestRefreshToken:
 
             rt2 = RefreshToken(
                 account_id=account.id,
-                token="dup_token",
+                token_hash=hash_refresh_token("dup_token"),
                 expires_at=datetime(2099, 1, 1, tzinfo=UTC),
             )
             session.add(rt2)
-            rt1_id = rt1.id
+            # expires_at はパーティションキーのため主キーに含まれる
+            rt1_key = (rt1.id, rt1.expires_at)
             account_id = account.id
 
             with pytest.raises(IntegrityError):
                 await session.commit()
             await session.rollback()
 
-            result = await session.get(RefreshToken, rt1_id)
+            result = await session.get(RefreshToken, rt1_key)
             if result:
                 await session.delete(result)
             result_account = await session.get(Account, account_id)
@@ -78,7 +80,7 @@ class TestRefreshToken:
 
             rt = RefreshToken(
                 account_id=account.id,
-                token="token_rev_test",
+                token_hash=hash_refresh_token("token_rev_test"),
                 expires_at=datetime(2099, 1, 1, tzinfo=UTC),
             )
             session.add(rt)
@@ -90,3 +92,31 @@ class TestRefreshToken:
             await session.delete(rt)
             await session.delete(account)
             await session.commit()
+
+    async def test_revoked_token_hash_can_be_reused(self, test_session_factory):
+        """一意制約は未 revoke のトークンだけが対象であること"""
+        async with test_session_factory() as session:
+            account = Account(email="rt_reuse@example.com")
+            session.add(account)
+            await session.commit()
+            await session.refresh(account)
+
+            session.add(
+                RefreshToken(
+                    account_id=account.id,
+                    token_hash=hash_refresh_token("reused_token"),
+                    expires_at=datetime(2099, 1, 1, tzinfo=UTC),
+                    revoked=True,
+                )
+            )
+            session.add(
+                RefreshToken(
+                    account_id=account.id,
+                    token_hash=hash_refresh_token("reused_token"),
+                    expires_at=datetime(2099, 1, 1, tzinfo=UTC),
+                )
+            )
+            await session.commit()
+
+            await session.delete(account)
+            await session.commit()
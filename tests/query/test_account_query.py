@@ -75,3 +75,40 @@ class TestAccountQuery:
 
             await session.delete(account)
             await session.commit()
+
+    async def test_get_login_credentials(self, test_session_factory):
+        async with test_session_factory() as session:
+            account = Account(email="q_login@example.com")
+            session.add(account)
+            await session.commit()
+            await session.refresh(account)
+
+            session.add(AccountPassword(account_id=account.id, hashed_password="hash"))
+            await session.commit()
+
+            query = AccountQuery(session)
+            result = await query.get_login_credentials("q_login@example.com")
+
+            assert result is not None
+            assert result.account_id == account.id
+            assert result.email == "q_login@example.com"
+            assert result.is_active is True
+            assert result.created_at is not None
+            assert result.hashed_password == "hash"
+
+            await session.delete(account)
+            await session.commit()
+
+    async def test_get_login_credentials_without_password(self, test_session_factory):
+        async with test_session_factory() as session:
+            account = Account(email="q_login_nopw@example.com")
+            session.add(account)
+            await session.commit()
+
+            query = AccountQuery(session)
+            result = await query.get_login_credentials("q_login_nopw@example.com")
+
+            assert result is None
+
+            await session.delete(account)
+            await session.commit()
@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.command.account_command import AccountCommand
+from app.core.config import get_settings
+from app.core.redis import get_redis
+from app.models.account import Account
+from app.query.account_query import AccountQuery
+from app.services.account_cache import AccountCache, get_account_cache
+
+
+async def _create_account(test_session_factory, email: str) -> int:
+    async with test_session_factory() as session:
+        account = Account(email=email)
+        session.add(account)
+        await session.commit()
+        return account.id
+
+
+@pytest.fixture(autouse=True)
+def enable_account_cache(monkeypatch):
+    monkeypatch.setattr(get_settings(), "account_cache_ttl_seconds", 30.0)
+
+
+class TestAccountCache:
+    """AccountQuery のキャッシュと AccountCommand による無効化のテスト"""
+
+    async def test_second_lookup_is_served_from_cache(
+        self, test_session_factory, statement_budget
+    ):
+        """2回目の取得は SQL を発行せずにキャッシュから返ること"""
+        account_id = await _create_account(test_session_factory, "user@example.com")
+        async with test_session_factory() as session:
+            await AccountQuery(session).get_by_id(account_id)
+
+        async with test_session_factory() as session:
+            with statement_budget(0):
+                by_id = await AccountQuery(session).get_by_id(account_id)
+                by_email = await AccountQuery(session).get_by_email("user@example.com")
+        assert by_id is by_email
+        assert by_id.email == "user@example.com"
+        assert get_account_cache().stats() == {"hits": 2, "misses": 1, "size": 1}
+
+    async def test_command_write_invalidates_after_commit(self, test_session_factory):
+        """AccountCommand の書き込みはコミット後にキャッシュから外れること"""
+        account_id = await _create_account(test_session_factory, "user@example.com")
+        async with test_session_factory() as session:
+            await AccountQuery(session).get_by_id(account_id)
+
+        async with test_session_factory() as session:
+            await AccountCommand(session).deactivate_account(account_id)
+            # コミット前は他のリクエストにはまだ旧い値を返す
+            assert get_account_cache().get_by_id(account_id) is not None
+            await session.commit()
+
+        assert get_account_cache().get_by_id(account_id) is None
+        async with test_session_factory() as session:
+            account = await AccountQuery(session).get_by_id(account_id)
+            assert account.is_active is False
+
+    async def test_rolled_back_write_keeps_cache(self, test_session_factory):
+        """ロールバックした書き込みではキャッシュを外さないこと"""
+        account_id = await _create_account(test_session_factory, "user@example.com")
+        async with test_session_factory() as session:
+            await AccountQuery(session).get_by_id(account_id)
+
+        async with test_session_factory() as session:
+            await AccountCommand(session).deactivate_account(account_id)
+            await session.rollback()
+
+        assert get_account_cache().get_by_id(account_id) is not None
+
+    async def test_cached_reads_do_not_use_replica(
+        self, test_session_factory, monkeypatch
+    ):
+        """キャッシュに入れる読み取りはレプリカで行わないこと"""
+        account_id = await _create_account(test_session_factory, "user@example.com")
+
+        async def fail(self, statement):
+            raise AssertionError("レプリカで読み取りました")
+
+        monkeypatch.setattr(AccountQuery, "_execute_on_replica", fail)
+        async with test_session_factory() as session:
+            account = await AccountQuery(session).get_by_id(account_id)
+
+        assert account.id == account_id
+        assert get_account_cache().get_by_id(account_id) is not None
+
+
+def _values(account_id: int) -> dict:
+    return {"id": account_id, "email": f"user{account_id}@example.com"}
+
+
+class TestAccountCacheGeneration:
+    """読み取り中の無効化で旧い行を入れないためのテスト"""
+
+    def test_row_invalidated_during_read_is_not_cached(self):
+        """読み取りの前に控えた世代より後に無効化された行は入れないこと"""
+        cache = AccountCache(max_size=10, ttl_seconds=30)
+        generation = cache.generation
+        cache.discard([1])
+        cache.set(_values(1), generation)
+        cache.set(_values(2), generation)
+
+        assert cache.get_by_id(1) is None
+        assert cache.get_by_id(2) is not None
+
+        cache.set(_values(1), cache.generation)
+        assert cache.get_by_id(1) is not None
+
+    def test_reads_older_than_forgotten_invalidations_are_not_cached(self):
+        """記録から外れた無効化より前に始めた読み取りは入れないこと"""
+        cache = AccountCache(max_size=1, ttl_seconds=30)
+        generation = cache.generation
+        cache.discard([1])
+        cache.discard([2])
+
+        cache.set(_values(3), generation)
+
+        assert cache.get_by_id(3) is None
+
+    def test_clear_rejects_in_flight_reads(self):
+        """全件破棄より前に始めた読み取りは入れないこと"""
+        cache = AccountCache(max_size=10, ttl_seconds=30)
+        generation = cache.generation
+        cache.clear()
+
+        cache.set(_values(1), generation)
+
+        assert cache.get_by_id(1) is None
+
+
+@pytest.fixture
+async def short_timeout_redis(monkeypatch):
+    """socket_timeout を短くした Redis（接続できない環境ではスキップする）"""
+    monkeypatch.setattr(get_settings(), "redis_socket_timeout_seconds", 0.1)
+    get_redis.cache_clear()
+    client = get_redis()
+    try:
+        await client.ping()
+    except RedisError:
+        pytest.skip("Redis に接続できません")
+    yield client
+    await client.aclose()
+    get_redis.cache_clear()
+
+
+class TestAccountCacheInvalidationChannel:
+    """pub/sub による無効化のテスト"""
+
+    async def test_idle_listener_survives_socket_timeout(
+        self, short_timeout_redis, monkeypatch
+    ):
+        """無通信が socket_timeout を超えても購読が切れず、通知を受け取れること"""
+        monkeypatch.setattr(AccountCache, "POLL_SECONDS", 0.05)
+        subscriber = AccountCache(10, 30, redis=short_timeout_redis)
+        publisher = AccountCache(10, 30, redis=short_timeout_redis)
+        try:
+            subscriber.set(_values(1), subscriber.generation)
+            assert subscriber.get_by_id(1) is not None  # 購読を始める
+            await asyncio.sleep(0.3)
+            generation = subscriber.generation
+
+            publisher.invalidate([1])
+            await asyncio.sleep(0.2)
+
+            assert subscriber.get_by_id(1) is None
+            # 切断による全件破棄ではなく、通知による1件の無効化であること
+            assert subscriber.generation == generation + 1
+        finally:
+            await subscriber.close()
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from app.services.admission import AdmissionLimiter, OverloadedError
+
+
+def _limiter(max_concurrent=1, max_queue=1, queue_timeout_seconds=1.0):
+    return AdmissionLimiter(
+        "test",
+        max_concurrent=max_concurrent,
+        max_queue=max_queue,
+        queue_timeout_seconds=queue_timeout_seconds,
+    )
+
+
+class TestAdmissionLimiter:
+    """同時実行数の制限のテスト"""
+
+    async def test_limits_concurrency(self):
+        """同時に処理されるのは max_concurrent までであること"""
+        limiter = _limiter(max_concurrent=2, max_queue=10)
+        running = 0
+        peak = 0
+
+        async def work():
+            nonlocal running, peak
+            async with limiter.admit():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(work() for _ in range(8)))
+
+        assert peak == 2
+        assert limiter.active == 0
+        assert limiter.queued == 0
+
+    async def test_rejects_when_queue_is_full(self):
+        """待ち行列が満杯なら待たずに断ること"""
+        limiter = _limiter(max_concurrent=1, max_queue=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.admit():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        with pytest.raises(OverloadedError) as exc_info:
+            async with limiter.admit():
+                pass
+
+        assert exc_info.value.reason == "queue_full"
+        release.set()
+        await asyncio.gather(holder, waiter)
+        assert limiter.active == 0
+
+    async def test_rejects_after_queue_timeout(self):
+        """待ち時間の上限を超えたら断り、待ち行列から外れること"""
+        limiter = _limiter(max_concurrent=1, max_queue=1, queue_timeout_seconds=0.05)
+
+        async with limiter.admit():
+            with pytest.raises(OverloadedError) as exc_info:
+                async with limiter.admit():
+                    pass
+
+            assert exc_info.value.reason == "queue_timeout"
+            assert limiter.queued == 0
+
+        assert limiter.active == 0
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        """待っている間にキャンセルされても枠が失われないこと"""
+        limiter = _limiter(max_concurrent=1, max_queue=1)
+
+        async with limiter.admit():
+            waiter = asyncio.create_task(limiter.admit().__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        assert limiter.active == 0
+        async with limiter.admit():
+            assert limiter.active == 1
@@ -0,0 +1,52 @@
+from app.services.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """TTL 付き LRU キャッシュのテスト"""
+
+    def test_get_counts_hits_and_misses(self):
+        """ヒット・ミスが計上されること"""
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_entries_expire_after_ttl(self):
+        """TTL を過ぎたエントリはミスになり削除されること"""
+        clock = FakeClock()
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 60.0
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """上限を超えたら最も長く使われていないエントリから追い出されること"""
+        cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_zero_ttl_disables_cache(self):
+        """TTL が 0 なら何も保持しないこと"""
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=0)
+        cache.set("a", 1)
+
+        assert len(cache) == 0
@@ -0,0 +1,130 @@
+import logging
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.core.config import Settings, get_settings
+from app.core.redis import get_redis
+from app.services.rate_limit import (
+    MemoryRateLimiter,
+    RateLimit,
+    RedisRateLimiter,
+    check_rate_limit_backend,
+    login_limits,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMemoryRateLimiter:
+    """プロセス内のスライディングウィンドウのテスト"""
+
+    async def test_denies_over_limit_until_window_slides(self):
+        """上限に達したら拒否し、最古の試行が窓から外れたら再び許可すること"""
+        clock = FakeClock()
+        limiter = MemoryRateLimiter(window_seconds=60, clock=clock)
+        limits = [RateLimit("k", 2)]
+
+        assert await limiter.hit(limits) == 0
+        clock.now += 10
+        assert await limiter.hit(limits) == 0
+        assert await limiter.hit(limits) == pytest.approx(50)
+
+        clock.now += 51
+        assert await limiter.hit(limits) == 0
+
+    async def test_denied_attempt_is_not_counted_on_any_key(self):
+        """どれかのキーで拒否されたら、他のキーにも数えないこと"""
+        limiter = MemoryRateLimiter(window_seconds=60, clock=FakeClock())
+        await limiter.hit([RateLimit("email", 1)])
+
+        assert await limiter.hit([RateLimit("email", 1), RateLimit("ip", 1)]) > 0
+        assert await limiter.hit([RateLimit("ip", 1)]) == 0
+
+    async def test_sweeps_idle_keys(self):
+        """窓の外の試行しかないキーは捨てること"""
+        clock = FakeClock()
+        limiter = MemoryRateLimiter(window_seconds=60, clock=clock)
+        await limiter.hit([RateLimit("old", 1)])
+
+        clock.now += 61
+        await limiter.hit([RateLimit("new", 1)])
+
+        assert set(limiter._hits) == {"new"}
+
+
+class TestLoginLimits:
+    """ログイン試行の制限キーのテスト"""
+
+    def test_email_is_normalized_and_hashed(self):
+        """メールアドレスは正規化してからハッシュ化し、そのままキーにしないこと"""
+        upper = login_limits("10.0.0.1", " User@Example.com ")
+        lower = login_limits("10.0.0.1", "user@example.com")
+
+        assert upper == lower
+        assert "user@example.com" not in upper[0].key
+        assert upper[1].key == "ratelimit:login:ip:10.0.0.1"
+
+
+@pytest.fixture
+async def redis_client():
+    """Redis に接続できない環境ではスキップする"""
+    client = get_redis()
+    try:
+        await client.ping()
+    except RedisError:
+        pytest.skip("Redis に接続できません")
+    yield client
+    await client.delete("test:ratelimit:a", "test:ratelimit:b")
+    await client.aclose()
+    get_redis.cache_clear()
+
+
+class TestRedisRateLimiter:
+    """Redis（Lua スクリプト）のスライディングウィンドウのテスト"""
+
+    async def test_denies_over_limit_atomically_across_keys(self, redis_client):
+        """上限に達したキーがあれば拒否し、その試行はどのキーにも数えないこと"""
+        await redis_client.delete("test:ratelimit:a", "test:ratelimit:b")
+        limiter = RedisRateLimiter(redis_client, window_seconds=60)
+        a = RateLimit("test:ratelimit:a", 1)
+        b = RateLimit("test:ratelimit:b", 5)
+
+        assert await limiter.hit([a, b]) == 0
+        retry_after = await limiter.hit([a, b])
+
+        assert 59 < retry_after <= 60
+        assert await redis_client.zcard("test:ratelimit:b") == 1
+        assert 0 < await redis_client.pttl("test:ratelimit:a") <= 60_000
+
+
+class TestCheckRateLimitBackend:
+    """起動時の回数制限の保存先の確認のテスト"""
+
+    def test_defaults_to_redis(self):
+        """複数ワーカーでも上限が守られるよう、既定は redis であること"""
+        assert Settings.model_fields["rate_limit_backend"].default == "redis"
+
+    def test_warns_with_memory_backend(self, monkeypatch, caplog):
+        """テスト以外で memory を選ぶと起動時に警告すること"""
+        monkeypatch.setattr(get_settings(), "rate_limit_backend", "memory")
+
+        with caplog.at_level(logging.WARNING):
+            check_rate_limit_backend(app_env="development")
+
+        assert "RATE_LIMIT_BACKEND=memory" in caplog.text
+
+    def test_allows_memory_backend_in_tests(self, monkeypatch, caplog):
+        """テストでは memory のまま何も言わずに動くこと"""
+        monkeypatch.setattr(get_settings(), "rate_limit_backend", "memory")
+
+        with caplog.at_level(logging.WARNING):
+            check_rate_limit_backend(app_env="test")
+
+        assert caplog.text == ""
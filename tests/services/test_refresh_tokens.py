@@ -0,0 +1,142 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.core.redis import get_redis
+from app.services.refresh_tokens import (
+    MemoryRefreshTokenStore,
+    RedisRefreshTokenStore,
+)
+
+
+class _TestRedisRefreshTokenStore(RedisRefreshTokenStore):
+    TOKEN_PREFIX = "test:refresh:token:"
+    ACCOUNT_PREFIX = "test:refresh:account:"
+
+
+async def _redis_or_skip():
+    client = get_redis()
+    try:
+        await client.ping()
+    except RedisError:
+        pytest.skip("Redis に接続できません")
+    return client
+
+
+async def _cleanup(client) -> None:
+    keys = [key async for key in client.scan_iter("test:refresh:*")]
+    if keys:
+        await client.delete(*keys)
+    await client.aclose()
+    get_redis.cache_clear()
+
+
+@pytest.fixture
+async def redis_client():
+    """Redis に接続できない環境ではスキップする"""
+    client = await _redis_or_skip()
+    yield client
+    await _cleanup(client)
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def store(request):
+    if request.param == "memory":
+        yield MemoryRefreshTokenStore()
+        return
+    client = await _redis_or_skip()
+    yield _TestRedisRefreshTokenStore(client)
+    await _cleanup(client)
+
+
+def _in(days: float) -> datetime:
+    return datetime.now(UTC) + timedelta(days=days)
+
+
+class TestRefreshTokenStore:
+    """DB 以外のリフレッシュトークンのストアのテスト（SQL はユースケースのテストで確認）"""
+
+    async def test_rotate_issues_new_token_once(self, store):
+        """ローテーションは1回だけ成功し、新しいトークンで続けられること"""
+        await store.issue(1, "old", _in(7))
+
+        assert await store.rotate("old", "new", _in(7)) == 1
+        assert await store.rotate("old", "other", _in(7)) is None
+        assert await store.rotate("new", "newer", _in(7)) == 1
+
+    async def test_rotate_rejects_unknown_token(self, store):
+        """発行していないトークンはローテーションできないこと"""
+        assert await store.rotate("unknown", "new", _in(7)) is None
+        assert await store.expired("unknown") is False
+
+    async def test_revoke(self, store):
+        """失効させたトークンはローテーションできないこと"""
+        await store.issue(1, "token", _in(7))
+        await store.revoke("token")
+
+        assert await store.rotate("token", "new", _in(7)) is None
+
+    async def test_revoke_all_only_affects_the_account(self, store):
+        """アカウントのトークンをすべて失効させ、他のアカウントには影響しないこと"""
+        await store.issue(1, "a", _in(7))
+        await store.issue(1, "b", _in(7))
+        await store.issue(2, "c", _in(7))
+        await store.rotate("b", "b2", _in(7))
+
+        await store.revoke_all(1)
+
+        assert await store.rotate("a", "x", _in(7)) is None
+        assert await store.rotate("b2", "y", _in(7)) is None
+        assert await store.rotate("c", "z", _in(7)) == 2
+
+
+class TestMemoryRefreshTokenStore:
+    async def test_expired_token_cannot_be_rotated(self):
+        """期限切れのトークンはローテーションできず、期限切れと判定できること"""
+        store = MemoryRefreshTokenStore()
+        await store.issue(1, "token", _in(-1))
+
+        assert await store.rotate("token", "new", _in(7)) is None
+        assert await store.expired("token") is True
+
+
+class TestRedisRefreshTokenStore:
+    async def test_token_keys_expire_with_the_token(self, redis_client):
+        """トークンのキーにトークンの期限が設定されること"""
+        store = _TestRedisRefreshTokenStore(redis_client)
+        await store.issue(1, "token", _in(1))
+        await store.rotate("token", "new", _in(2))
+
+        key = f"{store.TOKEN_PREFIX}{store._digest('new')}"
+        ttl = await redis_client.pttl(key)
+        assert 86_400_000 < ttl <= 2 * 86_400_000
+        assert (
+            await redis_client.exists(f"{store.TOKEN_PREFIX}{store._digest('token')}")
+            == 0
+        )
+
+    async def test_account_index_drops_expired_digests(self, redis_client):
+        """発行・ローテーションのたびに、期限切れのダイジェストが索引から消えること"""
+        store = _TestRedisRefreshTokenStore(redis_client)
+        index = f"{store.ACCOUNT_PREFIX}1"
+        soon = datetime.now(UTC) + timedelta(milliseconds=50)
+        await store.issue(1, "short-1", soon)
+        await store.issue(1, "live", _in(7))
+        await store.issue(1, "short-2", soon)
+        await asyncio.sleep(0.1)
+
+        await store.issue(1, "other", _in(7))
+        assert await redis_client.smembers(index) == {
+            store._digest("live"),
+            store._digest("other"),
+        }
+
+        await store.issue(1, "short-3", datetime.now(UTC) + timedelta(milliseconds=50))
+        await asyncio.sleep(0.1)
+        await store.rotate("live", "rotated", _in(7))
+        assert await redis_client.smembers(index) == {
+            store._digest("other"),
+            store._digest("rotated"),
+        }
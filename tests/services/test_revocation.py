@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.core.config import Settings, get_settings
+from app.core.redis import get_redis
+from app.services import revocation
+from app.services.revocation import (
+    MemoryRevocationSet,
+    RedisRevocationSet,
+    check_revocation_backend,
+)
+
+
+class TestMemoryRevocationSet:
+    """プロセス内失効セットのテスト"""
+
+    async def test_revoke_and_lookup(self):
+        """失効させた識別子の失効時刻が取得できること"""
+        revocations = MemoryRevocationSet(retention_seconds=60)
+        now = time.time()
+        await revocations.revoke("1", revoked_at=now)
+
+        assert await revocations.revoked_at("1") == now
+        assert await revocations.revoked_at("2") is None
+
+    async def test_entries_older_than_retention_are_ignored(self):
+        """保持期間を過ぎた失効は判定に使われないこと"""
+        revocations = MemoryRevocationSet(retention_seconds=60)
+        await revocations.revoke("1", revoked_at=time.time() - 120)
+
+        assert await revocations.revoked_at("1") is None
+
+    async def test_expired_entries_are_pruned_periodically(self, monkeypatch):
+        """保持期間を過ぎたエントリは、保持期間ごとの登録時にまとめて捨てられること"""
+        now = time.time()
+        monkeypatch.setattr(revocation.time, "time", lambda: now)
+        revocations = MemoryRevocationSet(retention_seconds=60)
+        await revocations.revoke("old", revoked_at=now - 120)
+        await revocations.revoke("recent", revoked_at=now + 10)
+
+        now += 61
+        await revocations.revoke("new", revoked_at=now)
+
+        assert set(revocations._entries) == {"recent", "new"}
+
+    async def test_revoke_keeps_latest_timestamp(self):
+        """同じ識別子を再度失効させても時刻が巻き戻らないこと"""
+        revocations = MemoryRevocationSet(retention_seconds=60)
+        now = time.time()
+        await revocations.revoke("1", revoked_at=now)
+        await revocations.revoke("1", revoked_at=now - 10)
+
+        assert await revocations.revoked_at("1") == now
+
+
+@pytest.fixture
+async def redis_client():
+    """Redis に接続できない環境ではスキップする"""
+    client = get_redis()
+    try:
+        await client.ping()
+    except RedisError:
+        pytest.skip("Redis に接続できません")
+    yield client
+    await client.delete("test:revoked")
+    await client.aclose()
+    get_redis.cache_clear()
+
+
+class TestRedisRevocationSet:
+    """Redis 失効セットのテスト"""
+
+    async def test_revocation_is_visible_from_other_process_after_sync(
+        self, redis_client
+    ):
+        """他プロセスで登録した失効が同期後にミラーへ反映されること"""
+        writer = RedisRevocationSet(redis_client, "test:revoked", 60, 3600)
+        reader = RedisRevocationSet(redis_client, "test:revoked", 60, 3600)
+        await reader.start()
+        try:
+            await writer.revoke("1")
+
+            # 同期間隔内はミラーの内容で判定する
+            assert await reader.revoked_at("1") is None
+            await reader.sync()
+            assert await reader.revoked_at("1") is not None
+        finally:
+            await reader.close()
+
+    async def test_sync_runs_in_background(self, redis_client):
+        """判定は同期を待たず、同期はバックグラウンドで進むこと"""
+        writer = RedisRevocationSet(redis_client, "test:revoked", 60, 3600)
+        reader = RedisRevocationSet(redis_client, "test:revoked", 60, 0.05)
+        await writer.revoke("1")
+        try:
+            assert await reader.revoked_at("1") is None
+            await asyncio.sleep(0.2)
+            assert await reader.revoked_at("1") is not None
+        finally:
+            await reader.close()
+
+    async def test_lookup_does_not_wait_for_hung_redis(self, redis_client, monkeypatch):
+        """Redis の応答が返らなくても判定が止まらないこと"""
+        hung = asyncio.Event()
+
+        async def hang(*args, **kwargs):
+            hung.set()
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(redis_client, "zrangebyscore", hang)
+        revocations = RedisRevocationSet(redis_client, "test:revoked", 60, 0)
+        try:
+            await asyncio.wait_for(revocations.revoked_at("1"), timeout=0.1)
+            await asyncio.wait_for(hung.wait(), timeout=0.1)
+            assert await asyncio.wait_for(revocations.revoked_at("1"), 0.1) is None
+        finally:
+            await revocations.close()
+
+    async def test_sync_keeps_revocations_made_while_in_flight(
+        self, redis_client, monkeypatch
+    ):
+        """同期中に自プロセスで登録した失効が、取り込み結果で消えないこと"""
+        revocations = RedisRevocationSet(redis_client, "test:revoked", 60, 3600)
+        zrangebyscore = redis_client.zrangebyscore
+        fetched = asyncio.Event()
+        release = asyncio.Event()
+
+        async def delayed_zrangebyscore(*args, **kwargs):
+            # revoke より前の内容を読み、revoke の後で返す
+            entries = await zrangebyscore(*args, **kwargs)
+            fetched.set()
+            await release.wait()
+            return entries
+
+        monkeypatch.setattr(redis_client, "zrangebyscore", delayed_zrangebyscore)
+        sync = asyncio.create_task(revocations.sync())
+        await fetched.wait()
+        await revocations.revoke("1")
+        release.set()
+        await sync
+
+        assert await revocations.revoked_at("1") is not None
+        await revocations.close()
+
+    async def test_client_has_socket_timeouts(self, redis_client):
+        """応答待ち・接続待ちに上限が設定されていること"""
+        kwargs = redis_client.connection_pool.connection_kwargs
+
+        assert kwargs["socket_timeout"] is not None
+        assert kwargs["socket_connect_timeout"] is not None
+
+
+class TestCheckRevocationBackend:
+    """起動時の失効セットの保存先の確認のテスト"""
+
+    @pytest.fixture(autouse=True)
+    def memory_backend(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "revocation_backend", "memory")
+
+    async def test_memory_backend_does_not_share_revocations_between_workers(self):
+        """memory ではワーカーごとに別の失効セットになり、ログアウトが共有されないこと"""
+        worker_a = MemoryRevocationSet(retention_seconds=60)
+        worker_b = MemoryRevocationSet(retention_seconds=60)
+
+        await worker_a.revoke("jti")
+
+        assert await worker_a.revoked_at("jti") is not None
+        assert await worker_b.revoked_at("jti") is None
+
+    def test_defaults_to_redis(self):
+        """複数ワーカーでも失効が共有されるよう、既定は redis であること"""
+        assert Settings.model_fields["revocation_backend"].default == "redis"
+
+    def test_refuses_stateless_auth_with_memory_backend(self, monkeypatch):
+        """auth_stateless と memory の組み合わせは起動を拒否すること"""
+        monkeypatch.setattr(get_settings(), "auth_stateless", True)
+
+        with pytest.raises(RuntimeError, match="REVOCATION_BACKEND=redis"):
+            check_revocation_backend(app_env="development")
+
+    def test_warns_with_memory_backend(self, monkeypatch, caplog):
+        """memory の場合は起動時に警告を出すこと"""
+        monkeypatch.setattr(get_settings(), "auth_stateless", False)
+
+        with caplog.at_level(logging.WARNING):
+            check_revocation_backend(app_env="development")
+
+        assert "REVOCATION_BACKEND=memory" in caplog.text
+
+    def test_allows_memory_backend_in_tests(self, monkeypatch, caplog):
+        """テストでは memory のまま何も言わずに動くこと"""
+        monkeypatch.setattr(get_settings(), "auth_stateless", True)
+
+        with caplog.at_level(logging.WARNING):
+            check_revocation_backend(app_env="test")
+
+        assert caplog.text == ""
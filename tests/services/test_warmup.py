@@ -0,0 +1,23 @@
+from app.services.warmup import warm_up_engine, warm_up_serialization
+
+
+class TestWarmUpEngine:
+    """起動時の接続ウォームアップのテスト"""
+
+    async def test_opens_requested_number_of_connections(self, test_session_factory):
+        """指定した本数の接続が開かれ、プールに戻ること"""
+        engine = test_session_factory.kw["bind"]
+
+        await warm_up_engine(engine, connections=3)
+
+        pool = engine.sync_engine.pool
+        assert pool.checkedin() == 3
+        assert pool.checkedout() == 0
+
+
+class TestWarmUpSerialization:
+    """スキーマのウォームアップのテスト"""
+
+    def test_runs_without_error(self):
+        """リクエスト・レスポンスのスキーマを一通り通せること"""
+        warm_up_serialization()
@@ -0,0 +1,80 @@
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+# app.main を新しいプロセスで import する時間の上限（-X importtime の計測値）。
+# .pyc が1つもない状態（依存パッケージも含めてすべてコンパイルする）で
+# 約 1600ms のため、2割強の余裕を持たせている
+IMPORT_BUDGET_MS = 2000
+
+# API プロセスの起動経路で import してはいけないパッケージ（ワーカー・LLM 用）
+FORBIDDEN_PACKAGES = ("celery", "kombu", "langchain", "langchain_core", "openai")
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)")
+
+# import 後に読み込み済みのモジュールと、設定を読んだかどうかを出力する
+IMPORT_SCRIPT = """
+import sys, app.main
+from app.core.config import get_settings
+print(get_settings.cache_info().currsize)
+print('\\n'.join(sys.modules))
+"""
+
+
+@pytest.fixture(scope="module")
+def cold_import(tmp_path_factory) -> tuple[dict[str, int], set[str], bool]:
+    """
+    新しいプロセスで .pyc を使わずに app.main を import し、モジュールごとの
+    累積時間(us)・読み込まれたモジュール・設定を読んだかどうかを返す。
+    空のキャッシュを指定し、書き込みも止めることで毎回コールドに計測する。
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={
+            **os.environ,
+            "APP_ENV": "test",
+            "PYTHONDONTWRITEBYTECODE": "1",
+            "PYTHONPYCACHEPREFIX": str(tmp_path_factory.mktemp("pycache")),
+        },
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(3)] = int(match.group(1))
+    settings_loaded, *modules = result.stdout.split()
+    return cumulative, set(modules), settings_loaded != "0"
+
+
+class TestImportTime:
+    """API プロセスの起動時 import のテスト"""
+
+    def test_app_main_import_is_within_budget(self, cold_import):
+        """app.main のコールドな import が予算内に収まること"""
+        cumulative, _, _ = cold_import
+
+        elapsed_ms = cumulative["app.main"] / 1000
+        slowest = sorted(cumulative.items(), key=lambda item: -item[1])[:10]
+        assert elapsed_ms <= IMPORT_BUDGET_MS, (
+            f"app.main の import に {elapsed_ms:.0f}ms かかりました\n"
+            + "\n".join(f"{us / 1000:8.1f}ms {name}" for name, us in slowest)
+        )
+
+    def test_worker_and_llm_packages_are_not_imported(self, cold_import):
+        """Celery・LangChain などを API の起動経路で import しないこと"""
+        _, modules, _ = cold_import
+
+        imported = {name.split(".")[0] for name in modules} & set(FORBIDDEN_PACKAGES)
+        assert imported == set()
+
+    def test_settings_are_not_loaded_on_import(self, cold_import):
+        """app.main の import では設定（.env）を読まないこと"""
+        _, _, settings_loaded = cold_import
+
+        assert not settings_loaded
@@ -0,0 +1,57 @@
+import secrets
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.core.security import hash_refresh_token
+from app.models.account import Account
+from app.models.refresh_token import RefreshToken
+from app.services.revocation import get_account_revocations
+from app.usecase.deactivate_account_usecase import DeactivateAccountUseCase
+
+
+class TestDeactivateAccountUseCase:
+    async def test_deactivate_revokes_tokens_and_registers_revocation(
+        self, test_session_factory
+    ):
+        async with test_session_factory() as session:
+            account = Account(email="user@example.com")
+            session.add(account)
+            await session.flush()
+            session.add(
+                RefreshToken(
+                    account_id=account.id,
+                    token_hash=hash_refresh_token(secrets.token_urlsafe()),
+                    expires_at=datetime.now(UTC) + timedelta(days=7),
+                )
+            )
+            await session.commit()
+            account_id = account.id
+
+        async with test_session_factory() as session:
+            await DeactivateAccountUseCase(session).execute(account_id)
+            await session.commit()
+
+        async with test_session_factory() as session:
+            account = await session.get(Account, account_id)
+            assert account.is_active is False
+            tokens = (
+                (
+                    await session.execute(
+                        select(RefreshToken).where(
+                            RefreshToken.account_id == account_id
+                        )
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            assert all(t.revoked for t in tokens)
+
+        assert await get_account_revocations().revoked_at(str(account_id)) is not None
+
+    async def test_deactivate_unknown_account_raises(self, test_session_factory):
+        async with test_session_factory() as session:
+            with pytest.raises(ValueError, match="アカウントが見つからないか"):
+                await DeactivateAccountUseCase(session).execute(99999)
@@ -1,19 +1,22 @@
 import pytest
 from sqlalchemy import select
 
-from app.core.security import get_password_hash
+from app.core.security import BcryptHasher, get_password_hash, verify_password
 from app.models.account import Account
 from app.models.account_password import AccountPassword
 from app.models.refresh_token import RefreshToken
 from app.usecase.login_usecase import LoginUseCase
 
 
-async def _create_account(session, email="user@example.com", password="mypassword1"):
+async def _create_account(
+    session, email="user@example.com", password="mypassword1", hashed_password=None
+):
     account = Account(email=email)
     session.add(account)
     await session.flush()
     pw = AccountPassword(
-        account_id=account.id, hashed_password=get_password_hash(password)
+        account_id=account.id,
+        hashed_password=hashed_password or get_password_hash(password),
     )
     session.add(pw)
     await session.flush()
@@ -83,3 +86,70 @@ class TestLoginUseCase:
                 await usecase.execute(
                     email="nobody@example.com", password="mypassword1"
                 )
+
+    async def test_login_rehashes_password_with_outdated_parameters(
+        self, test_session_factory
+    ):
+        old_hash = BcryptHasher(rounds=4).hash("mypassword1")
+        async with test_session_factory() as session:
+            account = await _create_account(session, hashed_password=old_hash)
+            account_id = account.id
+            await session.commit()
+
+        async with test_session_factory() as session:
+            usecase = LoginUseCase(session)
+            await usecase.execute(email="user@example.com", password="mypassword1")
+            await session.commit()
+
+        async with test_session_factory() as session:
+            pw = (
+                await session.execute(
+                    select(AccountPassword).where(
+                        AccountPassword.account_id == account_id
+                    )
+                )
+            ).scalar_one()
+            assert pw.hashed_password != old_hash
+            assert verify_password("mypassword1", pw.hashed_password)
+
+    async def test_login_runs_single_select_and_single_insert(
+        self, test_session_factory, statement_budget
+    ):
+        async with test_session_factory() as session:
+            await _create_account(session)
+            await session.commit()
+
+        async with test_session_factory() as session:
+            usecase = LoginUseCase(session)
+            # 認証情報の取得1回 + リフレッシュトークンの INSERT 1回
+            with statement_budget(2) as stats:
+                await usecase.execute(email="user@example.com", password="mypassword1")
+
+        statements = list(stats.statements)
+        assert stats.count == 2
+        assert statements[0].lstrip().startswith("SELECT")
+        assert statements[1].lstrip().startswith("INSERT INTO refresh_tokens")
+
+    async def test_connection_is_released_while_verifying_password(
+        self, test_session_factory, monkeypatch
+    ):
+        async with test_session_factory() as session:
+            await _create_account(session)
+            await session.commit()
+
+        checked_out = []
+
+        async def verify_password_async(plain_password, hashed_password):
+            checked_out.append(session.bind.pool.checkedout())
+            return verify_password(plain_password, hashed_password)
+
+        monkeypatch.setattr(
+            "app.usecase.login_usecase.verify_password_async", verify_password_async
+        )
+
+        async with test_session_factory() as session:
+            usecase = LoginUseCase(session)
+            await usecase.execute(email="user@example.com", password="mypassword1")
+
+        # パスワード検証中はこのセッションも接続を保持していない
+        assert checked_out == [0]
@@ -1,10 +1,13 @@
 import secrets
+import time
 from datetime import UTC, datetime, timedelta
 
 from sqlalchemy import select
 
+from app.core.security import hash_refresh_token
 from app.models.account import Account
 from app.models.refresh_token import RefreshToken
+from app.services.revocation import get_token_revocations
 from app.usecase.logout_usecase import LogoutUseCase
 
 
@@ -17,7 +20,7 @@ class TestLogoutUseCase:
             token_raw = secrets.token_urlsafe()
             rt = RefreshToken(
                 account_id=account.id,
-                token=token_raw,
+                token_hash=hash_refresh_token(token_raw),
                 expires_at=datetime.now(UTC) + timedelta(days=7),
             )
             session.add(rt)
@@ -31,7 +34,9 @@ class TestLogoutUseCase:
         async with test_session_factory() as session:
             rt = (
                 await session.execute(
-                    select(RefreshToken).where(RefreshToken.token == token_raw)
+                    select(RefreshToken).where(
+                        RefreshToken.token_hash == hash_refresh_token(token_raw)
+                    )
                 )
             ).scalar_one()
             assert rt.revoked is True
@@ -42,3 +47,16 @@ class TestLogoutUseCase:
         async with test_session_factory() as session:
             usecase = LogoutUseCase(session)
             await usecase.execute(refresh_token="nonexistent-token")
+
+    async def test_logout_revokes_access_token_by_jti(self, test_session_factory):
+        """アクセストークンの jti を iat を失効時刻として失効セットに登録すること"""
+        issued_at = time.time()
+        async with test_session_factory() as session:
+            usecase = LogoutUseCase(session)
+            await usecase.execute(
+                refresh_token="nonexistent-token",
+                access_token_id="jti-1",
+                access_token_issued_at=issued_at,
+            )
+
+        assert await get_token_revocations().revoked_at("jti-1") == issued_at
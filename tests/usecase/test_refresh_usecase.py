@@ -1,9 +1,11 @@
+import asyncio
 import secrets
 from datetime import UTC, datetime, timedelta
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import func, select
 
+from app.core.security import hash_refresh_token
 from app.models.account import Account
 from app.models.refresh_token import RefreshToken
 from app.usecase.refresh_usecase import RefreshUseCase
@@ -16,7 +18,7 @@ async def _create_account_with_refresh_token(session, *, days=7, revoked=False):
     token_raw = secrets.token_urlsafe()
     rt = RefreshToken(
         account_id=account.id,
-        token=token_raw,
+        token_hash=hash_refresh_token(token_raw),
         expires_at=datetime.now(UTC) + timedelta(days=days),
         revoked=revoked,
     )
@@ -53,7 +55,9 @@ class TestRefreshUseCase:
         async with test_session_factory() as session:
             old_rt = (
                 await session.execute(
-                    select(RefreshToken).where(RefreshToken.token == token_raw)
+                    select(RefreshToken).where(
+                        RefreshToken.token_hash == hash_refresh_token(token_raw)
+                    )
                 )
             ).scalar_one()
             assert old_rt.revoked is True
@@ -89,3 +93,53 @@ class TestRefreshUseCase:
                 ValueError, match="リフレッシュトークンの有効期限が切れています"
             ):
                 await usecase.execute(refresh_token=token_raw)
+
+    async def test_refresh_runs_single_statement(
+        self, test_session_factory, statement_budget
+    ):
+        async with test_session_factory() as session:
+            _account, token_raw = await _create_account_with_refresh_token(session)
+            await session.commit()
+
+        async with test_session_factory() as session:
+            with statement_budget(1) as stats:
+                await RefreshUseCase(session).execute(refresh_token=token_raw)
+
+        assert stats.count == 1
+
+    async def test_concurrent_refresh_with_same_token_succeeds_once(
+        self, test_session_factory
+    ):
+        async with test_session_factory() as session:
+            account, token_raw = await _create_account_with_refresh_token(session)
+            account_id = account.id
+            await session.commit()
+
+        async def refresh():
+            async with test_session_factory() as session:
+                result = await RefreshUseCase(session).execute(refresh_token=token_raw)
+                await session.commit()
+                return result
+
+        results = await asyncio.gather(
+            *(refresh() for _ in range(8)), return_exceptions=True
+        )
+
+        succeeded = [r for r in results if not isinstance(r, BaseException)]
+        failed = [r for r in results if isinstance(r, BaseException)]
+        assert len(succeeded) == 1
+        assert all(
+            isinstance(e, ValueError) and str(e) == "無効なリフレッシュトークンです"
+            for e in failed
+        )
+
+        async with test_session_factory() as session:
+            live_tokens = await session.scalar(
+                select(func.count())
+                .select_from(RefreshToken)
+                .where(
+                    RefreshToken.account_id == account_id,
+                    RefreshToken.revoked.is_(False),
+                )
+            )
+        assert live_tokens == 1
@@ -1,10 +1,14 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
 import pytest
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 from app.core.security import verify_password
 from app.models.account import Account
 from app.models.account_password import AccountPassword
 from app.models.refresh_token import RefreshToken
+from app.services.refresh_tokens import MemoryRefreshTokenStore
 from app.usecase.signup_usecase import SignupUseCase
 
 
@@ -86,3 +90,78 @@ class TestSignupUseCase:
                 ValueError, match="このメールアドレスは既に登録されています"
             ):
                 await usecase.execute(email="dup@example.com", password="mypassword1")
+
+    async def test_signup_runs_single_statement(
+        self, test_session_factory, statement_budget
+    ):
+        async with test_session_factory() as session:
+            usecase = SignupUseCase(session)
+            with statement_budget(1) as stats:
+                await usecase.execute(email="user@example.com", password="mypassword1")
+
+        assert stats.count == 1
+        assert next(iter(stats.statements)).lstrip().startswith("WITH")
+
+    async def test_concurrent_signups_with_same_email_create_one_account(
+        self, test_session_factory
+    ):
+        async def signup():
+            async with test_session_factory() as session:
+                usecase = SignupUseCase(session)
+                result = await usecase.execute(
+                    email="race@example.com", password="mypassword1"
+                )
+                await session.commit()
+                return result
+
+        results = await asyncio.gather(
+            *(signup() for _ in range(8)), return_exceptions=True
+        )
+
+        succeeded = [r for r in results if not isinstance(r, BaseException)]
+        failed = [r for r in results if isinstance(r, BaseException)]
+        assert len(succeeded) == 1
+        assert all(
+            isinstance(e, ValueError)
+            and str(e) == "このメールアドレスは既に登録されています"
+            for e in failed
+        )
+
+        async with test_session_factory() as session:
+            account_count = await session.scalar(
+                select(func.count())
+                .select_from(Account)
+                .where(Account.email == "race@example.com")
+            )
+            password_count = await session.scalar(
+                select(func.count()).select_from(AccountPassword)
+            )
+            refresh_token_count = await session.scalar(
+                select(func.count()).select_from(RefreshToken)
+            )
+        assert account_count == 1
+        assert password_count == 1
+        assert refresh_token_count == 1
+
+    async def test_signup_issues_refresh_token_to_external_store(
+        self, test_session_factory, statement_budget
+    ):
+        """DB 以外のストアではトークンをストアに発行し、テーブルには作らないこと"""
+        store = MemoryRefreshTokenStore()
+        async with test_session_factory() as session:
+            usecase = SignupUseCase(session, refresh_tokens=store)
+            with statement_budget(1):
+                result = await usecase.execute(
+                    email="user@example.com", password="mypassword1"
+                )
+            await session.commit()
+
+        async with test_session_factory() as session:
+            count = await session.scalar(select(func.count()).select_from(RefreshToken))
+        assert count == 0
+        assert (
+            await store.rotate(
+                result.refresh_token, "new", datetime.now(UTC) + timedelta(days=7)
+            )
+            == result.account_id
+        )
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.security import hash_refresh_token
+from app.db.partitions import is_lock_timeout, list_monthly_partitions
+from app.models.account import Account
+from app.models.refresh_token import RefreshToken
+from app.query.account_query import AccountQuery
+from app.worker.celery_app import celery_app
+from app.worker.tasks.maintain_refresh_token_partitions import maintain_partitions
+
+NOW = datetime(2026, 10, 15, tzinfo=UTC)
+
+
+async def _create_token(session, token, expires_at):
+    account = Account(email=f"{token}@example.com")
+    session.add(account)
+    await session.flush()
+    session.add(
+        RefreshToken(
+            account_id=account.id,
+            token_hash=hash_refresh_token(token),
+            expires_at=expires_at,
+        )
+    )
+    await session.flush()
+
+
+async def _partition_of(session, token):
+    result = await session.execute(
+        text(
+            "SELECT tableoid::regclass::text FROM refresh_tokens "
+            "WHERE token_hash = :token_hash"
+        ),
+        {"token_hash": hash_refresh_token(token)},
+    )
+    return result.scalar_one()
+
+
+class TestMaintainPartitions:
+    """refresh_tokens パーティション保守のテスト"""
+
+    async def test_creates_partitions_for_upcoming_months(self, test_session_factory):
+        """当月から指定月数先までのパーティションが作成されること"""
+        result = await maintain_partitions(
+            test_session_factory, months_ahead=2, now=NOW
+        )
+
+        assert result["created"] == [
+            "refresh_tokens_p202610",
+            "refresh_tokens_p202611",
+            "refresh_tokens_p202612",
+        ]
+        async with test_session_factory() as session:
+            names = [p.name for p in await list_monthly_partitions(session)]
+        assert names == result["created"]
+
+    async def test_is_idempotent(self, test_session_factory):
+        """2回目の実行では何も作成されないこと"""
+        await maintain_partitions(test_session_factory, months_ahead=1, now=NOW)
+
+        result = await maintain_partitions(
+            test_session_factory, months_ahead=1, now=NOW
+        )
+
+        assert result == {"created": [], "dropped": []}
+
+    async def test_moves_rows_from_default_partition(self, test_session_factory):
+        """デフォルトパーティションの該当行が新しいパーティションへ移ること"""
+        async with test_session_factory() as session:
+            await _create_token(session, "moved", NOW + timedelta(days=7))
+            await session.commit()
+
+        await maintain_partitions(test_session_factory, months_ahead=0, now=NOW)
+
+        async with test_session_factory() as session:
+            assert await _partition_of(session, "moved") == "refresh_tokens_p202610"
+            token = await AccountQuery(session).get_refresh_token("moved")
+        assert token is not None
+
+    async def test_drops_fully_expired_partitions(self, test_session_factory):
+        """期間が終わったパーティションは DROP されること"""
+        await maintain_partitions(test_session_factory, months_ahead=0, now=NOW)
+        async with test_session_factory() as session:
+            await _create_token(session, "expired", NOW + timedelta(days=1))
+            await session.commit()
+
+        result = await maintain_partitions(
+            test_session_factory, months_ahead=0, now=datetime(2026, 11, 1, tzinfo=UTC)
+        )
+
+        assert result["dropped"] == ["refresh_tokens_p202610"]
+        async with test_session_factory() as session:
+            count = await session.scalar(text("SELECT count(*) FROM refresh_tokens"))
+        assert count == 0
+
+
+class TestMaintainPartitionsLockTimeout:
+    """パーティション保守のロック待ちのテスト"""
+
+    async def test_gives_up_while_a_reader_holds_the_table(self, test_session_factory):
+        """読み取り中のトランザクションがある間は、待ち続けずに失敗すること"""
+        async with test_session_factory() as reader:
+            await reader.execute(text("SELECT count(*) FROM refresh_tokens"))
+
+            with pytest.raises(DBAPIError) as excinfo:
+                await asyncio.wait_for(
+                    maintain_partitions(
+                        test_session_factory,
+                        months_ahead=0,
+                        now=NOW,
+                        lock_timeout_ms=50,
+                        lock_attempts=2,
+                        retry_delay_seconds=0.01,
+                    ),
+                    timeout=5,
+                )
+            await reader.rollback()
+
+        assert is_lock_timeout(excinfo.value)
+        async with test_session_factory() as session:
+            assert await list_monthly_partitions(session) == []
+
+    async def test_retries_until_the_lock_is_released(
+        self, test_session_factory, caplog
+    ):
+        """ロックが解放されたら、リトライで作成できること"""
+        async with test_session_factory() as reader:
+            await reader.execute(text("SELECT count(*) FROM refresh_tokens"))
+
+            async def release():
+                await asyncio.sleep(0.3)
+                await reader.rollback()
+
+            with caplog.at_level(logging.WARNING):
+                result, _ = await asyncio.gather(
+                    maintain_partitions(
+                        test_session_factory,
+                        months_ahead=0,
+                        now=NOW,
+                        lock_timeout_ms=50,
+                        lock_attempts=10,
+                        retry_delay_seconds=0.05,
+                    ),
+                    release(),
+                )
+
+        assert result["created"] == ["refresh_tokens_p202610"]
+        assert "Lock timeout" in caplog.text
+
+    async def test_warns_when_rows_are_moved_from_default(
+        self, test_session_factory, caplog
+    ):
+        """デフォルトパーティションから行を移した場合は警告を出すこと"""
+        async with test_session_factory() as session:
+            await _create_token(session, "late", NOW + timedelta(days=7))
+            await session.commit()
+
+        with caplog.at_level(logging.WARNING):
+            await maintain_partitions(test_session_factory, months_ahead=0, now=NOW)
+
+        assert "Moved 1 rows" in caplog.text
+
+
+class TestMaintainPartitionsSchedule:
+    """Celery Beat スケジュール設定のテスト"""
+
+    def test_maintain_task_is_registered(self):
+        """beat_schedule にパーティション保守タスクが登録されていること"""
+        schedule = celery_app.conf.beat_schedule
+
+        assert "maintain-refresh-token-partitions" in schedule
+        assert schedule["maintain-refresh-token-partitions"]["task"] == (
+            "app.worker.tasks.maintain_refresh_token_partitions"
+            ".maintain_refresh_token_partitions"
+        )
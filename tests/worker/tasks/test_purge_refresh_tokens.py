@@ -0,0 +1,107 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.security import hash_refresh_token
+from app.models.account import Account
+from app.models.refresh_token import RefreshToken
+from app.worker.celery_app import celery_app
+from app.worker.tasks.purge_refresh_tokens import purge_revoked_refresh_tokens
+
+
+async def _create_tokens(session, *, live=0, revoked=0, expired=0, revoked_expired=0):
+    account = Account(email="purge@example.com")
+    session.add(account)
+    await session.flush()
+
+    now = datetime.now(UTC)
+    specs = (
+        [("live", now + timedelta(days=7), False)] * live
+        + [("revoked", now + timedelta(days=7), True)] * revoked
+        + [("expired", now - timedelta(days=1), False)] * expired
+        + [("revoked-expired", now - timedelta(days=1), True)] * revoked_expired
+    )
+    for i, (kind, expires_at, is_revoked) in enumerate(specs):
+        session.add(
+            RefreshToken(
+                account_id=account.id,
+                token_hash=hash_refresh_token(f"{kind}-{i}"),
+                expires_at=expires_at,
+                revoked=is_revoked,
+            )
+        )
+    await session.flush()
+
+
+class TestPurgeStaleRefreshTokens:
+    """リフレッシュトークン削除処理のテスト"""
+
+    async def test_deletes_only_revoked_unexpired_tokens(self, test_session_factory):
+        """revoke 済みで期限内のトークンだけが削除されること"""
+        async with test_session_factory() as session:
+            await _create_tokens(
+                session, live=2, revoked=3, expired=2, revoked_expired=1
+            )
+            await session.commit()
+
+        result = await purge_revoked_refresh_tokens(
+            test_session_factory, batch_size=100, sleep_seconds=0
+        )
+
+        assert result["deleted"] == 3
+        async with test_session_factory() as session:
+            remaining = (await session.execute(select(RefreshToken))).scalars().all()
+        assert len(remaining) == 5
+        assert all(
+            not rt.revoked or rt.expires_at < datetime.now(UTC) for rt in remaining
+        )
+
+    async def test_leaves_expired_tokens_to_partition_drop(self, test_session_factory):
+        """期限切れのトークンは revoke 済みでも削除せず、パーティションの DROP に任せること"""
+        async with test_session_factory() as session:
+            await _create_tokens(session, expired=2, revoked_expired=2)
+            await session.commit()
+
+        result = await purge_revoked_refresh_tokens(
+            test_session_factory, batch_size=100, sleep_seconds=0
+        )
+
+        assert result == {"deleted": 0, "batches": 0}
+
+    async def test_deletes_in_batches(self, test_session_factory):
+        """バッチサイズごとに分けて削除されること"""
+        async with test_session_factory() as session:
+            await _create_tokens(session, live=1, revoked=5, expired=2)
+            await session.commit()
+
+        result = await purge_revoked_refresh_tokens(
+            test_session_factory, batch_size=2, sleep_seconds=0
+        )
+
+        assert result == {"deleted": 5, "batches": 3}
+
+    async def test_returns_zero_when_nothing_to_delete(self, test_session_factory):
+        """削除対象がない場合は 0 件であること"""
+        async with test_session_factory() as session:
+            await _create_tokens(session, live=2)
+            await session.commit()
+
+        result = await purge_revoked_refresh_tokens(
+            test_session_factory, batch_size=100, sleep_seconds=0
+        )
+
+        assert result == {"deleted": 0, "batches": 0}
+
+
+class TestPurgeRefreshTokensSchedule:
+    """Celery Beat スケジュール設定のテスト"""
+
+    def test_purge_task_is_registered(self):
+        """beat_schedule にリフレッシュトークン削除タスクが登録されていること"""
+        schedule = celery_app.conf.beat_schedule
+
+        assert "purge-refresh-tokens" in schedule
+        assert (
+            schedule["purge-refresh-tokens"]["task"]
+            == "app.worker.tasks.purge_refresh_tokens.purge_refresh_tokens"
+        )